@@ -1,8 +1,364 @@
 import os
-from flask import Flask, request, jsonify, render_template
-from utils.file_processor import process_url
+import json
+import uuid
+from datetime import datetime, timedelta
+from urllib.parse import urlparse
+from flask import (Flask, Response, request, jsonify, render_template,
+                   send_file, url_for)
+from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event, func, inspect, text, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+from werkzeug.serving import is_running_from_reloader
+from werkzeug.utils import secure_filename
+from utils.job_queue import JobQueue, run_validation_job, validation_events
+from utils.validator import checks_passed, conference_rules
+from utils.conference_profile import invalidate_profile
+from utils.pagination import decode_cursor, encode_cursor, page_size
+from utils.analytics import failure_rate, histogram_percentile, latency_bucket
+from utils.ai_checker import is_unavailable
+from utils.master_deck import MasterDeck
 
 app = Flask(__name__)
+app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get(
+    'DATABASE_URL', 'sqlite:///submissions.db')
+app.config['UPLOAD_FOLDER'] = os.environ.get(
+    'UPLOAD_FOLDER', os.path.join(app.instance_path, 'uploads'))
+
+db = SQLAlchemy(app)
+
+
+class Conference(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), nullable=False)
+    max_slides = db.Column(db.Integer, nullable=False)
+    required_sections = db.Column(db.String(500))
+    custom_checks = db.Column(db.JSON)
+    allowed_fonts = db.Column(db.String(500), default='*')
+
+
+@event.listens_for(Conference, 'after_update')
+@event.listens_for(Conference, 'after_delete')
+def _drop_conference_profile(mapper, connection, target):
+    invalidate_profile(target.id)
+
+
+class Submission(db.Model):
+    # Listings are newest first and keyset-paginated on (timestamp, id),
+    # optionally filtered on passed; both indexes cover those queries.
+    __table_args__ = (
+        db.Index('ix_submission_timestamp_id', 'timestamp', 'id'),
+        db.Index('ix_submission_passed_timestamp_id', 'passed', 'timestamp',
+                 'id'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    filename = db.Column(db.String(100))
+    url = db.Column(db.String(200))
+    # Columns the counters and rollups are keyed on load their old value
+    # when reassigned, so the update listeners can reverse it.
+    results = db.column_property(db.Column(db.JSON, nullable=False),
+                                 active_history=True)
+    timestamp = db.column_property(db.Column(db.DateTime,
+                                             default=datetime.utcnow),
+                                   active_history=True)
+    passed = db.column_property(db.Column(db.Boolean, default=False),
+                                active_history=True)
+    conference_id = db.column_property(db.Column(db.Integer),
+                                       active_history=True)
+    processing_time = db.column_property(db.Column(db.Float),
+                                         active_history=True)
+    # PDF kept for accepted decks (see utils.master_deck.keep_deck)
+    deck_file = db.Column(db.String(500))
+
+    def check_results(self):
+        # Older rows hold the results list serialized a second time
+        if isinstance(self.results, str):
+            return json.loads(self.results)
+        return self.results
+
+    def to_dict(self, details=False):
+        data = {
+            'id': self.id,
+            'filename': self.filename,
+            'url': self.url,
+            'timestamp': self.timestamp.strftime('%Y-%m-%d %H:%M:%S')
+            if self.timestamp else None,
+            'passed': bool(self.passed),
+            'conference_id': self.conference_id,
+        }
+        if details:
+            data['results'] = self.check_results()
+        return data
+
+
+class SubmissionCounter(db.Model):
+    """Dashboard totals, kept current by the Submission listeners below so
+    the dashboard never has to count rows."""
+    name = db.Column(db.String(50), primary_key=True)
+    value = db.Column(db.Integer, nullable=False, default=0)
+
+
+def _bump_counters(connection, total=0, passed=0):
+    table = SubmissionCounter.__table__
+    for name, delta in (('total', total), ('passed', passed)):
+        if delta:
+            connection.execute(table.update().where(
+                table.c.name == name).values(value=table.c.value + delta))
+
+
+@event.listens_for(Submission, 'after_insert')
+def _count_new_submission(mapper, connection, target):
+    _bump_counters(connection, total=1, passed=1 if target.passed else 0)
+
+
+@event.listens_for(Submission, 'after_delete')
+def _uncount_submission(mapper, connection, target):
+    _bump_counters(connection, total=-1, passed=-1 if target.passed else 0)
+
+
+@event.listens_for(Submission, 'after_update')
+def _recount_changed_submission(mapper, connection, target):
+    history = db.inspect(target).attrs.passed.history
+    if history.has_changes():
+        was_passed = bool(history.deleted and history.deleted[0])
+        if bool(target.passed) != was_passed:
+            _bump_counters(connection, passed=1 if target.passed else -1)
+
+
+class CheckResult(db.Model):
+    """One row per check of a submission, normalized out of its results."""
+    __tablename__ = 'submission_check'
+    __table_args__ = (db.Index('ix_submission_check_check_passed', 'check',
+                               'passed'), )
+
+    id = db.Column(db.Integer, primary_key=True)
+    submission_id = db.Column(db.Integer, nullable=False, index=True)
+    check = db.Column(db.String(100), nullable=False)
+    passed = db.Column(db.Boolean, nullable=False)
+    # The check did not run (provider failure, deferral, missing key)
+    unavailable = db.Column(db.Boolean, nullable=False, default=False)
+
+
+# Daily rollups per conference (0 when the submission has none), updated
+# in the same transaction as each submission insert or delete so /api/stats
+# never reads raw submissions.
+class DailySubmissionStats(db.Model):
+    conference_id = db.Column(db.Integer, primary_key=True)
+    day = db.Column(db.Date, primary_key=True)
+    total = db.Column(db.Integer, nullable=False, default=0)
+    passed = db.Column(db.Integer, nullable=False, default=0)
+
+
+class DailyCheckStats(db.Model):
+    conference_id = db.Column(db.Integer, primary_key=True)
+    day = db.Column(db.Date, primary_key=True)
+    check = db.Column(db.String(100), primary_key=True)
+    total = db.Column(db.Integer, nullable=False, default=0)
+    failed = db.Column(db.Integer, nullable=False, default=0)
+    unavailable = db.Column(db.Integer, nullable=False, default=0)
+
+
+class DailyProcessingTime(db.Model):
+    """Histogram of processing times; see utils.analytics.LATENCY_BUCKETS."""
+    conference_id = db.Column(db.Integer, primary_key=True)
+    day = db.Column(db.Date, primary_key=True)
+    bucket = db.Column(db.Integer, primary_key=True)
+    count = db.Column(db.Integer, nullable=False, default=0)
+
+
+def _add_to_rollup(connection, model, keys, **deltas):
+    table = model.__table__
+    dialect = {'sqlite': sqlite, 'postgresql': postgresql}.get(
+        connection.dialect.name)
+    if dialect is not None:
+        statement = dialect.insert(table).values(**keys, **deltas)
+        connection.execute(
+            statement.on_conflict_do_update(
+                index_elements=list(keys),
+                set_={
+                    name: table.c[name] + statement.excluded[name]
+                    for name in deltas
+                }))
+        return
+    updated = connection.execute(table.update().where(
+        *(table.c[name] == value for name, value in keys.items())).values(
+            **{name: table.c[name] + delta
+               for name, delta in deltas.items()}))
+    if not updated.rowcount:
+        connection.execute(table.insert().values(**keys, **deltas))
+
+
+def _roll_up(connection, submission, sign):
+    checks = submission.check_results() or []
+    keys = {
+        'conference_id': submission.conference_id or 0,
+        'day': (submission.timestamp or datetime.utcnow()).date()
+    }
+    _add_to_rollup(connection,
+                   DailySubmissionStats,
+                   keys,
+                   total=sign,
+                   passed=sign if submission.passed else 0)
+    if submission.processing_time is not None:
+        _add_to_rollup(connection,
+                       DailyProcessingTime,
+                       dict(keys,
+                            bucket=latency_bucket(submission.processing_time)),
+                       count=sign)
+    for result in checks:
+        unavailable = is_unavailable(result.get('message', ''))
+        _add_to_rollup(
+            connection,
+            DailyCheckStats,
+            dict(keys, check=result['check']),
+            total=sign,
+            failed=sign if not result['passed'] and not unavailable else 0,
+            unavailable=sign if unavailable else 0)
+
+    table = CheckResult.__table__
+    if sign > 0 and checks:
+        connection.execute(table.insert(), [{
+            'submission_id': submission.id,
+            'check': result['check'],
+            'passed': bool(result['passed']),
+            'unavailable': is_unavailable(result.get('message', ''))
+        } for result in checks])
+    elif sign < 0:
+        connection.execute(
+            table.delete().where(table.c.submission_id == submission.id))
+
+
+@event.listens_for(Submission, 'after_insert')
+def _roll_up_new_submission(mapper, connection, target):
+    _roll_up(connection, target, 1)
+
+
+@event.listens_for(Submission, 'after_delete')
+def _roll_up_deleted_submission(mapper, connection, target):
+    _roll_up(connection, target, -1)
+
+
+ROLLUP_FIELDS = ('passed', 'conference_id', 'timestamp', 'processing_time',
+                 'results')
+
+
+@event.listens_for(Submission, 'after_update')
+def _roll_up_changed_submission(mapper, connection, target):
+    # Take the submission out of the rollups as it was and add it back as
+    # it is now
+    attrs = db.inspect(target).attrs
+    history = {name: attrs[name].history for name in ROLLUP_FIELDS}
+    if not any(changes.has_changes() for changes in history.values()):
+        return
+    previous = Submission(
+        id=target.id,
+        **{
+            name: (changes.deleted[0] if changes.deleted else None)
+            if changes.has_changes() else getattr(target, name)
+            for name, changes in history.items()
+        })
+    _roll_up(connection, previous, -1)
+    _roll_up(connection, target, 1)
+
+
+def rebuild_analytics():
+    """Rebuild the check rows and rollups from the submission table."""
+    for model in (CheckResult, DailySubmissionStats, DailyCheckStats,
+                  DailyProcessingTime):
+        model.query.delete()
+    connection = db.session.connection()
+    for submission in Submission.query.yield_per(500):
+        _roll_up(connection, submission, 1)
+    db.session.commit()
+
+
+def recount_submissions():
+    """Rebuild the counters from the submission table (one full scan)."""
+    total = db.session.query(func.count(Submission.id)).scalar()
+    passed = db.session.query(func.count(Submission.id)).filter(
+        Submission.passed == True).scalar()  # noqa: E712
+    for name, value in (('total', total), ('passed', passed)):
+        db.session.merge(SubmissionCounter(name=name, value=value))
+    db.session.commit()
+
+
+def submission_counts():
+    counters = {
+        counter.name: counter.value
+        for counter in SubmissionCounter.query.all()
+    }
+    total = counters.get('total', 0)
+    passed = counters.get('passed', 0)
+    return {'total': total, 'passed': passed, 'pending': total - passed}
+
+
+def init_db():
+    """Create missing tables, columns and indexes (including on databases
+    created before they existed) and seed the counters and rollups once."""
+    db.create_all()
+    columns = {
+        column['name']
+        for column in inspect(db.engine).get_columns('submission')
+    }
+    for name, ddl in (('processing_time', 'FLOAT'), ('deck_file',
+                                                     'VARCHAR(500)')):
+        if name not in columns:
+            with db.engine.begin() as connection:
+                connection.execute(
+                    text(f'ALTER TABLE submission ADD COLUMN {name} {ddl}'))
+    for index in Submission.__table__.indexes:
+        index.create(db.engine, checkfirst=True)
+    if db.session.get(SubmissionCounter, 'total') is None:
+        recount_submissions()
+    if (DailySubmissionStats.query.first() is None
+            and Submission.query.first() is not None):
+        rebuild_analytics()
+
+
+with app.app_context():
+    init_db()
+
+
+def record_submission(payload, result):
+    submission = Submission(filename=payload.get('filename'),
+                            url=payload.get('url'),
+                            results=result['deterministic_results'] +
+                            result['ai_results'],
+                            passed=checks_passed(result),
+                            conference_id=payload.get('conference_id'),
+                            processing_time=result.get('processing_time'),
+                            deck_file=result.get('deck_file'))
+    db.session.add(submission)
+    db.session.commit()
+    return submission
+
+
+def handle_validation_job(payload, progress):
+    result = run_validation_job(payload, progress)
+    if not result.get('error'):
+        with app.app_context():
+            record_submission(payload, result)
+    return result
+
+
+job_queue = JobQueue(handler=handle_validation_job)
+master_deck = MasterDeck()
+
+
+def start_job_workers():
+    # Called from the server entry points only, so scripts and tests that
+    # import the app never start workers of their own.
+    job_queue.start_workers(
+        workers=int(os.environ.get('SLIDECHECK_JOB_WORKERS', '2')),
+        mode=os.environ.get('SLIDECHECK_JOB_WORKER_MODE', 'thread'))
+
+
+def get_conference(conference_id=None):
+    """Raises ValueError if `conference_id` is not an integer."""
+    if conference_id is not None:
+        return db.session.get(Conference, int(conference_id))
+    return Conference.query.order_by(Conference.id).first()
+
 
 @app.route('/')
 def index():
@@ -10,15 +366,228 @@ def index():
 
 @app.route('/process', methods=['POST'])
 def process():
-    url = request.json.get('url')
-    if not url:
+    data = request.get_json(silent=True) or request.form
+    try:
+        conference = get_conference(data.get('conference_id'))
+    except (TypeError, ValueError):
+        return jsonify({'error': 'Invalid conference_id'}), 400
+    if conference is None:
+        return jsonify({'error': 'Conference not found'}), 404
+
+    payload = {
+        'conference': conference_rules(conference),
+        'conference_id': conference.id,
+        'keep_accepted': True
+    }
+    uploaded = request.files.get('file')
+    if uploaded and uploaded.filename:
+        os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
+        file_path = os.path.join(
+            app.config['UPLOAD_FOLDER'],
+            f"{uuid.uuid4().hex}_{secure_filename(uploaded.filename)}")
+        uploaded.save(file_path)
+        payload['file_path'] = file_path
+        payload['filename'] = secure_filename(uploaded.filename)
+        payload['cleanup'] = True
+    elif data.get('url'):
+        if urlparse(data['url']).scheme not in ('http', 'https'):
+            return jsonify({'error': 'Only http and https URLs are supported'
+                            }), 400
+        payload['url'] = data.get('url')
+    else:
         return jsonify({'error': 'No URL provided'}), 400
 
-    try:
-        result = process_url(url)
-        return jsonify(result)
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+    job_id = job_queue.submit(payload)
+    return jsonify({
+        'job_id': job_id,
+        'status_url': url_for('process_status', job_id=job_id),
+        'events_url': url_for('process_events', job_id=job_id)
+    }), 202
+
+@app.route('/process/<job_id>', methods=['GET'])
+def process_status(job_id):
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job)
+
+@app.route('/process/<job_id>/events', methods=['GET'])
+def process_events(job_id):
+    """Server-Sent Events for one job: extraction stats and deterministic
+    results as soon as they exist, then each AI check as it completes."""
+    if job_queue.get(job_id) is None:
+        return jsonify({'error': 'Job not found'}), 404
+
+    def stream():
+        for event, data in validation_events(job_queue.watch(job_id)):
+            if event == 'keepalive':
+                yield ': keepalive\n\n'
+            else:
+                yield f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+    return Response(stream(),
+                    mimetype='text/event-stream',
+                    headers={
+                        'Cache-Control': 'no-cache',
+                        'X-Accel-Buffering': 'no'
+                    })
+
+@app.route('/dashboard')
+def dashboard():
+    counts = submission_counts()
+    return render_template('dashboard.html',
+                           total_submissions=counts['total'],
+                           passed_submissions=counts['passed'],
+                           pending_submissions=counts['pending'],
+                           submissions=[])
+
+
+@app.route('/api/submissions', methods=['GET'])
+def api_submissions():
+    """Newest-first submissions, keyset-paginated: pass back `next_cursor`
+    as `cursor` for the following page."""
+    status = request.args.get('filter', 'all')
+    limit = page_size(request.args.get('limit'))
+
+    query = Submission.query
+    if status in ('passed', 'failed'):
+        query = query.filter(Submission.passed == (status == 'passed'))
+    cursor = request.args.get('cursor')
+    if cursor:
+        try:
+            timestamp, submission_id = decode_cursor(cursor)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        query = query.filter(
+            tuple_(Submission.timestamp, Submission.id) <
+            tuple_(timestamp, submission_id))
+
+    rows = query.order_by(Submission.timestamp.desc(),
+                          Submission.id.desc()).limit(limit + 1).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    return jsonify({
+        'submissions': [row.to_dict() for row in rows],
+        'next_cursor': encode_cursor(rows[-1].timestamp, rows[-1].id)
+        if has_more else None,
+        'counts': submission_counts(),
+    })
+
+
+@app.route('/api/submission/<int:submission_id>', methods=['GET'])
+def api_submission(submission_id):
+    submission = db.session.get(Submission, submission_id)
+    if submission is None:
+        return jsonify({'error': 'Submission not found'}), 404
+    return jsonify(submission.to_dict(details=True))
+
+
+@app.route('/api/stats', methods=['GET'])
+def api_stats():
+    """Failure rates, processing-time percentiles and daily trends over the
+    last `days` days, optionally for one `conference_id`, from the rollups."""
+    days = max(1, min(365, request.args.get('days', 30, type=int)))
+    conference_id = request.args.get('conference_id', type=int)
+    since = (datetime.utcnow() - timedelta(days=days - 1)).date()
+
+    def scope(model):
+        conditions = [model.day >= since]
+        if conference_id is not None:
+            conditions.append(model.conference_id == conference_id)
+        return conditions
+
+    trend = [{
+        'day': day.isoformat(),
+        'total': total,
+        'passed': passed,
+        'failure_rate': failure_rate(total - passed, total)
+    } for day, total, passed in db.session.query(
+        DailySubmissionStats.day, func.sum(DailySubmissionStats.total),
+        func.sum(DailySubmissionStats.passed)).filter(*scope(
+            DailySubmissionStats)).group_by(DailySubmissionStats.day).order_by(
+                DailySubmissionStats.day)]
+
+    checks = {}
+    for check, day, total, failed, unavailable in db.session.query(
+            DailyCheckStats.check, DailyCheckStats.day,
+            func.sum(DailyCheckStats.total), func.sum(DailyCheckStats.failed),
+            func.sum(DailyCheckStats.unavailable)).filter(
+                *scope(DailyCheckStats)).group_by(
+                    DailyCheckStats.check,
+                    DailyCheckStats.day).order_by(DailyCheckStats.day):
+        stats = checks.setdefault(check, {
+            'check': check,
+            'total': 0,
+            'failed': 0,
+            'unavailable': 0,
+            'trend': []
+        })
+        stats['total'] += total
+        stats['failed'] += failed
+        stats['unavailable'] += unavailable
+        stats['trend'].append({
+            'day': day.isoformat(),
+            'failure_rate': failure_rate(failed, total - unavailable)
+        })
+    for stats in checks.values():
+        stats['failure_rate'] = failure_rate(
+            stats['failed'], stats['total'] - stats['unavailable'])
+
+    histogram = dict(
+        db.session.query(DailyProcessingTime.bucket,
+                         func.sum(DailyProcessingTime.count)).filter(
+                             *scope(DailyProcessingTime)).group_by(
+                                 DailyProcessingTime.bucket))
+    total = sum(day['total'] for day in trend)
+    passed = sum(day['passed'] for day in trend)
+    return jsonify({
+        'since': since.isoformat(),
+        'conference_id': conference_id,
+        'submissions': {
+            'total': total,
+            'passed': passed,
+            'failure_rate': failure_rate(total - passed, total)
+        },
+        'processing_time': {
+            'count': sum(histogram.values()),
+            'p50': histogram_percentile(histogram, 0.50),
+            'p95': histogram_percentile(histogram, 0.95)
+        },
+        'checks': sorted(checks.values(),
+                         key=lambda stats: -(stats['failure_rate'] or 0)),
+        'trend': trend,
+    })
+
+
+@app.route('/download_master_deck', methods=['GET'])
+def download_master_deck():
+    """The accepted talks merged into one PDF, in acceptance order.
+
+    Newly accepted decks are appended to the cached merge; Range and
+    If-Range requests are answered from the file, so large downloads can
+    resume."""
+    accepted = Submission.query.filter(
+        Submission.passed == True,  # noqa: E712
+        Submission.deck_file.isnot(None)).order_by(Submission.timestamp,
+                                                   Submission.id)
+    manifest = master_deck.update([{
+        'key': submission.id,
+        'title': submission.filename or submission.url,
+        'path': submission.deck_file
+    } for submission in accepted])
+    if manifest is None:
+        return jsonify({'error': 'No accepted decks yet'}), 404
+    return send_file(master_deck.pdf_path,
+                     mimetype='application/pdf',
+                     as_attachment=True,
+                     download_name='master_deck.pdf',
+                     etag=manifest['etag'],
+                     conditional=True)
+
 
 if __name__ == '__main__':
+    # The debug reloader runs this module twice; only the serving child
+    # process gets workers.
+    if is_running_from_reloader():
+        start_job_workers()
     app.run(host='0.0.0.0', port=5000, debug=True)
@@ -1,4 +1,5 @@
-from app import app
+from app import app, start_job_workers
 
 if __name__ == "__main__":
+    start_job_workers()
     app.run(host="0.0.0.0", port=5000)
@@ -0,0 +1,154 @@
+import sys
+import argparse
+import logging
+
+from utils.batch import collect_sources, load_checkpoint, run_batch
+from utils.import_benchmark import run_benchmark
+from utils.llm_backend import fake_backend_from_spec
+from utils.loadgen import run_load_test
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='slidecheck')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    batch = subparsers.add_parser(
+        'batch', help='Validate many decks and stream NDJSON results')
+    batch.add_argument('paths',
+                       nargs='*',
+                       help='Deck files, directories or glob patterns')
+    batch.add_argument('--urls',
+                       action='append',
+                       default=[],
+                       help='File with one deck URL per line')
+    batch.add_argument('--output',
+                       '-o',
+                       help='NDJSON output file (default: stdout)')
+    batch.add_argument('--resume',
+                       action='store_true',
+                       help='Skip decks already recorded in --output')
+    batch.add_argument('--extract-workers',
+                       type=int,
+                       default=None,
+                       help='Processes used for conversion and extraction')
+    batch.add_argument('--check-workers',
+                       type=int,
+                       default=4,
+                       help='Decks whose LLM checks run at the same time')
+    batch.add_argument('--conference-name', default='Conference')
+    batch.add_argument('--max-slides', type=int, default=30)
+    batch.add_argument('--required-sections', default='')
+    batch.add_argument('--allowed-fonts', default='*')
+
+    bench = subparsers.add_parser(
+        'bench-imports',
+        help='Measure cold import time and memory in fresh interpreters')
+    bench.add_argument('modules',
+                       nargs='*',
+                       help='Modules to import (default: the pipeline)')
+    bench.add_argument('--file',
+                       help='Also process this deck after importing')
+    bench.add_argument('--repeat', type=int, default=5)
+
+    loadtest = subparsers.add_parser(
+        'loadtest',
+        help='Run concurrent validations against an in-process fake LLM')
+    loadtest.add_argument('paths', nargs='+', help='Deck files to submit')
+    loadtest.add_argument('--submissions', '-n', type=int, default=20)
+    loadtest.add_argument('--concurrency', '-c', type=int, default=4)
+    loadtest.add_argument(
+        '--fake-llm',
+        default='latency=lognormal:0.8:0.5',
+        help='Fake backend settings, e.g. '
+        '"latency=uniform:0.2:2,error_rate=0.02,requests_per_minute=300"')
+    loadtest.add_argument('--max-slides', type=int, default=30)
+    loadtest.add_argument('--required-sections', default='')
+    loadtest.add_argument('--allowed-fonts', default='*')
+    return parser
+
+
+def batch_command(args):
+    sources = collect_sources(args.paths, args.urls)
+    if not sources:
+        print('No decks found.', file=sys.stderr)
+        return 1
+
+    rules = {
+        'name': args.conference_name,
+        'max_slides': args.max_slides,
+        'required_sections': args.required_sections,
+        'allowed_fonts': args.allowed_fonts,
+        'custom_checks': None,
+    }
+    done = load_checkpoint(args.output) if args.resume else set()
+    if done:
+        print(f'Resuming: {len(done)} deck(s) already validated.',
+              file=sys.stderr)
+
+    if args.output:
+        with open(args.output, 'a' if args.resume else 'w') as output:
+            if output.tell() and not _ends_with_newline(args.output):
+                # Start fresh after a record cut short by the interruption.
+                output.write('\n')
+            completed = run_batch(sources, rules, output,
+                                  args.extract_workers, args.check_workers,
+                                  done)
+    else:
+        completed = run_batch(sources, rules, sys.stdout,
+                              args.extract_workers, args.check_workers, done)
+    print(f'Validated {completed} deck(s).', file=sys.stderr)
+    return 0
+
+
+def bench_imports_command(args):
+    results = run_benchmark(args.modules, args.file, args.repeat)
+    for result in results:
+        print(f"{result['module']:<28} import {result['import_seconds'] * 1000:8.1f} ms"
+              f"  total {result['total_seconds'] * 1000:8.1f} ms"
+              f"  rss {result['max_rss_kb'] / 1024:7.1f} MB"
+              f"  loaded: {', '.join(result['loaded']) or '-'}")
+    return 0
+
+
+def loadtest_command(args):
+    rules = {
+        'name': 'Load test',
+        'max_slides': args.max_slides,
+        'required_sections': args.required_sections,
+        'allowed_fonts': args.allowed_fonts,
+        'custom_checks': None,
+    }
+    report = run_load_test(args.paths, rules, args.submissions,
+                           args.concurrency,
+                           fake_backend_from_spec(args.fake_llm))
+    print(f"{report['submissions']} submissions, concurrency {report['concurrency']}:"
+          f" {report['throughput']:.2f}/s over {report['wall_seconds']:.1f} s")
+    print(f"latency p50 {report['p50']:.2f} s  p95 {report['p95']:.2f} s"
+          f"  p99 {report['p99']:.2f} s")
+    print(f"llm calls {report['llm_calls']}  failed {report['llm_failures']}"
+          f"  decks with failed AI checks {report['ai_failed']}"
+          f"  deferred {report['ai_deferred']}"
+          f"  errors {report['errors']}")
+    return 0
+
+
+def _ends_with_newline(path):
+    with open(path, 'rb') as f:
+        f.seek(-1, 2)
+        return f.read(1) == b'\n'
+
+
+def main(argv=None):
+    logging.basicConfig(level=logging.WARNING)
+    args = build_parser().parse_args(argv)
+    if args.command == 'batch':
+        return batch_command(args)
+    if args.command == 'bench-imports':
+        return bench_imports_command(args)
+    if args.command == 'loadtest':
+        return loadtest_command(args)
+    return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
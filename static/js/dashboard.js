@@ -1,54 +1,97 @@
 let currentPage = 1;
 let currentFilter = 'all';
+// cursors[i] loads page i + 1; pages are fetched by keyset cursor, so
+// going back reuses the cursor that loaded the earlier page.
+let cursors = [null];
+let nextCursor = null;
 
 function filterSubmissions(filter) {
     currentFilter = filter;
     currentPage = 1;
+    cursors = [null];
     loadSubmissions();
 }
 
 function changePage(delta) {
+    if (delta > 0) {
+        if (!nextCursor) return;
+        cursors[currentPage] = nextCursor;
+    }
     currentPage += delta;
     if (currentPage < 1) currentPage = 1;
     loadSubmissions();
 }
 
 function loadSubmissions() {
-    fetch(`/api/submissions?page=${currentPage}&filter=${currentFilter}`)
+    const cursor = cursors[currentPage - 1];
+    const params = new URLSearchParams({ filter: currentFilter });
+    if (cursor) params.set('cursor', cursor);
+    fetch(`/api/submissions?${params}`)
         .then(response => response.json())
         .then(data => {
+            nextCursor = data.next_cursor;
             updateSubmissionsTable(data.submissions);
-            updatePagination(data.current_page, data.total_pages);
+            updatePagination(currentPage, Boolean(nextCursor));
+            updateSummary(data.counts);
         });
 }
 
+function updateSummary(counts) {
+    document.getElementById('total-submissions').textContent = counts.total;
+    document.getElementById('passed-submissions').textContent = counts.passed;
+    document.getElementById('pending-submissions').textContent = counts.pending;
+}
+
+// Filenames, URLs and check messages come from uploaded decks, so they are
+// only ever inserted as text, and only http(s) URLs become links.
+function isHttpUrl(value) {
+    try {
+        return ['http:', 'https:'].includes(new URL(value).protocol);
+    } catch (error) {
+        return false;
+    }
+}
+
+function element(tag, text, className) {
+    const node = document.createElement(tag);
+    if (text !== undefined && text !== null) node.textContent = text;
+    if (className) node.className = className;
+    return node;
+}
+
+function sourceNode(submission) {
+    if (submission.filename || !isHttpUrl(submission.url)) {
+        return document.createTextNode(submission.filename || submission.url || '');
+    }
+    const link = element('a', submission.url);
+    link.setAttribute('href', submission.url);
+    link.setAttribute('target', '_blank');
+    link.setAttribute('rel', 'noopener noreferrer');
+    return link;
+}
+
 function updateSubmissionsTable(submissions) {
     const tableBody = document.getElementById('submissions-table');
-    tableBody.innerHTML = '';
+    tableBody.replaceChildren();
     submissions.forEach(submission => {
-        const row = document.createElement('tr');
-        row.className = `submission-row ${submission.passed ? 'passed' : 'failed'}`;
-        row.innerHTML = `
-            <td>${submission.id}</td>
-            <td>${submission.filename || `<a href="${submission.url}" target="_blank">${submission.url}</a>`}</td>
-            <td>${submission.timestamp}</td>
-            <td>
-                <span class="status-indicator ${submission.passed ? 'passed' : 'failed'}">
-                    ${submission.passed ? '✓' : '✗'}
-                </span>
-            </td>
-            <td>
-                <button onclick="viewDetails(${submission.id})">View Details</button>
-            </td>
-        `;
+        const status = submission.passed ? 'passed' : 'failed';
+        const row = element('tr', null, `submission-row ${status}`);
+        row.appendChild(element('td', submission.id));
+        row.appendChild(element('td')).appendChild(sourceNode(submission));
+        row.appendChild(element('td', submission.timestamp));
+        row.appendChild(element('td')).appendChild(
+            element('span', submission.passed ? '✓' : '✗', `status-indicator ${status}`));
+        const button = element('button', 'View Details');
+        button.addEventListener('click', () => viewDetails(submission.id));
+        row.appendChild(element('td')).appendChild(button);
         tableBody.appendChild(row);
     });
 }
 
-function updatePagination(currentPage, totalPages) {
+function updatePagination(currentPage, hasMore) {
     document.getElementById('current-page').textContent = currentPage;
     document.querySelector('button[onclick="changePage(-1)"]').disabled = currentPage === 1;
-    document.querySelector('button[onclick="changePage(1)"]').disabled = currentPage === totalPages;
+    document.querySelector('button[onclick="changePage(1)"]').disabled = !hasMore;
 }
 
 function viewDetails(submissionId) {
@@ -57,23 +100,22 @@ function viewDetails(submissionId) {
         .then(data => {
             const modal = document.getElementById('modal');
             const modalContent = document.getElementById('modal-content');
-            modalContent.innerHTML = `
-                <h3>${data.filename || data.url}</h3>
-                <p>Timestamp: ${data.timestamp}</p>
-                <p>Status: ${data.passed ? 'Passed' : 'Failed'}</p>
-                <h4>Check Results:</h4>
-                <ul>
-                    ${data.results.map(result => `
-                        <li>
-                            <strong>${result.check}:</strong> 
-                            <span class="${result.passed ? 'success' : 'failure'}">
-                                ${result.passed ? 'Passed' : 'Failed'}
-                            </span>
-                            - ${result.message}
-                        </li>
-                    `).join('')}
-                </ul>
-            `;
+            const list = element('ul');
+            data.results.forEach(result => {
+                const item = element('li');
+                item.appendChild(element('strong', `${result.check}:`));
+                item.appendChild(document.createTextNode(' '));
+                item.appendChild(element('span', result.passed ? 'Passed' : 'Failed',
+                                         result.passed ? 'success' : 'failure'));
+                item.appendChild(document.createTextNode(` - ${result.message}`));
+                list.appendChild(item);
+            });
+            modalContent.replaceChildren(
+                element('h3', data.filename || data.url),
+                element('p', `Timestamp: ${data.timestamp}`),
+                element('p', `Status: ${data.passed ? 'Passed' : 'Failed'}`),
+                element('h4', 'Check Results:'),
+                list);
             modal.style.display = 'block';
         });
 }
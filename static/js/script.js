@@ -35,18 +35,22 @@ document.addEventListener('DOMContentLoaded', function() {
             data.results.forEach(result => {
                 const resultItem = document.createElement('div');
                 resultItem.classList.add('result-item');
-                resultItem.innerHTML = `
-                    <span class="${result.passed ? 'success' : 'failure'}">
-                        ${result.passed ? '✅' : '❌'}
-                    </span>
-                    <strong>${result.check}:</strong> ${result.message}
-                `;
+                // Check messages can quote deck content; insert as text
+                const status = document.createElement('span');
+                status.className = result.passed ? 'success' : 'failure';
+                status.textContent = result.passed ? '✅' : '❌';
+                const check = document.createElement('strong');
+                check.textContent = `${result.check}:`;
+                resultItem.append(status, ' ', check, ` ${result.message}`);
                 resultsDiv.appendChild(resultItem);
             });
         })
         .catch(error => {
             console.error('Error:', error);
-            resultsDiv.innerHTML = `<p class="error">An error occurred: ${error.message}</p>`;
+            const message = document.createElement('p');
+            message.className = 'error';
+            message.textContent = `An error occurred: ${error.message}`;
+            resultsDiv.replaceChildren(message);
         })
         .finally(() => {
             loadingBar.remove();
@@ -0,0 +1,154 @@
+import unittest
+import os
+import sys
+import tempfile
+from types import SimpleNamespace
+from unittest import mock
+
+# Add the parent directory to sys.path to allow imports from the utils folder
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fitz
+from utils.ai_checker import (extract_images_from_pdf, image_data_url,
+                               check_text_content, parse_text_checks_verdict,
+                               check_audio_in_video)
+
+
+class TestPageRendering(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.pdf_path = os.path.join(self.temp_dir.name, 'deck.pdf')
+        doc = fitz.open()
+        for i in range(10):
+            page = doc.new_page(width=1920, height=1080)
+            page.insert_text((72, 72), f"Slide {i + 1}")
+        doc.save(self.pdf_path)
+        doc.close()
+
+    def test_renders_only_requested_pages(self):
+        images = list(extract_images_from_pdf(self.pdf_path, max_pages=3))
+        self.assertEqual(len(images), 3)
+
+    def test_renders_lazily(self):
+        renders = extract_images_from_pdf(self.pdf_path)
+        first = next(renders)
+        renders.close()
+        self.assertTrue(first.startswith(b'\xff\xd8'), "Expected JPEG bytes")
+
+    def test_downscales_to_max_dimension(self):
+        image = next(
+            extract_images_from_pdf(self.pdf_path,
+                                    dpi=300,
+                                    max_dimension=512,
+                                    image_format='png'))
+        pix = fitz.Pixmap(image)
+        self.assertLessEqual(max(pix.width, pix.height), 512)
+
+    def test_data_url_matches_format(self):
+        self.assertTrue(
+            image_data_url(b'data', 'webp').startswith('data:image/webp;base64,'))
+
+
+class TestCombinedTextChecks(unittest.TestCase):
+
+    def setUp(self):
+        self.slide_data = {
+            'num_slides': 2,
+            'content': ['My Talk\nJane Doe', 'Results']
+        }
+        self.conference = SimpleNamespace(name='PyCon')
+        # Exercise the model path; the local pre-checks are tested separately
+        for name in ('local_title_slide', 'local_text_heavy'):
+            patcher = mock.patch(f'utils.ai_checker.{name}', return_value=None)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_builds_each_check_from_one_request(self):
+        verdict = '{"title_slide": true, "text_heavy": false, "relevant": false}'
+        with mock.patch('utils.ai_checker.send_openai_request_with_function',
+                        return_value=verdict) as send:
+            results = check_text_content(self.slide_data, self.conference)
+        self.assertEqual(send.call_count, 1)
+        self.assertEqual([r['check'] for r in results],
+                         ['Title Slide', 'Bullet Point Density',
+                          'Content Relevance'])
+        self.assertEqual([r['passed'] for r in results], [True, True, False])
+        self.assertIn('PyCon', results[2]['message'])
+
+    def test_invalid_verdict_falls_back_to_separate_checks(self):
+        responses = ['{"title_slide": "yes"}', 'Yes', 'Yes', 'Yes']
+        with mock.patch('utils.ai_checker.send_openai_request_with_function',
+                        side_effect=responses) as send:
+            results = check_text_content(self.slide_data, self.conference)
+        self.assertEqual(send.call_count, 4)
+        self.assertEqual([r['passed'] for r in results], [True, False, True])
+
+    def test_failed_request_fails_every_text_check(self):
+        with mock.patch('utils.ai_checker.send_openai_request_with_function',
+                        return_value='AI check failed: Unexpected error - x'):
+            results = check_text_content(self.slide_data, self.conference)
+        self.assertEqual(len(results), 3)
+        self.assertFalse(any(r['passed'] for r in results))
+
+    def test_failed_request_keeps_local_decisions(self):
+        with mock.patch('utils.ai_checker.local_title_slide',
+                        return_value=True), \
+                mock.patch(
+                    'utils.ai_checker.send_openai_request_with_function',
+                    return_value='AI check deferred: rate limited'):
+            results = check_text_content(self.slide_data, self.conference)
+        self.assertEqual([r['passed'] for r in results], [True, False, False])
+        self.assertEqual(results[0]['message'],
+                         'The deck has a clear title slide.')
+        self.assertEqual(
+            [r['message'] for r in results[1:]],
+            ['AI check deferred: rate limited'] * 2)
+
+    def test_confident_local_checks_leave_only_relevance(self):
+        with mock.patch('utils.ai_checker.local_title_slide',
+                        return_value=True), \
+                mock.patch('utils.ai_checker.local_text_heavy',
+                           return_value=False), \
+                mock.patch(
+                    'utils.ai_checker.send_openai_request_with_function',
+                    return_value='Yes') as send:
+            results = check_text_content(self.slide_data, self.conference)
+        self.assertEqual(send.call_count, 1)
+        self.assertNotIn('response_format', send.call_args.kwargs)
+        self.assertEqual([r['passed'] for r in results], [True, True, True])
+
+    def test_verdict_schema(self):
+        self.assertIsNone(parse_text_checks_verdict('not json'))
+        self.assertIsNone(parse_text_checks_verdict('[true]'))
+        self.assertIsNone(
+            parse_text_checks_verdict('{"title_slide": true, "relevant": true}'))
+
+
+class TestAudioInVideo(unittest.TestCase):
+
+    def video(self, slide, has_audio):
+        probe = None if has_audio is None else {'has_audio': has_audio}
+        return {'slide': slide, 'kind': 'video', 'probe': probe}
+
+    def test_decided_from_probes_without_a_request(self):
+        with mock.patch(
+                'utils.ai_checker.send_openai_request_with_function') as send:
+            passed = check_audio_in_video(
+                {'media': [self.video(1, True), self.video(2, None)]})
+            silent = check_audio_in_video(
+                {'media': [self.video(1, True), self.video(3, False)]})
+        send.assert_not_called()
+        self.assertTrue(passed['passed'])
+        self.assertIn('1 video(s) could not be inspected', passed['message'])
+        self.assertFalse(silent['passed'])
+        self.assertIn('slide 3', silent['message'])
+
+    def test_no_videos(self):
+        result = check_audio_in_video({'media': [], 'video_tracks': []})
+        self.assertFalse(result['passed'])
+
+
+if __name__ == "__main__":
+    unittest.main()
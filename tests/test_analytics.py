@@ -0,0 +1,40 @@
+import unittest
+import os
+import sys
+
+# Add the parent directory to sys.path to allow imports from the utils folder
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.ai_checker import is_unavailable
+from utils.analytics import (LATENCY_BUCKETS, failure_rate,
+                             histogram_percentile, latency_bucket)
+
+
+class TestAnalytics(unittest.TestCase):
+
+    def test_buckets_by_upper_bound(self):
+        self.assertEqual(latency_bucket(0.2), 0)
+        self.assertEqual(latency_bucket(0.5), 0)
+        self.assertEqual(latency_bucket(0.6), 1)
+        self.assertEqual(latency_bucket(10_000), len(LATENCY_BUCKETS))
+
+    def test_percentiles_interpolate_within_a_bucket(self):
+        histogram = {latency_bucket(1.5): 50, latency_bucket(25): 50}
+        self.assertAlmostEqual(histogram_percentile(histogram, 0.5), 2.0)
+        self.assertAlmostEqual(histogram_percentile(histogram, 0.95), 29.0)
+        self.assertIsNone(histogram_percentile({}, 0.5))
+        self.assertEqual(
+            histogram_percentile({len(LATENCY_BUCKETS): 3}, 0.95),
+            LATENCY_BUCKETS[-1])
+
+    def test_unavailable_results_and_rates(self):
+        self.assertTrue(is_unavailable('AI check deferred: try later.'))
+        self.assertTrue(is_unavailable(
+            'AI checks were skipped due to missing OpenAI API key.'))
+        self.assertFalse(is_unavailable('No title slide.'))
+        self.assertEqual(failure_rate(1, 3), 0.3333)
+        self.assertIsNone(failure_rate(0, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+import unittest
+import os
+import sys
+import io
+import json
+import tempfile
+from types import SimpleNamespace
+from unittest import mock
+
+# Add the parent directory to sys.path to allow imports from the utils folder
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.batch import (batch_record, check_source, collect_sources,
+                         load_checkpoint, run_batch)
+
+
+def crashing_extract(source, rules):
+    # Stands in for a parser that takes its worker process down
+    if 'crash' in source['id']:
+        os._exit(1)
+    return source, None, None, {'deterministic_results': [], 'ai_results': []}
+
+
+class TestBatchSources(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.root = self.temp_dir.name
+        os.makedirs(os.path.join(self.root, 'talks'))
+        for name in ('a.pdf', 'b.pptx', 'notes.txt'):
+            open(os.path.join(self.root, 'talks', name), 'w').close()
+
+    def test_collects_supported_files_from_directory(self):
+        sources = collect_sources([os.path.join(self.root, 'talks')])
+        self.assertEqual(
+            [os.path.basename(s['file_path']) for s in sources],
+            ['a.pdf', 'b.pptx'])
+
+    def test_collects_globs_and_url_lists(self):
+        url_file = os.path.join(self.root, 'urls.txt')
+        with open(url_file, 'w') as f:
+            f.write("https://example.com/deck\n\n# skipped\n")
+        sources = collect_sources([os.path.join(self.root, 'talks', '*.pdf')],
+                                  [url_file])
+        self.assertEqual(len(sources), 2)
+        self.assertEqual(sources[1], {
+            'id': 'https://example.com/deck',
+            'url': 'https://example.com/deck'
+        })
+
+    def test_checkpoint_ignores_truncated_lines(self):
+        output = os.path.join(self.root, 'results.ndjson')
+        with open(output, 'w') as f:
+            f.write(json.dumps({'source': 'a.pdf', 'passed': True}) + '\n')
+            f.write('{"source": "b.pp')
+        self.assertEqual(load_checkpoint(output), {'a.pdf'})
+        self.assertEqual(load_checkpoint(None), set())
+
+
+class TestCheckSource(unittest.TestCase):
+
+    def test_check_errors_become_error_records(self):
+        source = {'id': 'talks/a.pdf', 'file_path': 'talks/a.pdf'}
+        with mock.patch('utils.validator.validate_extracted',
+                        side_effect=ValueError('bad font table')):
+            checked, result = check_source(source, 'abc', {'num_slides': 3},
+                                           SimpleNamespace())
+        self.assertIs(checked, source)
+        record = batch_record(checked, result)
+        self.assertEqual(record['source'], 'talks/a.pdf')
+        self.assertFalse(record['passed'])
+        self.assertEqual(record['error'], 'bad font table')
+
+
+
+class TestRunBatch(unittest.TestCase):
+
+    def test_a_crashing_deck_does_not_abort_the_batch(self):
+        sources = [{'id': name} for name in ('a', 'b', 'crash', 'c', 'd')]
+        output = io.StringIO()
+        with mock.patch('utils.batch.extract_source', crashing_extract):
+            completed = run_batch(sources, {}, output, extract_workers=2)
+        records = {
+            record['source']: record
+            for record in map(json.loads, output.getvalue().splitlines())
+        }
+        self.assertEqual(completed, 5)
+        self.assertEqual(sorted(records), ['a', 'b', 'c', 'crash', 'd'])
+        self.assertIn('crashed', records['crash']['error'])
+        self.assertEqual(
+            [name for name, record in records.items() if 'error' in record],
+            ['crash'])
+
+
+if __name__ == "__main__":
+    unittest.main()
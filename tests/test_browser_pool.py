@@ -0,0 +1,175 @@
+import unittest
+import os
+import sys
+import asyncio
+import threading
+import time
+from concurrent.futures import Future
+from unittest import mock
+
+# Add the parent directory to sys.path to allow imports from the utils folder
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.browser_pool import BrowserPool
+
+
+class FakePage:
+
+    def __init__(self, browser):
+        self.browser = browser
+
+    async def goto(self, url, wait_until=None, timeout=None):
+        self.browser.visited.append(url)
+        if self.browser.hold is not None:
+            await asyncio.wrap_future(self.browser.hold)
+        if self.browser.crash_on == url:
+            self.browser.connected = False
+            raise RuntimeError('Target closed')
+
+    async def wait_for_selector(self, selector, state=None, timeout=None):
+        pass
+
+    async def pdf(self, format=None):
+        return b'%PDF-1.4 ' + self.browser.visited[-1].encode()
+
+
+class FakeContext:
+
+    def __init__(self, browser):
+        self.browser = browser
+
+    async def new_page(self):
+        return FakePage(self.browser)
+
+    async def close(self):
+        self.browser.chromium.open_contexts -= 1
+
+
+class FakeBrowser:
+
+    def __init__(self, chromium):
+        self.chromium = chromium
+        self.visited = []
+        self.connected = True
+        self.closed = False
+        self.hold = chromium.hold
+        self.crash_on = chromium.crash_on
+
+    def is_connected(self):
+        return self.connected
+
+    async def new_context(self, user_agent=None):
+        self.chromium.open_contexts += 1
+        self.chromium.peak_contexts = max(self.chromium.peak_contexts,
+                                          self.chromium.open_contexts)
+        return FakeContext(self)
+
+    async def close(self):
+        self.closed = True
+        self.connected = False
+
+
+class FakeChromium:
+
+    def __init__(self):
+        self.launched = []
+        self.open_contexts = 0
+        self.peak_contexts = 0
+        self.hold = None
+        self.crash_on = None
+
+    async def launch(self, headless=True):
+        browser = FakeBrowser(self)
+        self.launched.append(browser)
+        return browser
+
+
+class FakePlaywright:
+
+    def __init__(self, fail=False):
+        self.chromium = FakeChromium()
+        self.fail = fail
+        self.stopped = False
+
+    async def start(self):
+        if self.fail:
+            raise RuntimeError('playwright is not installed')
+        return self
+
+    async def stop(self):
+        self.stopped = True
+
+
+class TestBrowserPool(unittest.TestCase):
+
+    def make_pool(self, fake, **kwargs):
+        patcher = mock.patch('utils.browser_pool.async_playwright',
+                             return_value=fake)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        pool = BrowserPool(**kwargs)
+        self.addCleanup(pool.close)
+        return pool
+
+    def test_browser_is_recycled_after_page_budget(self):
+        fake = FakePlaywright()
+        pool = self.make_pool(fake, browsers=1, contexts_per_browser=1,
+                              pages_per_browser=2)
+        for i in range(5):
+            self.assertEqual(pool.render_pdf(f'https://example.com/{i}'),
+                             f'%PDF-1.4 https://example.com/{i}'.encode())
+        launched = fake.chromium.launched
+        self.assertEqual(len(launched), 3)
+        self.assertEqual([len(b.visited) for b in launched], [2, 2, 1])
+        pool.close()
+        self.assertTrue(all(b.closed for b in launched))
+        self.assertTrue(fake.stopped)
+
+    def test_crashed_browser_is_relaunched(self):
+        fake = FakePlaywright()
+        fake.chromium.crash_on = 'https://example.com/crash'
+        pool = self.make_pool(fake, browsers=1, contexts_per_browser=1)
+        with self.assertRaises(RuntimeError):
+            pool.render_pdf('https://example.com/crash')
+        fake.chromium.crash_on = None
+        self.assertTrue(pool.render_pdf('https://example.com/ok'))
+        self.assertEqual(len(fake.chromium.launched), 2)
+        self.assertFalse(fake.chromium.launched[0].is_connected())
+
+    def test_concurrency_is_capped_at_slot_count(self):
+        fake = FakePlaywright()
+        pool = self.make_pool(fake, browsers=1, contexts_per_browser=2,
+                              acquire_timeout=0.2)
+        release = fake.chromium.hold = Future()
+        results = []
+        threads = [
+            threading.Thread(target=lambda i=i: results.append(
+                pool.render_pdf(f'https://example.com/{i}')))
+            for i in range(2)
+        ]
+        for thread in threads:
+            thread.start()
+        deadline = time.monotonic() + 5
+        while fake.chromium.open_contexts < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        # Both slots are held, so a third render gives up waiting
+        with self.assertRaises(TimeoutError):
+            pool.render_pdf('https://example.com/2')
+        release.set_result(None)
+        for thread in threads:
+            thread.join(timeout=5)
+        self.assertEqual(len(results), 2)
+        self.assertEqual(fake.chromium.peak_contexts, 2)
+
+    def test_failed_start_leaves_pool_unstarted(self):
+        fake = FakePlaywright(fail=True)
+        pool = self.make_pool(fake)
+        with self.assertRaises(RuntimeError):
+            pool.render_pdf('https://example.com/')
+        self.assertIsNone(pool._thread)
+        fake.fail = False
+        self.assertTrue(pool.render_pdf('https://example.com/'))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+import unittest
+import os
+import sys
+import tempfile
+from types import SimpleNamespace
+from unittest import mock
+
+# Add the parent directory to sys.path to allow imports from the utils folder
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.conference_profile import (ConferenceProfile, get_profile,
+                                      invalidate_profile, normalize_font)
+import fitz
+from utils.disk_cache import DiskCache
+from utils.file_processor import process_file
+from utils.deterministic_checker import (check_font_usage,
+                                         run_deterministic_checks)
+
+SAMPLE_DATA = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                           'sample_data')
+
+
+def make_conference(**overrides):
+    rules = {
+        'id': 1,
+        'name': 'Test Conference',
+        'max_slides': 20,
+        'required_sections': 'Introduction,Conclusion',
+        'allowed_fonts': 'Arial,Helvetica,Times New Roman',
+        'custom_checks': {
+            'code_snippets': {'enabled': True, 'threshold': 1},
+            'statistical_terms': {'enabled': False, 'threshold': 2},
+        },
+    }
+    rules.update(overrides)
+    return SimpleNamespace(**rules)
+
+
+class TestConferenceProfile(unittest.TestCase):
+
+    def setUp(self):
+        invalidate_profile()
+
+    def test_normalize_font(self):
+        self.assertEqual(normalize_font('ABCDEF+Arial-BoldMT'), 'arial')
+        self.assertEqual(normalize_font('TimesNewRomanPSMT'), 'timesnewroman')
+        self.assertEqual(normalize_font('Times New Roman'), 'timesnewroman')
+        self.assertEqual(normalize_font('Helvetica-Oblique'), 'helvetica')
+        self.assertEqual(normalize_font('Arial,Bold'), 'arial')
+
+    def test_profile_fields(self):
+        profile = ConferenceProfile(make_conference())
+        self.assertEqual(profile.required_sections,
+                         ('Introduction', 'Conclusion'))
+        self.assertEqual(profile.allowed_fonts,
+                         frozenset({'arial', 'helvetica', 'timesnewroman'}))
+        self.assertEqual(profile.custom_checks, {'code_snippets': 1})
+
+    def test_wildcard_allows_every_font(self):
+        profile = ConferenceProfile(make_conference(allowed_fonts='*'))
+        self.assertIsNone(profile.allowed_fonts)
+        self.assertTrue(profile.is_font_allowed('Comic Sans MS'))
+
+    def test_profile_is_reused_until_edited(self):
+        conference = make_conference()
+        profile = get_profile(conference)
+        self.assertIs(get_profile(conference), profile)
+
+        conference.allowed_fonts = 'Arial'
+        edited = get_profile(conference)
+        self.assertIsNot(edited, profile)
+        self.assertEqual(edited.allowed_fonts, frozenset({'arial'}))
+
+    def test_invalidate_profile(self):
+        conference = make_conference()
+        profile = get_profile(conference)
+        invalidate_profile(conference.id)
+        self.assertIsNot(get_profile(conference), profile)
+
+    def test_font_usage_matches_subset_names(self):
+        slide_data = {
+            'type': 'pdf',
+            'fonts': ['ABCDEF+Arial-BoldMT', 'TimesNewRomanPSMT']
+        }
+        result = check_font_usage(slide_data, make_conference())
+        self.assertTrue(result['passed'])
+
+        slide_data['fonts'].append('GHIJKL+ComicSansMS')
+        result = check_font_usage(slide_data, make_conference())
+        self.assertFalse(result['passed'])
+        self.assertIn('GHIJKL+ComicSansMS', result['message'])
+
+
+
+class TestFontUsageOnProcessedDecks(unittest.TestCase):
+
+    def setUp(self):
+        invalidate_profile()
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        patcher = mock.patch('utils.slide_deck.slide_cache',
+                             DiskCache(os.path.join(temp_dir.name, 'slides')))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def font_check(self, slide_data, allowed_fonts):
+        self.addCleanup(slide_data.close)
+        results = run_deterministic_checks(
+            slide_data, make_conference(allowed_fonts=allowed_fonts))
+        return {r['check']: r for r in results}['Font usage']
+
+    def test_pptx_run_fonts_are_checked(self):
+        path = os.path.join(SAMPLE_DATA, 'sample.pptx')
+        result = self.font_check(process_file(path), 'Arial')
+        self.assertFalse(result['passed'])
+        self.assertIn('Segoe UI', result['message'])
+
+        result = self.font_check(process_file(path), 'Arial,Segoe UI')
+        self.assertTrue(result['passed'])
+
+    def test_pdf_fonts_are_checked(self):
+        doc = fitz.open()
+        doc.new_page().insert_text((72, 72), 'Introduction', fontname='helv')
+        pdf_bytes = doc.tobytes()
+        doc.close()
+        result = self.font_check(
+            process_file(pdf_bytes, filename='deck.pdf'), 'Helvetica')
+        self.assertTrue(result['passed'])
+        self.assertEqual(result['message'],
+                         'All fonts used are allowed: Helvetica')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,328 @@
+import unittest
+import os
+import sys
+import shutil
+import tempfile
+from io import BytesIO
+from datetime import datetime, timedelta
+from unittest import mock
+
+# Add the parent directory to sys.path to allow imports from the utils folder
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+TEMP_DIR = tempfile.mkdtemp()
+os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(TEMP_DIR, 'app.db')
+os.environ['SLIDECHECK_JOB_DB'] = os.path.join(TEMP_DIR, 'jobs.db')
+os.environ['SLIDECHECK_JOB_WORKERS'] = '0'
+os.environ['UPLOAD_FOLDER'] = os.path.join(TEMP_DIR, 'uploads')
+
+import fitz
+from app import (app, db, CheckResult, Conference, Submission,
+                 rebuild_analytics, recount_submissions)
+from utils.master_deck import MasterDeck
+from utils.pagination import decode_cursor, encode_cursor
+
+
+def tearDownModule():
+    shutil.rmtree(TEMP_DIR, ignore_errors=True)
+
+
+class TestCursor(unittest.TestCase):
+
+    def test_round_trips(self):
+        timestamp = datetime(2024, 9, 27, 20, 18, 20, 685667)
+        self.assertEqual(decode_cursor(encode_cursor(timestamp, 42)),
+                         (timestamp, 42))
+
+    def test_rejects_garbage(self):
+        with self.assertRaises(ValueError):
+            decode_cursor('not-a-cursor')
+
+
+class TestSubmissionsApi(unittest.TestCase):
+
+    def setUp(self):
+        self.client = app.test_client()
+        self.context = app.app_context()
+        self.context.push()
+        self.addCleanup(self.context.pop)
+        Submission.query.delete()
+        db.session.commit()
+        recount_submissions()
+        rebuild_analytics()
+        start = datetime(2024, 1, 1)
+        # Pairs share a timestamp so paging must break ties on id
+        for i in range(25):
+            db.session.add(
+                Submission(filename=f'deck{i}.pdf',
+                           results=[{
+                               'check': 'File type',
+                               'passed': True,
+                               'message': 'File type is pdf.'
+                           }],
+                           timestamp=start + timedelta(minutes=i // 2),
+                           passed=i % 3 == 0))
+        db.session.commit()
+
+    def pages(self, status='all'):
+        ids, cursor = [], None
+        while True:
+            url = f'/api/submissions?filter={status}&limit=7'
+            if cursor:
+                url += f'&cursor={cursor}'
+            data = self.client.get(url).get_json()
+            ids.extend(row['id'] for row in data['submissions'])
+            cursor = data['next_cursor']
+            if cursor is None:
+                return ids, data['counts']
+
+    def test_keyset_pages_cover_every_row_once_newest_first(self):
+        ids, counts = self.pages()
+        expected = [
+            row.id for row in Submission.query.order_by(
+                Submission.timestamp.desc(), Submission.id.desc())
+        ]
+        self.assertEqual(ids, expected)
+        self.assertEqual(counts, {'total': 25, 'passed': 9, 'pending': 16})
+
+    def test_filters_by_outcome(self):
+        passed, _ = self.pages('passed')
+        failed, _ = self.pages('failed')
+        self.assertEqual(len(passed), 9)
+        self.assertEqual(len(failed), 16)
+        self.assertFalse(set(passed) & set(failed))
+
+    def test_counters_follow_updates_and_deletes(self):
+        submission = Submission.query.filter_by(passed=False).first()
+        submission.passed = True
+        db.session.commit()
+        db.session.delete(Submission.query.filter_by(passed=False).first())
+        db.session.commit()
+        _, counts = self.pages()
+        self.assertEqual(counts, {'total': 24, 'passed': 10, 'pending': 14})
+
+    def test_bad_cursor_is_rejected(self):
+        response = self.client.get('/api/submissions?cursor=nope')
+        self.assertEqual(response.status_code, 400)
+
+    def test_submission_details(self):
+        submission = Submission.query.first()
+        data = self.client.get(f'/api/submission/{submission.id}').get_json()
+        self.assertEqual(data['results'][0]['check'], 'File type')
+        self.assertEqual(
+            self.client.get('/api/submission/99999').status_code, 404)
+
+
+class TestStatsApi(unittest.TestCase):
+
+    def setUp(self):
+        self.client = app.test_client()
+        self.context = app.app_context()
+        self.context.push()
+        self.addCleanup(self.context.pop)
+        Submission.query.delete()
+        db.session.commit()
+        rebuild_analytics()
+        today = datetime.utcnow()
+
+        def checks(title_passed, ai_message='No clear title slide detected.'):
+            return [{
+                'check': 'File type',
+                'passed': True,
+                'message': 'File type is pdf.'
+            }, {
+                'check': 'Title Slide',
+                'passed': title_passed,
+                'message': ai_message
+            }]
+
+        for day, conference_id, title_passed, seconds in (
+            (0, 1, True, 1.5), (0, 1, False, 2.5), (1, 1, False, 4),
+            (1, 2, False, 40), (2, 1, True, 6)):
+            db.session.add(
+                Submission(filename='deck.pdf',
+                           results=checks(title_passed),
+                           timestamp=today - timedelta(days=day),
+                           passed=title_passed,
+                           conference_id=conference_id,
+                           processing_time=seconds))
+        db.session.add(
+            Submission(filename='deck.pdf',
+                       results=checks(
+                           False, 'AI check deferred: the AI service is '
+                           'degraded, please resubmit later.'),
+                       timestamp=today,
+                       passed=False,
+                       conference_id=1))
+        db.session.commit()
+
+    def test_failure_rates_per_check(self):
+        stats = self.client.get('/api/stats').get_json()
+        self.assertEqual(stats['submissions']['total'], 6)
+        checks = {check['check']: check for check in stats['checks']}
+        self.assertEqual(stats['checks'][0]['check'], 'Title Slide')
+        # The deferred check did not run, so it is not counted as a failure
+        self.assertEqual(checks['Title Slide']['unavailable'], 1)
+        self.assertEqual(checks['Title Slide']['failure_rate'], 0.6)
+        self.assertEqual(checks['File type']['failure_rate'], 0)
+        self.assertEqual(len(checks['Title Slide']['trend']), 3)
+        self.assertEqual(CheckResult.query.count(), 12)
+
+    def test_scoped_to_conference_and_period(self):
+        stats = self.client.get(
+            '/api/stats?conference_id=1&days=2').get_json()
+        self.assertEqual(stats['submissions']['total'], 4)
+        self.assertEqual([day['total'] for day in stats['trend']], [1, 3])
+        self.assertEqual(stats['processing_time']['count'], 3)
+        self.assertTrue(2 <= stats['processing_time']['p50'] <= 3)
+
+    def test_deletes_are_rolled_back_out(self):
+        db.session.delete(Submission.query.filter_by(conference_id=2).one())
+        db.session.commit()
+        stats = self.client.get('/api/stats').get_json()
+        self.assertEqual(stats['submissions']['total'], 5)
+        self.assertEqual(stats['processing_time']['count'], 4)
+        self.assertEqual(CheckResult.query.count(), 10)
+
+    def test_updates_move_submissions_between_rollups(self):
+        submission = Submission.query.filter_by(conference_id=2).one()
+        submission.passed = True
+        db.session.commit()
+        self.assertEqual(
+            self.client.get('/api/stats').get_json()['submissions']['passed'],
+            3)
+        # Expired attributes still report their old value to the listener
+        db.session.expire_all()
+        submission = Submission.query.filter_by(conference_id=2).one()
+        submission.conference_id = 1
+        db.session.commit()
+        stats = self.client.get('/api/stats?conference_id=1').get_json()
+        self.assertEqual(stats['submissions']['total'], 6)
+        self.assertEqual(stats['submissions']['passed'], 3)
+        self.assertEqual(CheckResult.query.count(), 12)
+
+
+class TestProcessApi(unittest.TestCase):
+
+    def setUp(self):
+        self.client = app.test_client()
+        self.context = app.app_context()
+        self.context.push()
+        self.addCleanup(self.context.pop)
+        self.conference = Conference(name='PyCon', max_slides=30)
+        db.session.add(self.conference)
+        db.session.commit()
+        self.addCleanup(self.remove_conference)
+        patcher = mock.patch('app.job_queue.submit', return_value='job1')
+        self.submit = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def remove_conference(self):
+        db.session.delete(self.conference)
+        db.session.commit()
+
+    def test_stored_filename_is_sanitized(self):
+        response = self.client.post(
+            '/process',
+            data={
+                'conference_id': str(self.conference.id),
+                'file': (BytesIO(b'%PDF-1.4'),
+                         '<img src=x onerror=alert(1)>.pdf')
+            })
+        self.assertEqual(response.status_code, 202)
+        payload = self.submit.call_args.args[0]
+        self.addCleanup(os.remove, payload['file_path'])
+        self.assertEqual(os.path.dirname(payload['file_path']),
+                         os.path.join(TEMP_DIR, 'uploads'))
+        self.assertEqual(payload['filename'], 'img_srcx_onerroralert1.pdf')
+
+    def test_non_numeric_conference_id_is_rejected(self):
+        response = self.client.post('/process',
+                                    json={
+                                        'conference_id': 'pycon',
+                                        'url': 'https://example.com/deck.pdf'
+                                    })
+        self.assertEqual(response.status_code, 400)
+        self.submit.assert_not_called()
+
+    def test_only_http_urls_are_accepted(self):
+        response = self.client.post('/process',
+                                    json={
+                                        'conference_id': self.conference.id,
+                                        'url': 'javascript:alert(1)'
+                                    })
+        self.assertEqual(response.status_code, 400)
+        self.submit.assert_not_called()
+        response = self.client.post('/process',
+                                    json={
+                                        'conference_id': self.conference.id,
+                                        'url': 'https://example.com/deck.pdf'
+                                    })
+        self.assertEqual(response.status_code, 202)
+
+
+class TestMasterDeckDownload(unittest.TestCase):
+
+    def setUp(self):
+        self.client = app.test_client()
+        self.context = app.app_context()
+        self.context.push()
+        self.addCleanup(self.context.pop)
+        Submission.query.delete()
+        db.session.commit()
+        patcher = mock.patch('app.master_deck',
+                             MasterDeck(os.path.join(TEMP_DIR, 'master')))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def add_talk(self, name, passed=True):
+        path = os.path.join(TEMP_DIR, f'{name}.pdf')
+        doc = fitz.open()
+        doc.new_page().insert_text((72, 72), name)
+        doc.save(path)
+        doc.close()
+        db.session.add(
+            Submission(filename=f'{name}.pdf',
+                       results=[],
+                       passed=passed,
+                       deck_file=path))
+        db.session.commit()
+
+    def test_no_accepted_decks(self):
+        self.add_talk('rejected', passed=False)
+        response = self.client.get('/download_master_deck')
+        self.assertEqual(response.status_code, 404)
+
+    def test_serves_accepted_talks_with_range_support(self):
+        self.add_talk('first')
+        self.add_talk('rejected', passed=False)
+        self.add_talk('second')
+        response = self.client.get('/download_master_deck')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, 'application/pdf')
+        body = response.get_data()
+        with fitz.open(stream=body, filetype='pdf') as merged:
+            self.assertEqual([entry[1] for entry in merged.get_toc()],
+                             ['first.pdf', 'second.pdf'])
+
+        partial = self.client.get('/download_master_deck',
+                                  headers={
+                                      'Range': 'bytes=100-199',
+                                      'If-Range': response.headers['ETag']
+                                  })
+        self.assertEqual(partial.status_code, 206)
+        self.assertEqual(partial.get_data(), body[100:200])
+
+        # A newly accepted talk changes the ETag, so a stale resume gets
+        # the whole file again
+        self.add_talk('third')
+        stale = self.client.get('/download_master_deck',
+                                headers={
+                                    'Range': 'bytes=100-199',
+                                    'If-Range': response.headers['ETag']
+                                })
+        self.assertEqual(stale.status_code, 200)
+
+
+if __name__ == "__main__":
+    unittest.main()
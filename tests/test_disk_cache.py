@@ -0,0 +1,88 @@
+import unittest
+import os
+import sys
+import time
+import tempfile
+from unittest import mock
+
+# Add the parent directory to sys.path to allow imports from the utils folder
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.disk_cache import DiskCache, hash_file, hash_json
+
+
+class TestDiskCache(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+
+    def test_round_trip(self):
+        cache = DiskCache(self.temp_dir.name)
+        cache.set('deck', {'results': [{'check': 'File type'}]})
+        self.assertEqual(cache.get('deck'),
+                         {'results': [{'check': 'File type'}]})
+        self.assertIsNone(cache.get('missing'))
+
+    def test_evicts_least_recently_used(self):
+        cache = DiskCache(self.temp_dir.name, max_bytes=350)
+        payload = 'x' * 100
+        cache.set('a', payload)
+        cache.set('b', payload)
+        past = time.time() - 60
+        os.utime(cache._path('a'), (past, past))
+        os.utime(cache._path('b'), (past + 1, past + 1))
+        cache.get('a')
+        cache.set('c', payload)
+        self.assertIsNotNone(cache.get('a'))
+        self.assertIsNone(cache.get('b'))
+        self.assertIsNotNone(cache.get('c'))
+
+    def test_writes_do_not_rescan_the_directory(self):
+        cache = DiskCache(self.temp_dir.name, max_bytes=10_000)
+        cache.set('first', 'x')
+        with mock.patch('utils.disk_cache.os.scandir',
+                        wraps=os.scandir) as scandir:
+            for i in range(200):
+                cache.set(f'key{i}', 'x' * 100)
+        self.assertEqual(scandir.call_count, 0)
+        total = sum(
+            os.path.getsize(os.path.join(self.temp_dir.name, name))
+            for name in os.listdir(self.temp_dir.name))
+        self.assertLessEqual(total, 10_000)
+        self.assertIsNotNone(cache.get('key199'))
+        self.assertIsNone(cache.get('key0'))
+
+    def test_new_instance_resumes_lru_order_from_disk(self):
+        cache = DiskCache(self.temp_dir.name)
+        for i, key in enumerate(('old', 'recent')):
+            cache.set(key, 'x' * 100)
+            past = time.time() - 60 + i
+            os.utime(cache._path(key), (past, past))
+        reopened = DiskCache(self.temp_dir.name, max_bytes=350)
+        reopened.set('new', 'x' * 100)
+        self.assertIsNone(reopened.get('old'))
+        self.assertIsNotNone(reopened.get('recent'))
+
+    def test_expired_entries_are_misses(self):
+        cache = DiskCache(self.temp_dir.name, ttl=60)
+        cache.set('prompt', 'Yes')
+        self.assertEqual(cache.get('prompt'), 'Yes')
+        path = cache._path('prompt')
+        with open(path, 'w') as f:
+            f.write('{"created": 0, "value": "Yes"}')
+        self.assertIsNone(cache.get('prompt'))
+        self.assertFalse(os.path.exists(path))
+        self.assertEqual(cache.stats(), {'hits': 1, 'misses': 1})
+
+    def test_hashes_are_stable(self):
+        path = os.path.join(self.temp_dir.name, 'deck.pdf')
+        with open(path, 'wb') as f:
+            f.write(b'%PDF-1.4')
+        self.assertEqual(hash_file(path), hash_file(path))
+        self.assertEqual(hash_json({'a': 1, 'b': 2}),
+                         hash_json({'b': 2, 'a': 1}))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,130 @@
+import unittest
+import os
+import sys
+import subprocess
+import tempfile
+import zipfile
+from unittest import mock
+
+# Add the parent directory to sys.path to allow imports from the utils folder
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fitz
+from utils import format_registry
+from utils.format_registry import get_handler, handler_for, register_format
+from utils.file_processor import process_file
+from utils.odp_format import extract_odp
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ODP_CONTENT = """<?xml version="1.0" encoding="UTF-8"?>
+<office:document-content
+    xmlns:office="urn:oasis:names:tc:opendocument:xmlns:office:1.0"
+    xmlns:style="urn:oasis:names:tc:opendocument:xmlns:style:1.0"
+    xmlns:text="urn:oasis:names:tc:opendocument:xmlns:text:1.0"
+    xmlns:draw="urn:oasis:names:tc:opendocument:xmlns:drawing:1.0"
+    xmlns:presentation="urn:oasis:names:tc:opendocument:xmlns:presentation:1.0"
+    xmlns:svg="urn:oasis:names:tc:opendocument:xmlns:svg-compatible:1.0"
+    xmlns:xlink="http://www.w3.org/1999/xlink">
+  <office:font-face-decls>
+    <style:font-face style:name="Liberation Sans" svg:font-family="'Liberation Sans'"/>
+  </office:font-face-decls>
+  <office:automatic-styles>
+    <style:style style:name="T1" style:family="text">
+      <style:text-properties style:font-name="Liberation Sans"/>
+    </style:style>
+  </office:automatic-styles>
+  <office:body>
+    <office:presentation>
+      <draw:page draw:name="page1">
+        <draw:frame><draw:text-box>
+          <text:p><text:span text:style-name="T1">Introduction</text:span></text:p>
+        </draw:text-box></draw:frame>
+        <presentation:notes><draw:frame><draw:text-box>
+          <text:p>Speaker notes</text:p>
+        </draw:text-box></draw:frame></presentation:notes>
+      </draw:page>
+      <draw:page draw:name="page2">
+        <draw:frame><draw:image xlink:href="Pictures/photo.png"/></draw:frame>
+        <draw:frame><draw:text-box><text:p>Conclusion</text:p>
+          <text:list><text:list-item><text:p>Faster</text:p></text:list-item>
+          <text:list-item><text:p>Cheaper</text:p></text:list-item></text:list>
+        </draw:text-box></draw:frame>
+      </draw:page>
+    </office:presentation>
+  </office:body>
+</office:document-content>
+"""
+
+
+class TestFormatRegistry(unittest.TestCase):
+
+    def test_resolves_by_mime_type_then_extension(self):
+        self.assertEqual(handler_for('application/pdf', '.md'), 'pdf')
+        self.assertEqual(handler_for('application/zip', '.pptx'), 'pptx')
+        self.assertEqual(handler_for('text/plain', '.md'), 'md')
+        self.assertEqual(handler_for('application/x-foo', '.key'), 'key')
+        self.assertIsNone(handler_for('text/plain', '.txt'))
+
+    def test_plugins_can_register_formats(self):
+        handler = mock.Mock(return_value={'type': 'pdf'})
+        register_format('test-format', handler, extensions=('.tst', ))
+        self.addCleanup(format_registry._handlers.pop, 'test-format')
+        self.assertEqual(handler_for('application/octet-stream', '.TST'),
+                         'test-format')
+        self.assertIs(get_handler('test-format'), handler)
+
+    def test_processes_in_memory_pdf(self):
+        doc = fitz.open()
+        doc.new_page().insert_text((72, 72), "Hello")
+        pdf_bytes = doc.tobytes()
+        doc.close()
+        result = process_file(pdf_bytes, filename='deck.pdf')
+        self.assertEqual(result['num_slides'], 1)
+        self.assertEqual(result['original_type'], 'application/pdf')
+        result.close()
+
+    def test_importing_the_pipeline_defers_converters(self):
+        code = ("import sys, utils.file_processor, utils.ai_checker; "
+                "heavy = ['pptx', 'reportlab', 'weasyprint', 'markdown', "
+                "'openai', 'utils.pptx_format']; "
+                "print([name for name in heavy if name in sys.modules])")
+        output = subprocess.run([sys.executable, '-c', code],
+                                cwd=REPO_ROOT,
+                                capture_output=True,
+                                text=True,
+                                check=True).stdout
+        self.assertEqual(output.strip().splitlines()[-1], '[]')
+
+
+class TestOdpFormat(unittest.TestCase):
+
+    def test_extracts_text_fonts_and_media(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, 'deck.odp')
+            with zipfile.ZipFile(path, 'w') as package:
+                package.writestr(
+                    'mimetype',
+                    'application/vnd.oasis.opendocument.presentation')
+                package.writestr('content.xml', ODP_CONTENT)
+                package.writestr('Pictures/photo.png', b'\x89PNG' + b'\0' * 60)
+            result = extract_odp(path)
+
+        self.assertEqual(result['num_slides'], 2)
+        self.assertEqual(result['content'],
+                         ['Introduction', 'Conclusion\nFaster\nCheaper'])
+        self.assertEqual(result['slide_bullets'], [0, 2])
+        self.assertEqual(result['fonts'], ['Liberation Sans'])
+        self.assertEqual(result['media'], [{
+            'slide': 2,
+            'kind': 'image',
+            'content_type': None,
+            'part': '/Pictures/photo.png',
+            'size': 64,
+        }])
+        self.assertEqual(len(set(result['slide_fingerprints'])), 2)
+        self.assertFalse(result.has_document())
+
+
+if __name__ == '__main__':
+    unittest.main()
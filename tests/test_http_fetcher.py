@@ -0,0 +1,120 @@
+import unittest
+import os
+import sys
+import tempfile
+import threading
+from unittest import mock
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add the parent directory to sys.path to allow imports from the utils folder
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import requests
+from utils import http_fetcher
+from utils.disk_cache import DiskCache
+from utils.http_fetcher import DownloadTooLargeError, fetch
+from utils.workspace import workspace
+
+DECK = b'%PDF-1.4 ' + b'x' * 1000
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    requests_seen = []
+
+    def do_GET(self):
+        self.requests_seen.append(self.path)
+        if self.path == '/deck.pdf':
+            if self.headers.get('If-None-Match') == '"v1"':
+                self.send_response(304)
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header('ETag', '"v1"')
+            self.send_header('Content-Type', 'application/pdf')
+            self.send_header('Content-Length', str(len(DECK)))
+            self.end_headers()
+            self.wfile.write(DECK)
+        elif self.path == '/chunked.pdf':
+            # No Content-Length, so the size cap has to trip mid-stream.
+            self.send_response(200)
+            self.end_headers()
+            self.wfile.write(DECK)
+        else:
+            self.send_response(404)
+            self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+class TestHttpFetcher(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), StandInHandler)
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_port}"
+        cls.thread = threading.Thread(target=cls.server.serve_forever,
+                                      daemon=True)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        original_cache = http_fetcher.download_cache
+        http_fetcher.download_cache = DiskCache(self.temp_dir.name)
+        self.addCleanup(setattr, http_fetcher, 'download_cache',
+                        original_cache)
+        StandInHandler.requests_seen = []
+        self.enterContext(workspace.scope())
+
+    def test_streams_body_to_disk(self):
+        result = fetch(f"{self.base_url}/deck.pdf")
+        self.assertEqual(result.status_code, 200)
+        self.assertEqual(result.read_bytes(), DECK)
+        self.assertEqual(result.content_type, 'application/pdf')
+
+    def test_unchanged_deck_is_revalidated_not_downloaded(self):
+        first = fetch(f"{self.base_url}/deck.pdf")
+        second = fetch(f"{self.base_url}/deck.pdf")
+        self.assertTrue(second.not_modified)
+        self.assertEqual(second.status_code, 304)
+        self.assertNotEqual(second.path, first.path)
+        self.assertEqual(second.read_bytes(), DECK)
+
+    def test_fetched_files_outlive_the_download_cache(self):
+        first = fetch(f"{self.base_url}/deck.pdf")
+        second = fetch(f"{self.base_url}/deck.pdf")
+        http_fetcher.download_cache.clear()
+        self.assertEqual(first.read_bytes(), DECK)
+        self.assertEqual(second.read_bytes(), DECK)
+
+    def test_evicted_download_is_fetched_again(self):
+        fetch(f"{self.base_url}/deck.pdf")
+        # The cached body disappears between the 304 and reading it
+        with mock.patch('utils.http_fetcher._workspace_link',
+                        return_value=None):
+            result = fetch(f"{self.base_url}/deck.pdf")
+        self.assertEqual(result.status_code, 200)
+        self.assertEqual(result.read_bytes(), DECK)
+        self.assertEqual(len(StandInHandler.requests_seen), 3)
+
+    def test_rejects_oversized_content_length(self):
+        with self.assertRaises(DownloadTooLargeError):
+            fetch(f"{self.base_url}/deck.pdf", max_bytes=100)
+
+    def test_rejects_oversized_stream(self):
+        with self.assertRaises(DownloadTooLargeError):
+            fetch(f"{self.base_url}/chunked.pdf", max_bytes=100)
+
+    def test_http_errors_raise(self):
+        with self.assertRaises(requests.HTTPError):
+            fetch(f"{self.base_url}/missing.pdf")
+
+
+if __name__ == "__main__":
+    unittest.main()
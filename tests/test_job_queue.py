@@ -0,0 +1,171 @@
+import unittest
+import os
+import sys
+import time
+import sqlite3
+import tempfile
+
+# Add the parent directory to sys.path to allow imports from the utils folder
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.job_queue import JobQueue, validation_events
+
+
+def echo_handler(payload, progress):
+    progress('extraction', {'num_slides': payload['num_slides']})
+    if payload.get('fail'):
+        raise ValueError('conversion failed')
+    return {'ok': True}
+
+
+def staged_handler(payload, progress):
+    progress('extraction', {'num_slides': 2})
+    progress('deterministic', [{'check': 'Slide Count', 'passed': True}])
+    relevance = {'check': 'Content Relevance', 'passed': True}
+    media = {'check': 'Media Content', 'passed': False}
+    progress('ai_check', [media])
+    progress('ai_check', [media, relevance])
+    progress('ai', [relevance, media])
+    return {'ai_results': [relevance, media], 'cached': False}
+
+
+class TestJobQueue(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.queue = JobQueue(os.path.join(self.temp_dir.name, 'jobs.db'),
+                              handler=echo_handler)
+
+    def test_job_lifecycle(self):
+        job_id = self.queue.submit({'num_slides': 3})
+        self.assertEqual(self.queue.get(job_id)['status'], 'queued')
+        self.assertTrue(self.queue.run_one())
+        job = self.queue.get(job_id)
+        self.assertEqual(job['status'], 'done')
+        self.assertEqual(job['result'], {'ok': True})
+        self.assertEqual(job['partial']['extraction'], {'num_slides': 3})
+        self.assertIn('extraction', job['timings'])
+        self.assertFalse(self.queue.run_one())
+
+    def test_failed_job_records_error(self):
+        job_id = self.queue.submit({'num_slides': 1, 'fail': True})
+        self.queue.run_one()
+        job = self.queue.get(job_id)
+        self.assertEqual(job['status'], 'failed')
+        self.assertEqual(job['error'], 'conversion failed')
+
+    def expire_leases(self):
+        self.queue._conn().execute(
+            "UPDATE jobs SET lease_expires = ? WHERE status = 'running'",
+            (time.time() - 1, ))
+
+    def test_recover_requeues_interrupted_jobs(self):
+        job_id = self.queue.submit({'num_slides': 1})
+        self.queue.claim()
+        self.assertEqual(self.queue.get(job_id)['status'], 'running')
+        self.expire_leases()
+        self.queue.recover()
+        self.assertEqual(self.queue.get(job_id)['status'], 'queued')
+
+    def test_recover_leaves_leased_jobs_alone(self):
+        job_id = self.queue.submit({'num_slides': 1})
+        self.queue.claim('other-worker')
+        # A second process starting up must not steal the running job
+        JobQueue(self.queue.db_path, handler=echo_handler).recover()
+        self.assertEqual(self.queue.get(job_id)['status'], 'running')
+        self.assertFalse(self.queue.run_one())
+
+    def test_expired_lease_is_claimed_again(self):
+        job_id = self.queue.submit({'num_slides': 1})
+        self.queue.claim('dead-worker')
+        self.expire_leases()
+        self.assertTrue(self.queue.run_one())
+        self.assertEqual(self.queue.get(job_id)['status'], 'done')
+        self.assertFalse(self.queue.renew(job_id, 'dead-worker'))
+
+    def test_lease_is_renewed_while_the_job_runs(self):
+        renewed = []
+
+        def slow_handler(payload, progress):
+            row = queue._conn().execute(
+                "SELECT lease_expires FROM jobs").fetchone()
+            time.sleep(0.25)
+            later = queue._conn().execute(
+                "SELECT lease_expires FROM jobs").fetchone()
+            renewed.append(later[0] > row[0])
+            return {}
+
+        queue = JobQueue(self.queue.db_path,
+                         handler=slow_handler,
+                         lease_seconds=0.15)
+        queue.submit({})
+        queue.run_one()
+        self.assertEqual(renewed, [True])
+
+    def test_adds_lease_columns_to_existing_database(self):
+        path = os.path.join(self.temp_dir.name, 'old.db')
+        conn = sqlite3.connect(path)
+        conn.execute(
+            "CREATE TABLE jobs (id TEXT PRIMARY KEY, status TEXT NOT NULL, "
+            "payload TEXT NOT NULL, stage TEXT, partial TEXT NOT NULL "
+            "DEFAULT '{}', result TEXT, error TEXT, timings TEXT NOT NULL "
+            "DEFAULT '{}', created_at REAL NOT NULL, started_at REAL, "
+            "finished_at REAL)")
+        conn.execute("INSERT INTO jobs (id, status, payload, created_at) "
+                     "VALUES ('old', 'running', '{\"num_slides\": 1}', 0)")
+        conn.commit()
+        conn.close()
+        queue = JobQueue(path, handler=echo_handler)
+        queue.recover()
+        self.assertTrue(queue.run_one())
+        self.assertEqual(queue.get('old')['status'], 'done')
+
+    def test_jobs_persist_across_instances(self):
+        job_id = self.queue.submit({'num_slides': 2})
+        reopened = JobQueue(self.queue.db_path, handler=echo_handler)
+        self.assertTrue(reopened.run_one())
+        self.assertEqual(self.queue.get(job_id)['status'], 'done')
+
+    def test_streams_each_check_once_then_done(self):
+        queue = JobQueue(self.queue.db_path, handler=staged_handler)
+        job_id = queue.submit({})
+        queue.run_one()
+        job = queue.get(job_id)
+        self.assertNotIn('ai_check', job['timings'])
+        self.assertIn('ai', job['timings'])
+
+        # Replays the stages a watcher would have seen while the job ran
+        snapshots = []
+        for stage in ('extraction', 'deterministic', 'ai_check', 'ai'):
+            snapshots.append({
+                'status': 'running',
+                'partial': {
+                    name: job['partial'][name]
+                    for name in list(job['partial'])[:len(snapshots) + 1]
+                },
+                'result': None,
+                'error': None,
+            })
+        snapshots.append(job)
+        events = list(validation_events(snapshots))
+        self.assertEqual([name for name, data in events], [
+            'extraction', 'deterministic', 'check', 'check', 'done'
+        ])
+        self.assertEqual(events[2][1]['check'], 'Media Content')
+        self.assertEqual(events[-1][1]['ai_results'][0]['check'],
+                         'Content Relevance')
+
+    def test_watch_ends_with_the_job(self):
+        job_id = self.queue.submit({'num_slides': 1, 'fail': True})
+        self.queue.run_one()
+        events = list(validation_events(self.queue.watch(job_id)))
+        self.assertEqual(events, [('extraction', {
+            'num_slides': 1
+        }), ('failed', {
+            'error': 'conversion failed'
+        })])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,142 @@
+import unittest
+import os
+import sys
+import json
+from types import SimpleNamespace
+from unittest import mock
+
+# Add the parent directory to sys.path to allow imports from the utils folder
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.llm_backend import (FakeBackend, LLMError, OpenAIBackend,
+                               RateLimitedError, fake_backend_from_spec,
+                               set_backend)
+from utils.retry_policy import CircuitBreaker
+from utils import ai_checker
+
+MESSAGES = [{'role': 'user', 'content': 'Is this a title slide?'}]
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class TestFakeBackend(unittest.TestCase):
+
+    def test_answers_like_the_checks_expect(self):
+        backend = FakeBackend()
+        self.assertEqual(backend.complete('gpt-4', MESSAGES, 300), 'Yes')
+        verdict = json.loads(
+            backend.complete('gpt-4o', MESSAGES, 300,
+                             response_format={'type': 'json_object'}))
+        self.assertEqual(set(verdict),
+                         {'title_slide', 'text_heavy', 'relevant'})
+
+    def test_sleeps_for_sampled_latency(self):
+        clock = FakeClock()
+        backend = FakeBackend(latency='uniform:0.5:1.5',
+                              seed=1,
+                              sleep=clock.sleep,
+                              clock=clock)
+        for _ in range(20):
+            backend.complete('gpt-4', MESSAGES, 300)
+        self.assertGreater(clock.now, 10)
+        self.assertLess(clock.now, 30)
+
+    def test_error_rate_is_reproducible_with_seed(self):
+
+        def failures(seed):
+            backend = FakeBackend(error_rate=0.3, seed=seed)
+            outcomes = []
+            for _ in range(50):
+                try:
+                    backend.complete('gpt-4', MESSAGES, 300)
+                    outcomes.append(False)
+                except LLMError:
+                    outcomes.append(True)
+            return outcomes
+
+        self.assertEqual(failures(7), failures(7))
+        self.assertTrue(5 < sum(failures(7)) < 30)
+
+    def test_requests_per_minute_returns_429_with_retry_after(self):
+        clock = FakeClock()
+        backend = FakeBackend(requests_per_minute=2,
+                              sleep=clock.sleep,
+                              clock=clock)
+        backend.complete('gpt-4', MESSAGES, 300)
+        clock.now = 10
+        backend.complete('gpt-4', MESSAGES, 300)
+        with self.assertRaises(RateLimitedError) as raised:
+            backend.complete('gpt-4', MESSAGES, 300)
+        self.assertAlmostEqual(raised.exception.retry_after, 50)
+        clock.now = 61
+        backend.complete('gpt-4', MESSAGES, 300)
+
+    def test_builds_from_spec(self):
+        backend = fake_backend_from_spec(
+            'latency=constant:0, error_rate=0.1, requests_per_minute=60, seed=3')
+        self.assertEqual(backend.error_rate, 0.1)
+        self.assertEqual(backend.requests_per_minute, 60)
+        with self.assertRaises(ValueError):
+            fake_backend_from_spec('latency=gamma:1')
+        with self.assertRaises(ValueError):
+            fake_backend_from_spec('colour=blue')
+
+
+class TestCheckerUsesBackend(unittest.TestCase):
+
+    def setUp(self):
+        self.backend = FakeBackend()
+        previous = set_backend(self.backend)
+        self.addCleanup(set_backend, previous)
+        for target, value in (('utils.ai_checker.circuit_breaker',
+                               CircuitBreaker(threshold=100)),
+                              ('utils.ai_checker.rate_limiter', mock.Mock())):
+            patcher = mock.patch(target, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_requests_go_to_the_configured_backend(self):
+        with mock.patch.object(ai_checker.response_cache, 'set') as cache_set:
+            response = ai_checker.send_openai_request_with_function(
+                'Is this a title slide?')
+        self.assertEqual(response, 'Yes')
+        self.assertEqual(self.backend.calls, 1)
+        # Stand-in answers never reach the response cache
+        cache_set.assert_not_called()
+
+    def test_backend_errors_are_retried(self):
+        self.backend.error_rate = 1.0
+        with mock.patch('utils.ai_checker.time.sleep'):
+            response = ai_checker.send_openai_request_with_function(
+                'Is this a title slide?', max_retries=3)
+        self.assertTrue(response.startswith('AI check failed'))
+        self.assertEqual(self.backend.calls, 3)
+
+
+class TestOpenAIBackend(unittest.TestCase):
+
+    def test_answers_without_text_are_empty(self):
+        backend = OpenAIBackend(api_key='test')
+        backend._client = mock.Mock()
+        create = backend._client.chat.completions.create
+        create.return_value = SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=None))])
+        self.assertEqual(backend.complete('gpt-4o', MESSAGES, 300), '')
+
+    def test_answers_without_text_are_not_unavailable(self):
+        self.assertFalse(ai_checker.is_unavailable(None))
+        self.assertFalse(ai_checker.is_unavailable(''))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import unittest
+import os
+import sys
+import tempfile
+from unittest import mock
+
+# Add the parent directory to sys.path to allow imports from the utils folder
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fitz
+from utils import ai_checker, slide_deck, validator
+from utils.llm_backend import FakeBackend
+from utils.loadgen import percentile, run_load_test
+from utils.retry_policy import CircuitBreaker, RetryPolicy
+
+RULES = {
+    'name': 'Load test',
+    'max_slides': 30,
+    'required_sections': '',
+    'allowed_fonts': '*',
+    'custom_checks': None,
+}
+
+
+class TestLoadgen(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.pdf_path = os.path.join(self.temp_dir.name, 'deck.pdf')
+        doc = fitz.open()
+        for text in ('Load Testing Slide Checks', 'Results'):
+            doc.new_page().insert_text((72, 72), text)
+        doc.save(self.pdf_path)
+        doc.close()
+
+    def test_every_submission_skips_caches_and_shared_limiter(self):
+        shared = {
+            (validator, 'result_cache'): mock.Mock(),
+            (slide_deck, 'slide_cache'): mock.Mock(),
+            (ai_checker, 'response_cache'): mock.Mock(),
+            (ai_checker, 'rate_limiter'): mock.Mock(),
+        }
+        for (module, name), stand_in in shared.items():
+            patcher = mock.patch.object(module, name, stand_in)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        backend = FakeBackend()
+        report = run_load_test([self.pdf_path], RULES, submissions=3,
+                               concurrency=2, backend=backend)
+
+        self.assertEqual(report['errors'], 0)
+        self.assertEqual(report['ai_failed'], 0)
+        self.assertEqual(report['passed'] + report['failed'], 3)
+        self.assertEqual(backend.calls % 3, 0)
+        self.assertGreater(backend.calls, 0)
+        for (module, name), stand_in in shared.items():
+            self.assertEqual(stand_in.method_calls, [], name)
+            self.assertIs(getattr(module, name), stand_in)
+
+    def test_failed_ai_checks_are_counted(self):
+        for name, value in (('retry_policy', RetryPolicy(1, 0, 0)),
+                            ('circuit_breaker',
+                             CircuitBreaker(threshold=100))):
+            patcher = mock.patch.object(ai_checker, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        report = run_load_test([self.pdf_path], RULES, submissions=2,
+                               concurrency=2,
+                               backend=FakeBackend(error_rate=1.0))
+
+        self.assertEqual(report['ai_failed'], 2)
+        self.assertEqual(report['ai_deferred'], 0)
+
+    def test_percentile(self):
+        self.assertEqual(percentile([], 0.5), 0.0)
+        self.assertEqual(percentile([3, 1, 2], 0.5), 2)
+        self.assertEqual(percentile([3, 1, 2], 0.99), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+import unittest
+import os
+import sys
+import tempfile
+from unittest import mock
+
+# Add the parent directory to sys.path to allow imports from the utils folder
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fitz
+from utils import master_deck
+from utils.master_deck import MasterDeck, keep_deck
+from utils.slide_deck import SlideDeck
+
+
+class TestMasterDeck(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.master = MasterDeck(os.path.join(self.temp_dir.name, 'master'))
+
+    def make_pdf(self, name, pages, bookmark=False):
+        path = os.path.join(self.temp_dir.name, f'{name}.pdf')
+        doc = fitz.open()
+        for i in range(pages):
+            doc.new_page().insert_text((72, 72), f'{name} slide {i + 1}')
+        if bookmark:
+            doc.set_toc([[1, 'Results', pages]])
+        doc.save(path)
+        doc.close()
+        return path
+
+    def talk(self, key, pages=2, **options):
+        return {
+            'key': key,
+            'title': f'Talk {key}',
+            'path': self.make_pdf(f'talk{key}', pages, **options)
+        }
+
+    def opened_paths(self, talks):
+        with mock.patch('utils.master_deck.fitz.open',
+                        wraps=fitz.open) as opened:
+            manifest = self.master.update(talks)
+        return manifest, [
+            call.args[0] for call in opened.call_args_list if call.args
+        ]
+
+    def test_builds_merged_pdf_with_a_bookmark_per_talk(self):
+        talks = [self.talk(1, 2), self.talk(2, 3, bookmark=True)]
+        manifest = self.master.update(talks)
+        with fitz.open(self.master.pdf_path) as merged:
+            self.assertEqual(len(merged), 5)
+            self.assertEqual(merged.get_toc(), [[1, 'Talk 1', 1],
+                                                [1, 'Talk 2', 3],
+                                                [2, 'Results', 5]])
+        self.assertEqual([entry['first_page'] for entry in manifest['talks']],
+                         [1, 3])
+
+    def test_appends_new_talks_without_remerging(self):
+        talks = [self.talk(1), self.talk(2)]
+        first = self.master.update(talks)
+        talks.append(self.talk(3))
+        manifest, opened = self.opened_paths(talks)
+        self.assertEqual(opened, [self.master.pdf_path, talks[2]['path']])
+        self.assertNotEqual(manifest['etag'], first['etag'])
+        with fitz.open(self.master.pdf_path) as merged:
+            self.assertEqual(len(merged), 6)
+            self.assertEqual([entry[1] for entry in merged.get_toc()],
+                             ['Talk 1', 'Talk 2', 'Talk 3'])
+
+        # Nothing new: the cached file is served as is
+        manifest, opened = self.opened_paths(talks)
+        self.assertEqual(opened, [])
+
+    def test_rebuilds_when_a_talk_is_removed_or_replaced(self):
+        talks = [self.talk(1), self.talk(2), self.talk(3)]
+        self.master.update(talks)
+        del talks[1]
+        manifest, opened = self.opened_paths(talks)
+        self.assertEqual(opened, [talks[0]['path'], talks[1]['path']])
+        self.assertEqual([entry['key'] for entry in manifest['talks']],
+                         ['1', '3'])
+
+        talks[0] = dict(talks[0], path=self.make_pdf('talk1-v2', 4))
+        manifest, _ = self.opened_paths(talks)
+        with fitz.open(self.master.pdf_path) as merged:
+            self.assertEqual(len(merged), 6)
+
+    def test_skips_missing_decks(self):
+        self.assertIsNone(
+            self.master.update([{
+                'key': 1,
+                'title': 'Gone',
+                'path': '/nonexistent.pdf'
+            }]))
+
+
+class TestKeepDeck(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        patcher = mock.patch.object(master_deck, 'DECK_DIR',
+                                    os.path.join(self.temp_dir.name, 'decks'))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.pdf_path = os.path.join(self.temp_dir.name, 'upload.pdf')
+        doc = fitz.open()
+        doc.new_page().insert_text((72, 72), 'Introduction')
+        doc.save(self.pdf_path)
+        doc.close()
+
+    def test_copies_the_validated_document(self):
+        path = keep_deck('abc', SlideDeck(self.pdf_path))
+        with fitz.open(path) as kept:
+            self.assertIn('Introduction', kept[0].get_text())
+        self.assertEqual(keep_deck('abc'), path)
+
+    def test_reextracts_when_scratch_files_are_gone(self):
+        stale = {'temp_file_path': '/nonexistent/deck.pdf'}
+        path = keep_deck('def', stale, lambda: SlideDeck(self.pdf_path))
+        self.assertTrue(os.path.exists(path))
+        self.assertIsNone(keep_deck('ghi', stale))
+
+
+if __name__ == "__main__":
+    unittest.main()
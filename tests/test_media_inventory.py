@@ -0,0 +1,115 @@
+import unittest
+import os
+import sys
+import io
+import tempfile
+from unittest import mock
+
+# Add the parent directory to sys.path to allow imports from the utils folder
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fitz
+from PIL import Image
+from utils.disk_cache import DiskCache
+from utils.slide_deck import SlideDeck
+from utils.media_inventory import media_inventory
+from utils.ai_checker import check_media_content
+
+
+class TestMediaInventory(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        patcher = mock.patch(
+            'utils.slide_deck.slide_cache',
+            DiskCache(os.path.join(self.temp_dir.name, 'slides')))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.pdf_path = os.path.join(self.temp_dir.name, 'deck.pdf')
+        doc = fitz.open()
+        # Slide 1: text only
+        doc.new_page().insert_text((72, 72), "Title")
+        # Slide 2: an embedded photo
+        with io.BytesIO() as png:
+            Image.new('RGB', (200, 100), 'red').save(png, format='PNG')
+            doc.new_page().insert_image(fitz.Rect(72, 72, 272, 172),
+                                        stream=png.getvalue())
+        # Slide 3: a link to a video
+        page = doc.new_page()
+        page.insert_link({
+            'kind': fitz.LINK_URI,
+            'from': fitz.Rect(72, 72, 200, 90),
+            'uri': 'https://www.youtube.com/watch?v=abc'
+        })
+        # Slide 4: a chart drawn as vectors
+        page = doc.new_page()
+        for i in range(25):
+            page.draw_line((72 + i * 10, 300), (72 + i * 10, 300 - i * 5))
+        doc.save(self.pdf_path)
+        doc.close()
+
+    def test_inventory_from_pdf_structure(self):
+        with SlideDeck(self.pdf_path) as deck:
+            media, ambiguous_pages = media_inventory(deck)
+        self.assertEqual([(item['slide'], item['kind']) for item in media],
+                         [(2, 'image'), (3, 'video')])
+        self.assertEqual(media[0]['width'], 200)
+        self.assertEqual(ambiguous_pages, [3])
+
+    def test_structural_media_skips_the_vision_model(self):
+        with SlideDeck(self.pdf_path) as deck, mock.patch(
+                'utils.ai_checker.send_openai_request_with_function') as send:
+            result = check_media_content(deck)
+        send.assert_not_called()
+        self.assertTrue(result['passed'])
+        self.assertEqual(
+            result['message'],
+            'Images detected on slide 2. Video content detected on slide 3.')
+
+    def test_only_ambiguous_pages_are_rendered(self):
+        deck = SlideDeck(self.pdf_path)
+        self.addCleanup(deck.close)
+        deck['media'] = []
+        deck['ambiguous_media_pages'] = [3]
+        with mock.patch('utils.ai_checker.send_openai_request_with_function',
+                        return_value='A bar chart.') as send:
+            result = check_media_content(deck)
+        self.assertEqual(len(send.call_args.kwargs['images']), 1)
+        self.assertTrue(result['passed'])
+
+    def test_cached_media_follows_moved_slides(self):
+        def make_pdf(name, texts):
+            path = os.path.join(self.temp_dir.name, name)
+            doc = fitz.open()
+            for text in texts:
+                doc.new_page().insert_text((72, 72), text)
+            with io.BytesIO() as png:
+                Image.new('RGB', (200, 100), 'red').save(png, format='PNG')
+                doc.new_page().insert_image(fitz.Rect(72, 72, 272, 172),
+                                            stream=png.getvalue())
+            doc.save(path)
+            doc.close()
+            return path
+
+        with SlideDeck(make_pdf('first.pdf', ["Intro"])) as deck:
+            media_inventory(deck)
+        with SlideDeck(make_pdf('second.pdf', ["New", "Intro"])) as deck:
+            media, _ = media_inventory(deck)
+            xref = deck.doc[2].get_images()[0][0]
+            self.assertEqual(deck.page_record(2)['media'][0]['kind'], 'image')
+        self.assertEqual([(item['slide'], item['part']) for item in media],
+                         [(3, f'xref:{xref}')])
+
+    def test_pptx_media_list_needs_no_pdf(self):
+        deck = SlideDeck(data={
+            'num_slides': 1,
+            'media': [{'slide': 1, 'kind': 'video', 'size': 10}]
+        })
+        self.assertEqual(media_inventory(deck), (deck['media'], []))
+        self.assertIsNone(media_inventory(SlideDeck(data={'num_slides': 1})))
+
+
+if __name__ == '__main__':
+    unittest.main()
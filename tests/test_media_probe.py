@@ -0,0 +1,110 @@
+import unittest
+import os
+import sys
+import io
+import struct
+import tempfile
+
+# Add the parent directory to sys.path to allow imports from the utils folder
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pptx import Presentation
+from pptx.util import Inches
+from utils.media_probe import probe_media
+from utils.pptx_extractor import extract_pptx
+
+
+def box(box_type, *children):
+    body = b''.join(children)
+    return struct.pack('>I4s', 8 + len(body), box_type) + body
+
+
+def mp4_track(handler, codec):
+    hdlr = box(b'hdlr', b'\0' * 8 + handler + b'\0' * 12)
+    stsd = box(b'stsd', b'\0' * 4 + struct.pack('>I', 1),
+               box(codec, b'\0' * 8))
+    return box(b'trak',
+               box(b'mdia', hdlr, box(b'minf', box(b'stbl', stsd))))
+
+
+def make_mp4(with_audio=True, moov_last=False):
+    mvhd = box(b'mvhd', b'\0' * 12 + struct.pack('>II', 1000, 12500))
+    tracks = [mp4_track(b'vide', b'avc1')]
+    if with_audio:
+        tracks.append(mp4_track(b'soun', b'mp4a'))
+    moov = box(b'moov', mvhd, *tracks)
+    ftyp = box(b'ftyp', b'isom\0\0\0\0isom')
+    mdat = box(b'mdat', b'\0' * 4096)
+    return ftyp + (mdat + moov if moov_last else moov + mdat)
+
+
+def ebml(element_id, payload):
+    size = len(payload)
+    return element_id.to_bytes((element_id.bit_length() + 7) // 8,
+                               'big') + bytes([0x80 | size]) + payload
+
+
+def make_webm(with_audio=True):
+    header = ebml(0x1A45DFA3, ebml(0x4282, b'webm'))
+    info = ebml(0x1549A966,
+                ebml(0x2AD7B1, (1000000).to_bytes(3, 'big')) +
+                ebml(0x4489, struct.pack('>d', 2500.0)))
+    entries = [ebml(0xAE, ebml(0x83, b'\x01') + ebml(0x86, b'V_VP9'))]
+    if with_audio:
+        entries.append(
+            ebml(0xAE, ebml(0x83, b'\x02') + ebml(0x86, b'A_OPUS')))
+    tracks = ebml(0x1654AE6B, b''.join(entries))
+    cluster = ebml(0x1F43B675, b'\0' * 16)
+    return header + ebml(0x18538067, info + tracks + cluster)
+
+
+def probe(data):
+    return probe_media(io.BytesIO(data), len(data))
+
+
+class TestMediaProbe(unittest.TestCase):
+
+    def test_mp4_with_audio(self):
+        result = probe(make_mp4())
+        self.assertEqual(result['container'], 'mp4')
+        self.assertTrue(result['has_video'])
+        self.assertTrue(result['has_audio'])
+        self.assertEqual(result['codecs'], ['avc1', 'mp4a'])
+        self.assertAlmostEqual(result['duration'], 12.5)
+
+    def test_mp4_without_audio_and_moov_after_mdat(self):
+        result = probe(make_mp4(with_audio=False, moov_last=True))
+        self.assertTrue(result['has_video'])
+        self.assertFalse(result['has_audio'])
+
+    def test_webm(self):
+        result = probe(make_webm())
+        self.assertEqual(result['container'], 'webm')
+        self.assertTrue(result['has_audio'])
+        self.assertEqual(result['codecs'], ['V_VP9', 'A_OPUS'])
+        self.assertAlmostEqual(result['duration'], 2.5)
+        self.assertFalse(probe(make_webm(with_audio=False))['has_audio'])
+
+    def test_unknown_container(self):
+        self.assertIsNone(probe(b'RIFF\0\0\0\0AVI LIST'))
+
+    def test_pptx_videos_are_probed(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            video_path = os.path.join(temp_dir, 'clip.mp4')
+            with open(video_path, 'wb') as f:
+                f.write(make_mp4())
+            prs = Presentation()
+            slide = prs.slides.add_slide(prs.slide_layouts[6])
+            slide.shapes.add_movie(video_path, Inches(1), Inches(1),
+                                   Inches(4), Inches(3),
+                                   mime_type='video/mp4')
+            pptx_path = os.path.join(temp_dir, 'deck.pptx')
+            prs.save(pptx_path)
+            result = extract_pptx(pptx_path)
+        videos = [item for item in result['media'] if item['kind'] == 'video']
+        self.assertEqual(len(videos), 1)
+        self.assertTrue(videos[0]['probe']['has_audio'])
+
+
+if __name__ == '__main__':
+    unittest.main()
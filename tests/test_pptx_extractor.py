@@ -0,0 +1,78 @@
+import unittest
+import os
+import sys
+import tempfile
+
+# Add the parent directory to sys.path to allow imports from the utils folder
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pptx import Presentation
+from pptx.chart.data import CategoryChartData
+from pptx.enum.chart import XL_CHART_TYPE
+from pptx.util import Inches
+from utils.pptx_extractor import extract_pptx
+from utils.slide_heuristics import local_text_heavy
+
+
+class TestPptxExtractor(unittest.TestCase):
+
+    def setUp(self):
+        self.pptx_path = os.path.join(
+            os.path.dirname(os.path.abspath(__file__)), "sample_data",
+            "sample.pptx")
+
+    def test_extracts_slide_data_shape(self):
+        result = extract_pptx(self.pptx_path)
+        self.assertEqual(result['num_slides'], len(result['content']))
+        self.assertIsInstance(result['fonts'], list)
+        self.assertIsInstance(result['media'], list)
+        self.assertIsInstance(result['video_tracks'], list)
+        self.assertIsInstance(result['audio_tracks'], list)
+        self.assertTrue(any(text.strip() for text in result['content']))
+
+    def test_fonts_come_from_the_deck_not_the_pdf_writer(self):
+        result = extract_pptx(self.pptx_path)
+        self.assertTrue(result['fonts'])
+        self.assertNotIn('Helvetica', result['fonts'])
+
+    def test_pdf_is_built_only_on_demand(self):
+        calls = []
+
+        def pdf_factory():
+            calls.append(True)
+            raise RuntimeError('should not render')
+
+        result = extract_pptx(self.pptx_path, pdf_factory=pdf_factory)
+        self.assertTrue(result.has_document())
+        self.assertEqual(result.full_text, ' '.join(result['content']))
+        self.assertEqual(result.fonts(), set(result['fonts']))
+        self.assertEqual(calls, [])
+        self.assertNotIn('temp_file_path', result)
+
+    def test_counts_only_bulleted_paragraphs(self):
+        result = extract_pptx(self.pptx_path)
+        # Slide 4 is a timeline table and slide 5 an intro line (no bullet
+        # in the layout) followed by three bulleted facts.
+        self.assertEqual(result['slide_bullets'][3], 0)
+        self.assertEqual(result['slide_bullets'][4], 3)
+        self.assertIsNot(local_text_heavy(result), True)
+
+    def test_charts_are_listed_as_media(self):
+        prs = Presentation()
+        slide = prs.slides.add_slide(prs.slide_layouts[6])
+        chart_data = CategoryChartData()
+        chart_data.categories = ['A', 'B']
+        chart_data.add_series('Series 1', (1, 2))
+        slide.shapes.add_chart(XL_CHART_TYPE.COLUMN_CLUSTERED, Inches(1),
+                               Inches(1), Inches(4), Inches(3), chart_data)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, 'chart.pptx')
+            prs.save(path)
+            result = extract_pptx(path)
+        charts = [item for item in result['media'] if item['kind'] == 'chart']
+        self.assertEqual(len(charts), 1)
+        self.assertEqual(charts[0]['slide'], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import unittest
+import os
+import sys
+
+# Add the parent directory to sys.path to allow imports from the utils folder
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.rate_limiter import TokenBucket, RateLimiter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class TestRateLimiter(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+
+    def test_bucket_allows_burst_then_waits(self):
+        bucket = TokenBucket(rate=2, capacity=2, clock=self.clock)
+        self.assertEqual(bucket.reserve(), 0.0)
+        self.assertEqual(bucket.reserve(), 0.0)
+        self.assertAlmostEqual(bucket.reserve(), 0.5)
+        self.assertAlmostEqual(bucket.reserve(), 1.0)
+
+    def test_bucket_refills_over_time(self):
+        bucket = TokenBucket(rate=1, capacity=1, clock=self.clock)
+        bucket.reserve()
+        self.clock.now += 1
+        self.assertEqual(bucket.reserve(), 0.0)
+
+    def test_limiter_paces_requests_per_second(self):
+        limiter = RateLimiter(requests_per_second=4,
+                              sleep=self.clock.sleep,
+                              clock=self.clock)
+        for _ in range(8):
+            limiter.acquire()
+        self.assertAlmostEqual(self.clock.now, 1.0)
+
+    def test_limiter_paces_tokens_per_minute(self):
+        limiter = RateLimiter(requests_per_second=100,
+                              tokens_per_minute=600,
+                              sleep=self.clock.sleep,
+                              clock=self.clock)
+        limiter.acquire(600)
+        wait = limiter.acquire(60)
+        self.assertAlmostEqual(wait, 6.0)
+
+    def test_reservation_past_max_wait_takes_nothing(self):
+        bucket = TokenBucket(rate=1, capacity=1, clock=self.clock)
+        bucket.reserve()
+        self.assertIsNone(bucket.reserve(max_wait=0.5))
+        self.assertAlmostEqual(bucket.reserve(max_wait=1), 1.0)
+
+    def test_limiter_gives_up_past_max_wait(self):
+        limiter = RateLimiter(requests_per_second=100,
+                              tokens_per_minute=600,
+                              sleep=self.clock.sleep,
+                              clock=self.clock)
+        limiter.acquire(600)
+        self.assertIsNone(limiter.acquire(60, max_wait=5))
+        self.assertEqual(self.clock.now, 0)
+        # The cancelled request slot and tokens are still available
+        self.clock.now += 1
+        self.assertAlmostEqual(limiter.acquire(10, max_wait=5), 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,221 @@
+import unittest
+import os
+import sys
+from types import SimpleNamespace
+from unittest import mock
+
+# Add the parent directory to sys.path to allow imports from the utils folder
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.llm_backend import (FakeBackend, LLMError, LLMFatalError,
+                               RateLimitedError, retry_after_seconds,
+                               set_backend, translate_openai_error)
+from utils.retry_policy import (FATAL, RATE_LIMITED, TRANSIENT,
+                                CircuitBreaker, RetryPolicy, backoff_delay,
+                                classify_error, current_deadline,
+                                deadline_scope)
+from utils import ai_checker
+from utils.rate_limiter import RateLimiter
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class TestClassification(unittest.TestCase):
+
+    def test_classifies_errors(self):
+        self.assertEqual(classify_error(RateLimitedError('slow down')),
+                         RATE_LIMITED)
+        self.assertEqual(classify_error(LLMError('502')), TRANSIENT)
+        self.assertEqual(classify_error(LLMFatalError('bad key')), FATAL)
+        self.assertEqual(classify_error(KeyError('bug')), FATAL)
+
+    def test_translates_status_codes(self):
+
+        def status_error(status, headers=None):
+            return SimpleNamespace(status_code=status,
+                                   response=SimpleNamespace(
+                                       headers=headers or {}))
+
+        error = translate_openai_error(
+            status_error(429, {'retry-after': '7'}))
+        self.assertIsInstance(error, RateLimitedError)
+        self.assertEqual(error.retry_after, 7)
+        self.assertIsInstance(translate_openai_error(status_error(401)),
+                              LLMFatalError)
+        self.assertIsInstance(translate_openai_error(status_error(408)),
+                              LLMError)
+        self.assertIsInstance(translate_openai_error(status_error(503)),
+                              LLMError)
+
+    def test_parses_retry_after(self):
+        self.assertEqual(retry_after_seconds({'retry-after-ms': '1500'}), 1.5)
+        self.assertEqual(retry_after_seconds({'retry-after': '3'}), 3)
+        self.assertEqual(
+            retry_after_seconds(
+                {'retry-after': 'Wed, 21 Oct 2015 07:28:00 GMT'}), 0)
+        self.assertIsNone(retry_after_seconds({'retry-after': 'soon'}))
+        self.assertIsNone(retry_after_seconds({}))
+
+
+class TestBackoff(unittest.TestCase):
+
+    def test_honours_retry_after_up_to_max_delay(self):
+        policy = RetryPolicy(max_attempts=4, base_delay=1, max_delay=20)
+        self.assertEqual(backoff_delay(policy, 0, retry_after=5), 5)
+        self.assertEqual(backoff_delay(policy, 0, retry_after=60), 20)
+
+    def test_jittered_exponential_backoff_is_capped(self):
+        policy = RetryPolicy(max_attempts=10, base_delay=1, max_delay=20)
+        for attempt in range(10):
+            delay = backoff_delay(policy, attempt)
+            self.assertLessEqual(delay, min(20, 2**attempt))
+
+
+class TestCircuitBreaker(unittest.TestCase):
+
+    def test_opens_after_consecutive_failures_and_probes_once(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker(threshold=3, cooldown=30, clock=clock)
+        for _ in range(2):
+            breaker.failure()
+        breaker.success()
+        for _ in range(3):
+            self.assertTrue(breaker.allow())
+            breaker.failure()
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+        self.assertFalse(breaker.allow())
+
+        clock.now = 31
+        self.assertTrue(breaker.allow())
+        self.assertFalse(breaker.allow())
+        breaker.failure()
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+
+        clock.now = 62
+        self.assertTrue(breaker.allow())
+        breaker.success()
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+    def test_retry_after_extends_the_pause(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker(threshold=1, cooldown=30, clock=clock)
+        breaker.failure(retry_after=120)
+        clock.now = 100
+        self.assertFalse(breaker.allow())
+
+
+class TestDeadline(unittest.TestCase):
+
+    def test_sooner_enclosing_deadline_wins(self):
+        clock = FakeClock()
+        with deadline_scope(10, clock=clock) as outer:
+            with deadline_scope(60, clock=clock) as inner:
+                self.assertIs(inner, outer)
+            with deadline_scope(5, clock=clock) as inner:
+                self.assertEqual(inner.remaining(), 5)
+        self.assertIsNone(current_deadline())
+
+
+class TestRequestRetries(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.backend = FakeBackend(sleep=self.clock.sleep, clock=self.clock)
+        previous = set_backend(self.backend)
+        self.addCleanup(set_backend, previous)
+        self.breaker = CircuitBreaker(threshold=3,
+                                      cooldown=30,
+                                      clock=self.clock)
+        for target, value in (('utils.ai_checker.circuit_breaker',
+                               self.breaker),
+                              ('utils.ai_checker.time.sleep',
+                               self.clock.sleep),
+                              ('utils.ai_checker.rate_limiter', mock.Mock())):
+            patcher = mock.patch(target, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def send(self, **options):
+        return ai_checker.send_openai_request_with_function('Title slide?',
+                                                            **options)
+
+    def test_fatal_errors_are_not_retried(self):
+        self.backend.responder = mock.Mock(
+            side_effect=LLMFatalError('Incorrect API key provided'))
+        response = self.send()
+        self.assertEqual(response,
+                         'AI check failed: Incorrect API key provided')
+        self.assertEqual(self.backend.responder.call_count, 1)
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+
+    def test_local_errors_do_not_close_the_breaker(self):
+        self.backend.error_rate = 1.0
+        self.send(max_retries=3)
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+        self.clock.now += 30
+        self.backend.error_rate = 0.0
+        self.backend.responder = mock.Mock(side_effect=KeyError('choices'))
+        self.assertTrue(self.send().startswith('AI check failed'))
+        self.assertEqual(self.breaker.state, CircuitBreaker.HALF_OPEN)
+        # The trial slot is free again for a real provider answer
+        self.backend.responder = mock.Mock(return_value='Yes')
+        self.assertEqual(self.send(), 'Yes')
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+
+    def test_rate_limit_past_the_deadline_defers(self):
+        limiter = RateLimiter(requests_per_second=0.05,
+                              sleep=self.clock.sleep,
+                              clock=self.clock)
+        limiter.acquire()
+        with mock.patch('utils.ai_checker.rate_limiter', limiter), \
+                deadline_scope(10, clock=self.clock):
+            response = self.send()
+        self.assertTrue(response.startswith('AI check deferred'))
+        self.assertEqual(self.backend.calls, 0)
+        self.assertEqual(self.clock.now, 0)
+
+    def test_waits_for_retry_after(self):
+        self.backend.responder = mock.Mock(side_effect=[
+            RateLimitedError('429', retry_after=4), 'Yes'
+        ])
+        self.assertEqual(self.send(), 'Yes')
+        self.assertEqual(self.clock.now, 4)
+
+    def test_open_breaker_defers_without_calling_the_provider(self):
+        self.backend.error_rate = 1.0
+        self.assertTrue(self.send(max_retries=3).startswith('AI check failed'))
+        self.assertEqual(self.backend.calls, 3)
+        response = self.send()
+        self.assertTrue(response.startswith('AI check deferred'))
+        self.assertTrue(ai_checker.is_unavailable(response))
+        self.assertEqual(self.backend.calls, 3)
+
+    def test_deadline_bounds_the_whole_retry_loop(self):
+        self.backend.responder = mock.Mock(
+            side_effect=RateLimitedError('429', retry_after=15))
+        with deadline_scope(10, clock=self.clock):
+            response = self.send()
+        self.assertTrue(response.startswith('AI check deferred'))
+        self.assertEqual(self.backend.responder.call_count, 1)
+        self.assertEqual(self.clock.now, 0)
+
+    def test_slow_calls_time_out_at_the_deadline(self):
+        self.backend._sample_latency = lambda rng: 50
+        with deadline_scope(10, clock=self.clock):
+            response = self.send()
+        self.assertTrue(response.startswith('AI check deferred'))
+        self.assertLessEqual(self.clock.now, 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
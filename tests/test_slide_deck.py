@@ -0,0 +1,172 @@
+import unittest
+import os
+import sys
+import json
+import pickle
+import tempfile
+from types import SimpleNamespace
+from unittest import mock
+
+# Add the parent directory to sys.path to allow imports from the utils folder
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fitz
+from utils.slide_deck import SlideDeck
+from utils.disk_cache import DiskCache
+from utils.conference_profile import ConferenceProfile
+from utils.media_inventory import page_media
+from utils.pdf_format import process_pdf
+from utils.slide_heuristics import slide_layout
+
+
+class TestSlideDeck(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.pdf_path = self.make_pdf('deck.pdf',
+                                      ("Introduction", "Methods", "Conclusion"))
+        patcher = mock.patch(
+            'utils.slide_deck.slide_cache',
+            DiskCache(os.path.join(self.temp_dir.name, 'slides')))
+        self.slide_cache = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def make_pdf(self, name, texts):
+        path = os.path.join(self.temp_dir.name, name)
+        doc = fitz.open()
+        for text in texts:
+            page = doc.new_page()
+            page.insert_text((72, 72), text, fontname="helv")
+        doc.save(path)
+        doc.close()
+        return path
+
+    def test_memoizes_page_text(self):
+        with SlideDeck(self.pdf_path) as deck:
+            first = deck.page_text(0)
+            self.assertIn("Introduction", first)
+            self.assertIs(deck.page_text(0), first)
+            self.assertIs(deck.full_text, deck.full_text)
+            self.assertIn("methods", deck.full_text_lower)
+
+    def test_renders_share_document_handle(self):
+        with SlideDeck(self.pdf_path) as deck:
+            doc = deck.doc
+            self.assertEqual(len(list(deck.renders(max_pages=2))), 2)
+            self.assertIs(deck.doc, doc)
+
+    def test_wraps_plain_slide_data(self):
+        slide_data = {'num_slides': 2, 'content': ['Title', 'Results']}
+        deck = SlideDeck.wrap(slide_data)
+        self.assertEqual(deck.full_text, 'Title Results')
+        self.assertFalse(deck.has_document())
+        self.assertIs(SlideDeck.wrap(deck), deck)
+
+    def test_serializes_as_plain_dict(self):
+        with SlideDeck(self.pdf_path, data={'type': 'pdf'}) as deck:
+            deck.page_text(0)
+            self.assertEqual(json.loads(json.dumps(deck)), {'type': 'pdf'})
+            self.assertEqual(type(pickle.loads(pickle.dumps(deck))), dict)
+
+    def test_fingerprints_change_only_for_edited_slides(self):
+        edited_path = self.make_pdf('edited.pdf',
+                                    ("Introduction", "Method", "Conclusion"))
+        with SlideDeck(self.pdf_path) as deck, SlideDeck(edited_path) as edited:
+            original = deck.fingerprints()
+            changed = edited.fingerprints()
+        self.assertEqual(original[0], changed[0])
+        self.assertNotEqual(original[1], changed[1])
+        self.assertEqual(original[2], changed[2])
+
+    def test_unchanged_slides_reuse_cached_outputs(self):
+        profile = ConferenceProfile(
+            SimpleNamespace(max_slides=10,
+                            required_sections='Introduction,Conclusion',
+                            allowed_fonts='*'))
+        with SlideDeck(self.pdf_path) as deck:
+            deck.fonts()
+            profile.scan(deck)
+
+        edited_path = self.make_pdf('edited.pdf',
+                                    ("Introduction", "Method", "Conclusion"))
+        with SlideDeck(edited_path) as edited:
+            self.assertIn(profile.scan_key,
+                          edited.page_record(0).get('scans', {}))
+            self.assertEqual(edited.page_record(1), {})
+            with mock.patch.object(profile.scanner,
+                                   'scan_slide',
+                                   wraps=profile.scanner.scan_slide) as scan:
+                scan_result = profile.scan(edited)
+            self.assertEqual(scan.call_count, 1)
+            self.assertEqual(scan_result.slides('section:Conclusion'), [2])
+            self.assertEqual(edited.page_fonts(0), {'Helvetica'})
+
+    def test_fingerprints_do_not_render_pages(self):
+        with SlideDeck(self.pdf_path) as deck, \
+                mock.patch('fitz.Page.get_pixmap') as get_pixmap:
+            deck.fingerprints()
+        get_pixmap.assert_not_called()
+
+    def test_page_records_are_written_once_per_deck(self):
+        profile = ConferenceProfile(
+            SimpleNamespace(max_slides=10,
+                            required_sections='Introduction',
+                            allowed_fonts='*'))
+        with mock.patch.object(self.slide_cache, 'set',
+                               wraps=self.slide_cache.set) as cache_set:
+            deck = process_pdf(self.pdf_path)
+            self.assertEqual(cache_set.call_count, 0)
+            for index in range(deck.page_count):
+                slide_layout(deck, index)
+                page_media(deck, index)
+            profile.scan(deck)
+            self.assertEqual(cache_set.call_count, 0)
+            deck.close()
+        self.assertEqual(cache_set.call_count, 3)
+
+    def test_warm_slide_cache_skips_extraction(self):
+        texts = [f"Slide {i}\n- first point\n- second point" for i in range(6)]
+        path = self.make_pdf('long.pdf', texts)
+        profile = ConferenceProfile(
+            SimpleNamespace(max_slides=100,
+                            required_sections='Introduction',
+                            allowed_fonts='*'))
+
+        def validate():
+            with SlideDeck(path) as deck:
+                for index in range(deck.page_count):
+                    slide_layout(deck, index)
+                    page_media(deck, index)
+                profile.scan(deck)
+
+        validate()
+        with mock.patch('utils.slide_heuristics.analyze_page') as analyze, \
+                mock.patch('fitz.Page.get_cdrawings') as get_cdrawings, \
+                mock.patch.object(profile.scanner, 'scan_slide') as scan:
+            validate()
+        analyze.assert_not_called()
+        get_cdrawings.assert_not_called()
+        scan.assert_not_called()
+
+    def test_records_are_keyed_by_version(self):
+        with SlideDeck(self.pdf_path) as deck:
+            slide_layout(deck, 0)
+        self.assertIn('layout', SlideDeck(self.pdf_path).page_record(0))
+        with mock.patch('utils.slide_deck.SLIDE_RECORD_VERSION', 'next'):
+            self.assertEqual(SlideDeck(self.pdf_path).page_record(0), {})
+
+    def test_image_tuples_are_not_cached(self):
+        with SlideDeck(self.pdf_path) as deck:
+            deck.page_images(0)
+            slide_layout(deck, 0)
+        self.assertNotIn('images', SlideDeck(self.pdf_path).page_record(0))
+
+    def test_pdf_decks_store_fingerprints(self):
+        deck = process_pdf(self.pdf_path)
+        self.assertEqual(deck['slide_fingerprints'], deck.fingerprints())
+        deck.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+import unittest
+import os
+import sys
+import tempfile
+from unittest import mock
+
+# Add the parent directory to sys.path to allow imports from the utils folder
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fitz
+from utils.disk_cache import DiskCache
+from utils.slide_deck import SlideDeck
+from utils.slide_heuristics import (BULLET_RE, LAYOUT_VERSION, analyze_page,
+                                    analyze_text, local_text_heavy,
+                                    local_title_slide, slide_layout)
+
+
+class TestSlideHeuristics(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        patcher = mock.patch(
+            'utils.slide_deck.slide_cache',
+            DiskCache(os.path.join(self.temp_dir.name, 'slides')))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def make_deck(self, pages):
+        """`pages` is a list of slides, each a list of (text, fontsize)."""
+        path = os.path.join(self.temp_dir.name, f'deck{len(pages)}.pdf')
+        doc = fitz.open()
+        for lines in pages:
+            page = doc.new_page(width=960, height=540)
+            y = 60
+            for text, size in lines:
+                page.insert_text((40, y), text, fontsize=size)
+                y += size * 1.5
+        doc.save(path)
+        doc.close()
+        deck = SlideDeck(path)
+        self.addCleanup(deck.close)
+        return deck
+
+    def test_analyze_page_counts_bullets_and_sizes(self):
+        deck = self.make_deck([[('Agenda', 36), ('- First point', 14),
+                                ('- Second point', 14)]])
+        layout = analyze_page(deck.doc[0])
+        self.assertEqual(layout['bullets'], 2)
+        self.assertEqual(layout['words'], 5)
+        self.assertEqual(layout['max_size'], 36)
+
+    def test_clear_title_slide(self):
+        deck = self.make_deck([[('Scaling Slide Checks', 40),
+                                ('Jane Doe, Example Corp', 16)]])
+        self.assertTrue(local_title_slide(deck))
+
+    def test_clear_content_slide(self):
+        body = [(f'- Point number {i} with a few more words', 14)
+                for i in range(10)]
+        deck = self.make_deck([body])
+        self.assertFalse(local_title_slide(deck))
+        self.assertTrue(local_text_heavy(deck))
+
+    def test_light_deck_is_not_text_heavy(self):
+        deck = self.make_deck([[('Title', 40)],
+                               [('Results', 30), ('- Faster', 14),
+                                ('- Cheaper', 14)]])
+        self.assertFalse(local_text_heavy(deck))
+
+    def test_borderline_density_is_left_to_the_model(self):
+        body = [(f'- Point {i}', 14) for i in range(6)]
+        deck = self.make_deck([body])
+        self.assertIsNone(local_text_heavy(deck))
+
+    def test_symbol_font_bullets_are_counted(self):
+        for line in ('\uf0b7 Scope', '\uf0a7 Plan', '\uf0d8\tRisks'):
+            self.assertTrue(BULLET_RE.match(line), repr(line))
+        self.assertIsNone(BULLET_RE.match('Scope'))
+
+    def test_layouts_from_an_older_version_are_recomputed(self):
+        deck = self.make_deck([[('- Scope', 14)]])
+        deck.update_page_record(0, layout={'bullets': 0})
+        self.assertEqual(slide_layout(deck, 0)['bullets'], 1)
+        self.assertEqual(deck.page_record(0)['layout_version'],
+                         LAYOUT_VERSION)
+
+    def test_analyze_text_uses_the_recorded_bullet_count(self):
+        layout = analyze_text('Results\nFaster\nCheaper\nSmaller', 3)
+        self.assertEqual(layout['bullets'], 3)
+        self.assertNotIn('bullets_lower_bound', layout)
+        self.assertIsNone(layout['max_size'])
+
+    def test_analyze_text_counts_only_glyph_bullets(self):
+        layout = analyze_text('Timeline\n1791\n1881\n1924\n- Today')
+        self.assertEqual(layout['bullets'], 1)
+        self.assertTrue(layout['bullets_lower_bound'])
+
+    def test_text_only_decks_are_light_only_with_known_bullets(self):
+        text = 'Timeline\n' + '\n'.join(str(1800 + i) for i in range(20))
+        data = {'num_slides': 1, 'content': [text]}
+        self.assertIsNone(local_text_heavy(SlideDeck(data=data)))
+        self.assertFalse(
+            local_text_heavy(SlideDeck(data=dict(data, slide_bullets=[0]))))
+
+if __name__ == '__main__':
+    unittest.main()
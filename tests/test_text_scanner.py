@@ -0,0 +1,99 @@
+import unittest
+import os
+import re
+import sys
+
+# Add the parent directory to sys.path to allow imports from the utils folder
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.text_scanner import TextScanner
+from utils.slide_deck import SlideDeck
+from utils.conference_profile import CODE_PATTERNS, get_profile
+from utils.deterministic_checker import (check_statistical_terms,
+                                         check_technical_terminology,
+                                         run_deterministic_checks)
+
+
+class Conference:
+    def __init__(self, required_sections, custom_checks=None):
+        self.max_slides = 30
+        self.required_sections = required_sections
+        self.allowed_fonts = '*'
+        self.custom_checks = custom_checks
+
+
+class TestTextScanner(unittest.TestCase):
+
+    def test_reports_per_slide_hit_locations(self):
+        scanner = TextScanner(keywords={'intro': ['Introduction']})
+        scan = scanner.scan(['Title', 'An INTRODUCTION to decks'])
+        hit, = scan.hits['intro']
+        self.assertEqual((hit.slide, hit.start, hit.end), (1, 3, 15))
+        self.assertEqual(scan.slides('intro'), [1])
+
+    def test_finds_overlapping_and_prefix_keywords(self):
+        scanner = TextScanner(keywords={
+            'long': ['data analysis'],
+            'short': ['data'],
+            'inner': ['analysis'],
+        })
+        scan = scanner.scan(['Our data analysis'])
+        self.assertTrue(scan.found('long'))
+        self.assertTrue(scan.found('short'))
+        self.assertTrue(scan.found('inner'))
+
+    def test_patterns_and_keywords_share_one_scanner(self):
+        scanner = TextScanner(keywords={'terms': ['api', 'database']},
+                              patterns={'code': [r'\bdef\s+\w+\s*\(.*\):']})
+        scan = scanner.scan(['Calling the API', 'def main():'])
+        self.assertEqual(scan.terms('terms'), {'api'})
+        self.assertEqual(scan.slides('code'), [1])
+
+    def test_greedy_patterns_do_not_hide_later_matches(self):
+        scanner = TextScanner(patterns={
+            f'code:{index}': [pattern]
+            for index, pattern in enumerate(CODE_PATTERNS)
+        })
+        for text, expected in (('for i in range(10): if i: print(i)', 2),
+                               ('while x: def f(a): pass', 2)):
+            scan = scanner.scan([text])
+            found = sum(1 for index in range(len(CODE_PATTERNS))
+                        if scan.found(f'code:{index}'))
+            baseline = sum(1 for pattern in CODE_PATTERNS
+                           if re.search(pattern, text, re.IGNORECASE))
+            self.assertEqual(found, expected, text)
+            self.assertEqual(found, baseline, text)
+
+
+class TestDeterministicScan(unittest.TestCase):
+
+    def test_required_sections_and_custom_checks(self):
+        slide_data = {
+            'type': 'pdf',
+            'num_slides': 2,
+            'content': ['Introduction with an API', 'Results: mean and median'],
+            'fonts': []
+        }
+        conference = Conference(
+            'Introduction,Results,Conclusion', {
+                'technical_terminology': {'enabled': True, 'threshold': 1},
+                'statistical_terms': {'enabled': True, 'threshold': 3},
+                'code_snippets': {'enabled': False, 'threshold': 1},
+            })
+        results = {
+            r['check']: r
+            for r in run_deterministic_checks(slide_data, conference)
+        }
+        self.assertEqual(results['Required sections']['message'],
+                         'Missing sections: Conclusion')
+        # The conference-specific checks are scanned for but not yet run
+        self.assertNotIn('Technical Terminology', results)
+
+        scan = get_profile(conference).scan(SlideDeck.wrap(slide_data))
+        self.assertTrue(check_technical_terminology(scan, 1)['passed'])
+        self.assertFalse(check_statistical_terms(scan, 3)['passed'])
+        self.assertFalse(scan.found('code:0'))
+
+
+if __name__ == "__main__":
+    unittest.main()
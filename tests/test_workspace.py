@@ -0,0 +1,49 @@
+import unittest
+import os
+import sys
+import time
+import tempfile
+
+# Add the parent directory to sys.path to allow imports from the utils folder
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.workspace import Workspace, WorkspaceFullError
+
+
+class TestWorkspace(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+
+    def test_scope_removes_its_files(self):
+        workspace = Workspace(self.temp_dir.name)
+        with workspace.scope():
+            path = workspace.write_bytes(b'%PDF', '.pdf')
+            self.assertTrue(os.path.exists(path))
+        self.assertFalse(os.path.exists(path))
+
+    def test_sweep_removes_expired_files(self):
+        workspace = Workspace(self.temp_dir.name, ttl=60)
+        path = workspace.write_bytes(b'old', '.pdf')
+        past = time.time() - 120
+        os.utime(path, (past, past))
+        self.assertEqual(workspace.sweep(), 1)
+        self.assertFalse(os.path.exists(path))
+
+    def test_quota_is_enforced(self):
+        workspace = Workspace(self.temp_dir.name, max_bytes=10)
+        workspace.write_bytes(b'x' * 10)
+        with self.assertRaises(WorkspaceFullError):
+            workspace.path('.pdf')
+
+    def test_remove_ignores_paths_outside_workspace(self):
+        workspace = Workspace(os.path.join(self.temp_dir.name, 'ws'))
+        outside = os.path.join(self.temp_dir.name, 'upload.pdf')
+        open(outside, 'w').close()
+        workspace.remove(outside)
+        self.assertTrue(os.path.exists(outside))
+
+
+if __name__ == "__main__":
+    unittest.main()
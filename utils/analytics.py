@@ -0,0 +1,39 @@
+import bisect
+
+# Upper bounds (seconds) of the processing-time histogram kept per day; the
+# last bucket is open-ended. Percentiles are read from the histogram, so
+# they are exact to within one bucket.
+LATENCY_BUCKETS = (0.5, 1, 2, 3, 5, 8, 13, 20, 30, 45, 60, 90, 120, 180, 300)
+
+
+def latency_bucket(seconds):
+    return bisect.bisect_left(LATENCY_BUCKETS, seconds)
+
+
+def bucket_bounds(bucket):
+    lower = LATENCY_BUCKETS[bucket - 1] if bucket > 0 else 0.0
+    upper = LATENCY_BUCKETS[bucket] if bucket < len(LATENCY_BUCKETS) else None
+    return lower, upper
+
+
+def histogram_percentile(histogram, fraction):
+    """Estimate a percentile from {bucket: count}, interpolating linearly
+    inside the bucket it falls in. Returns None for an empty histogram."""
+    total = sum(histogram.values())
+    if not total:
+        return None
+    target = fraction * total
+    seen = 0
+    for bucket in sorted(histogram):
+        count = histogram[bucket]
+        if count and seen + count >= target:
+            lower, upper = bucket_bounds(bucket)
+            if upper is None:
+                return lower
+            return lower + (upper - lower) * (target - seen) / count
+        seen += count
+    return bucket_bounds(max(histogram))[0]
+
+
+def failure_rate(failed, total):
+    return round(failed / total, 4) if total else None
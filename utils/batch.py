@@ -0,0 +1,202 @@
+import os
+import glob
+import json
+import logging
+from collections import deque
+from types import SimpleNamespace
+from concurrent.futures import (FIRST_COMPLETED, ProcessPoolExecutor,
+                                ThreadPoolExecutor, wait)
+from concurrent.futures.process import BrokenProcessPool
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_EXTENSIONS = ('.pdf', '.pptx', '.key', '.md')
+
+
+def collect_sources(paths=(), url_files=()):
+    """Expand directories, globs and URL list files into batch sources."""
+    sources = []
+    for path in paths:
+        if os.path.isdir(path):
+            matches = sorted(
+                os.path.join(root, name)
+                for root, _, names in os.walk(path) for name in names)
+        else:
+            matches = sorted(glob.glob(path)) or [path]
+        sources.extend({
+            'id': os.path.abspath(match),
+            'file_path': match
+        } for match in matches if match.lower().endswith(SUPPORTED_EXTENSIONS))
+
+    for url_file in url_files:
+        with open(url_file, 'r') as f:
+            for line in f:
+                url = line.strip()
+                if url and not url.startswith('#'):
+                    sources.append({'id': url, 'url': url})
+    return sources
+
+
+def load_checkpoint(output_path):
+    done = set()
+    if not output_path or not os.path.exists(output_path):
+        return done
+    with open(output_path, 'r') as f:
+        for line in f:
+            try:
+                done.add(json.loads(line)['source'])
+            except (ValueError, KeyError):
+                # A line cut short by an interrupted run is simply redone.
+                continue
+    return done
+
+
+def extract_source(source, rules):
+    """Process-pool entry point: hash, consult the result cache, extract."""
+    from .validator import get_cached_result, resolve_source
+
+    try:
+        content_hash, extract = resolve_source(source)
+        cached = get_cached_result(content_hash, SimpleNamespace(**rules))
+        if cached is not None:
+            cached['cached'] = True
+            return source, content_hash, None, cached
+        slide_data = extract()
+        # Plain dict so the result pickles back to the parent process.
+        return source, content_hash, dict(slide_data), None
+    except Exception as e:
+        logger.error(f"Error extracting {source['id']}: {str(e)}",
+                     exc_info=True)
+        return source, None, {'error': str(e)}, None
+
+
+def check_source(source, content_hash, slide_data, conference):
+    from .validator import validate_extracted
+
+    if 'error' in slide_data:
+        return source, {'error': slide_data['error']}
+    # One deck failing its checks must not abort the rest of the batch
+    try:
+        return source, validate_extracted(content_hash, slide_data,
+                                          conference)
+    except Exception as e:
+        logger.error(f"Error checking {source['id']}: {str(e)}",
+                     exc_info=True)
+        return source, {'error': str(e), 'slide_data': slide_data}
+
+
+def batch_record(source, result):
+    from .validator import slide_data_summary
+
+    checks = result.get('deterministic_results', []) + result.get(
+        'ai_results', [])
+    record = {
+        'source': source['id'],
+        'passed': bool(checks) and 'error' not in result and all(
+            check['passed'] for check in checks),
+        'cached': result.get('cached', False),
+        'processing_time': result.get('processing_time'),
+        'summary': slide_data_summary(result.get('slide_data') or {}),
+        'deterministic_results': result.get('deterministic_results', []),
+        'ai_results': result.get('ai_results', []),
+    }
+    if result.get('error'):
+        record['error'] = result['error']
+    return record
+
+
+def run_batch(sources,
+              rules,
+              output,
+              extract_workers=None,
+              check_workers=4,
+              done=()):
+    """Validate `sources`, writing one NDJSON record to `output` per deck as
+    soon as that deck finishes. Sources whose id is in `done` are skipped.
+
+    A worker process that dies (e.g. a crash inside a parser) takes down
+    the extractions in flight with it. The pool is replaced and those
+    sources are extracted again one at a time in a pool of their own, so
+    only the deck that crashes it gets an error record.
+    """
+    conference = SimpleNamespace(**rules)
+    queued = deque(source for source in sources if source['id'] not in done)
+    suspects = deque()
+    workers = extract_workers or os.cpu_count() or 1
+    extractors = ProcessPoolExecutor(max_workers=workers)
+    isolated = None
+    # future -> (stage, source, pool); extractions are submitted a pool's
+    # worth at a time so a crash only catches the decks actually running
+    running = {}
+    completed = 0
+
+    def emit(source, result):
+        nonlocal completed
+        output.write(json.dumps(batch_record(source, result), default=str) +
+                     '\n')
+        output.flush()
+        completed += 1
+
+    def submit_extractions():
+        nonlocal isolated
+        stages = [stage for stage, _, _ in running.values()]
+        for _ in range(workers - stages.count('extract')):
+            if not queued:
+                break
+            source = queued.popleft()
+            running[extractors.submit(extract_source, source,
+                                      rules)] = ('extract', source, extractors)
+        if suspects and 'isolated' not in stages:
+            if isolated is None:
+                isolated = ProcessPoolExecutor(max_workers=1)
+            source = suspects.popleft()
+            running[isolated.submit(extract_source, source,
+                                    rules)] = ('isolated', source, isolated)
+
+    try:
+        with ThreadPoolExecutor(max_workers=check_workers) as checkers:
+            submit_extractions()
+            while running:
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    stage, source, pool = running.pop(future)
+                    if stage == 'check':
+                        emit(*future.result())
+                        continue
+                    try:
+                        source, content_hash, slide_data, cached = \
+                            future.result()
+                    except BrokenProcessPool as e:
+                        pool.shutdown(wait=False)
+                        if stage == 'isolated':
+                            # Alone in its pool, so this deck crashed it
+                            logger.error(
+                                f"Extraction of {source['id']} crashed its worker"
+                            )
+                            isolated = None
+                            emit(source, {
+                                'error': f'Extraction worker crashed: {str(e)}'
+                            })
+                        else:
+                            if pool is extractors:
+                                logger.warning(
+                                    "Extraction worker died, retrying the decks it was processing"
+                                )
+                                extractors = ProcessPoolExecutor(
+                                    max_workers=workers)
+                            suspects.append(source)
+                        continue
+                    if cached is not None:
+                        emit(source, cached)
+                    else:
+                        running[checkers.submit(check_source, source,
+                                                content_hash, slide_data,
+                                                conference)] = ('check',
+                                                                source, None)
+                submit_extractions()
+    finally:
+        extractors.shutdown()
+        if isolated is not None:
+            isolated.shutdown()
+
+    return completed
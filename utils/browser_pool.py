@@ -0,0 +1,204 @@
+import os
+import asyncio
+import atexit
+import threading
+import logging
+from playwright.async_api import async_playwright
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+
+
+class _PooledBrowser:
+
+    def __init__(self):
+        self.browser = None
+        self.pages_served = 0
+        self.lock = None
+
+
+class BrowserPool:
+    """Long-lived headless Chromium instances shared by every URL render.
+
+    Playwright objects are bound to the event loop that created them, so the
+    pool runs its own loop on a background thread and callers on any thread
+    submit renders to it. Concurrency is capped at
+    `browsers * contexts_per_browser`; each render gets a fresh context so
+    cookies and storage never leak between submissions.
+    """
+
+    def __init__(self,
+                 browsers=2,
+                 contexts_per_browser=2,
+                 pages_per_browser=100,
+                 page_timeout=60,
+                 acquire_timeout=60):
+        self.browsers = browsers
+        self.contexts_per_browser = contexts_per_browser
+        self.pages_per_browser = pages_per_browser
+        self.page_timeout = page_timeout
+        self.acquire_timeout = acquire_timeout
+        self._loop = None
+        self._thread = None
+        self._playwright = None
+        self._entries = []
+        self._slots = None
+        self._active = {}
+        self._start_lock = threading.Lock()
+
+    def start(self):
+        with self._start_lock:
+            if self._thread is not None:
+                return
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=loop.run_forever,
+                                      name='browser-pool',
+                                      daemon=True)
+            thread.start()
+            future = asyncio.run_coroutine_threadsafe(self._start(), loop)
+            try:
+                future.result(self.acquire_timeout)
+            except Exception:
+                # Leave the pool unstarted so the next render retries
+                future.cancel()
+                loop.call_soon_threadsafe(loop.stop)
+                thread.join(timeout=5)
+                raise
+            self._loop = loop
+            self._thread = thread
+
+    def _run(self, coro, timeout=None):
+        future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        return future.result(timeout)
+
+    async def _start(self):
+        playwright = await async_playwright().start()
+        entries = []
+        slots = asyncio.Queue()
+        for _ in range(self.browsers):
+            entry = _PooledBrowser()
+            entry.lock = asyncio.Lock()
+            entries.append(entry)
+            for _ in range(self.contexts_per_browser):
+                slots.put_nowait(entry)
+        self._playwright = playwright
+        self._entries = entries
+        self._slots = slots
+        self._active = {}
+
+    def render_pdf(self, url, timeout=None):
+        self.start()
+        return self._run(self._render_pdf(url, timeout or self.page_timeout))
+
+    async def _render_pdf(self, url, timeout):
+        try:
+            entry = await asyncio.wait_for(self._slots.get(),
+                                           self.acquire_timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutError(
+                f"No browser slot free after {self.acquire_timeout}s")
+        try:
+            browser = await self._checkout(entry)
+            self._active[browser] = self._active.get(browser, 0) + 1
+            try:
+                return await asyncio.wait_for(
+                    self._print_page(browser, url, timeout), timeout)
+            finally:
+                self._active[browser] -= 1
+                # A crashed browser is relaunched by the next checkout.
+                if not browser.is_connected():
+                    logger.warning("Pooled browser disconnected")
+        finally:
+            self._slots.put_nowait(entry)
+
+    async def _checkout(self, entry):
+        async with entry.lock:
+            browser = entry.browser
+            if (browser is None or not browser.is_connected()
+                    or entry.pages_served >= self.pages_per_browser):
+                if browser is not None:
+                    asyncio.ensure_future(self._close_when_idle(browser))
+                entry.browser = await self._playwright.chromium.launch(
+                    headless=True)
+                entry.pages_served = 0
+                logger.debug("Launched pooled browser")
+            entry.pages_served += 1
+            return entry.browser
+
+    async def _print_page(self, browser, url, timeout):
+        context = await browser.new_context(user_agent=USER_AGENT)
+        try:
+            page = await context.new_page()
+            await page.goto(url,
+                            wait_until='networkidle',
+                            timeout=timeout * 1000)
+
+            # Wait for the content to load
+            await page.wait_for_selector('body',
+                                         state='visible',
+                                         timeout=timeout * 1000)
+            return await page.pdf(format='A4')
+        finally:
+            try:
+                await context.close()
+            except Exception:
+                pass
+
+    async def _close_when_idle(self, browser):
+        while self._active.get(browser, 0) > 0:
+            await asyncio.sleep(0.5)
+        self._active.pop(browser, None)
+        try:
+            await browser.close()
+        except Exception as e:
+            logger.debug(f"Error closing retired browser: {str(e)}")
+
+    async def _close(self):
+        for entry in self._entries:
+            if entry.browser is not None:
+                try:
+                    await entry.browser.close()
+                except Exception:
+                    pass
+                entry.browser = None
+        await self._playwright.stop()
+
+    def close(self):
+        with self._start_lock:
+            if self._thread is None:
+                return
+            try:
+                self._run(self._close(), timeout=30)
+            finally:
+                self._loop.call_soon_threadsafe(self._loop.stop)
+                self._thread.join(timeout=5)
+                self._thread = None
+                self._loop = None
+                self._playwright = None
+                self._entries = []
+                self._slots = None
+                self._active = {}
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_browser_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = BrowserPool(
+                browsers=int(os.environ.get('SLIDECHECK_BROWSERS', '2')),
+                contexts_per_browser=int(
+                    os.environ.get('SLIDECHECK_CONTEXTS_PER_BROWSER', '2')),
+                pages_per_browser=int(
+                    os.environ.get('SLIDECHECK_PAGES_PER_BROWSER', '100')),
+                page_timeout=int(
+                    os.environ.get('SLIDECHECK_PAGE_TIMEOUT', '60')),
+                acquire_timeout=int(
+                    os.environ.get('SLIDECHECK_BROWSER_ACQUIRE_TIMEOUT',
+                                   '60')))
+            atexit.register(_pool.close)
+        return _pool
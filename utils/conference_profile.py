@@ -0,0 +1,177 @@
+import re
+import json
+import threading
+from functools import lru_cache
+from .text_scanner import SCANNER_VERSION, Hit, ScanResult, TextScanner
+from .disk_cache import hash_json
+
+CODE_PATTERNS = [
+    r'\bdef\s+\w+\s*\(.*\):',  # Python function definition
+    r'\bclass\s+\w+:',  # Python class definition
+    r'\bif\s+.*:',  # Python if statement
+    r'\bfor\s+.*:',  # Python for loop
+    r'\bwhile\s+.*:',  # Python while loop
+    r'\bfunction\s+\w+\s*\(.*\)\s*{',  # JavaScript function
+    r'\bconst\s+\w+\s*=',  # JavaScript const declaration
+    r'\blet\s+\w+\s*=',  # JavaScript let declaration
+    r'\bvar\s+\w+\s*=',  # JavaScript var declaration
+]
+
+TECH_TERMS = [
+    'algorithm', 'api', 'database', 'framework', 'machine learning',
+    'cloud computing', 'blockchain', 'cybersecurity',
+    'artificial intelligence', 'iot'
+]
+
+STAT_TERMS = [
+    'mean', 'median', 'mode', 'standard deviation', 'variance',
+    'regression', 'correlation', 'p-value', 'confidence interval',
+    'hypothesis test'
+]
+
+# Scan results kept per slide record, one per distinct rule set
+MAX_SCANS_PER_SLIDE = 8
+
+CUSTOM_CHECK_NAMES = ('code_snippets', 'technical_terminology',
+                      'statistical_terms')
+
+_SUBSET_PREFIX = re.compile(r'^[A-Z]{6}\+')
+_STYLE_SUFFIX = re.compile(
+    r'(?:ps|mt|bold|italic|oblique|regular|light|medium|semibold|black)$')
+
+
+@lru_cache(maxsize=4096)
+def normalize_font(name):
+    """Reduce a font name to its family, e.g. 'ABCDEF+Arial-BoldMT' -> 'arial'.
+
+    Handles PDF subset prefixes, PostScript style suffixes after '-' or ','
+    and spacing differences ('Times New Roman' == 'TimesNewRomanPSMT').
+    """
+    name = _SUBSET_PREFIX.sub('', name.strip())
+    name = re.split(r'[-,]', name, maxsplit=1)[0]
+    family = re.sub(r'[\s_]+', '', name).lower()
+    while True:
+        stripped = _STYLE_SUFFIX.sub('', family)
+        if not stripped or stripped == family:
+            return family
+        family = stripped
+
+
+class ConferenceProfile:
+    """A conference's rules parsed once into the structures the checks use."""
+
+    def __init__(self, conference):
+        self.name = getattr(conference, 'name', None)
+        self.max_slides = conference.max_slides
+
+        self.required_sections = tuple(
+            conference.required_sections.split(',')
+        ) if conference.required_sections else ()
+
+        allowed_fonts = getattr(conference, 'allowed_fonts', None)
+        if allowed_fonts and allowed_fonts != '*':
+            self.allowed_font_names = tuple(allowed_fonts.split(','))
+            self.allowed_fonts = frozenset(
+                normalize_font(font) for font in self.allowed_font_names)
+        else:
+            self.allowed_font_names = ()
+            # None means every font is allowed
+            self.allowed_fonts = None
+
+        custom_checks = getattr(conference, 'custom_checks', None) or {}
+        if isinstance(custom_checks, str):
+            custom_checks = json.loads(custom_checks)
+        self.custom_checks = {
+            name: config['threshold']
+            for name, config in custom_checks.items()
+            if name in CUSTOM_CHECK_NAMES and config.get('enabled', False)
+        }
+
+        keywords = {
+            f'section:{section}': [section]
+            for section in self.required_sections
+        }
+        patterns = {}
+        if 'technical_terminology' in self.custom_checks:
+            keywords['technical_terminology'] = TECH_TERMS
+        if 'statistical_terms' in self.custom_checks:
+            keywords['statistical_terms'] = STAT_TERMS
+        if 'code_snippets' in self.custom_checks:
+            patterns = {
+                f'code:{index}': [pattern]
+                for index, pattern in enumerate(CODE_PATTERNS)
+            }
+        self.scanner = TextScanner(keywords=keywords, patterns=patterns)
+        # Identifies the scanner configuration in per-slide cache records
+        self.scan_key = hash_json([SCANNER_VERSION, keywords, patterns])
+
+    def scan(self, deck):
+        """Scan every slide of `deck`, reusing hits cached for slides whose
+        fingerprint has been scanned with the same rules before."""
+        result = ScanResult()
+        for index in range(deck.page_count):
+            record = deck.page_record(index)
+            scans = record.get('scans', {})
+            hits = scans.get(self.scan_key)
+            if hits is None:
+                slide_scan = self.scanner.scan_slide(index,
+                                                     deck.page_text(index))
+                hits = {
+                    rule: [[hit.start, hit.end, hit.term] for hit in rule_hits]
+                    for rule, rule_hits in slide_scan.hits.items()
+                }
+                scans = dict(list(scans.items())[-(MAX_SCANS_PER_SLIDE - 1):])
+                scans[self.scan_key] = hits
+                deck.update_page_record(index, scans=scans)
+            for rule, rule_hits in hits.items():
+                for start, end, term in rule_hits:
+                    result.add(rule, Hit(index, start, end, term))
+        return result
+
+    def is_font_allowed(self, font):
+        return self.allowed_fonts is None or normalize_font(
+            font) in self.allowed_fonts
+
+
+def profile_fingerprint(conference):
+    custom_checks = getattr(conference, 'custom_checks', None)
+    if isinstance(custom_checks, dict):
+        custom_checks = json.dumps(custom_checks, sort_keys=True)
+    return (getattr(conference, 'name', None), conference.max_slides,
+            conference.required_sections,
+            getattr(conference, 'allowed_fonts', None), custom_checks)
+
+
+_profiles = {}
+_profiles_lock = threading.Lock()
+MAX_PROFILES = 256
+
+
+def get_profile(conference):
+    """Return the compiled profile for `conference`, rebuilding it only when
+    one of its rule fields has changed since it was compiled."""
+    if isinstance(conference, ConferenceProfile):
+        return conference
+    fingerprint = profile_fingerprint(conference)
+    conference_id = getattr(conference, 'id', None)
+    key = conference_id if conference_id is not None else fingerprint
+
+    with _profiles_lock:
+        cached = _profiles.get(key)
+        if cached is not None and cached[0] == fingerprint:
+            return cached[1]
+
+    profile = ConferenceProfile(conference)
+    with _profiles_lock:
+        if len(_profiles) >= MAX_PROFILES:
+            _profiles.pop(next(iter(_profiles)))
+        _profiles[key] = (fingerprint, profile)
+    return profile
+
+
+def invalidate_profile(conference_id=None):
+    with _profiles_lock:
+        if conference_id is None:
+            _profiles.clear()
+        else:
+            _profiles.pop(conference_id, None)
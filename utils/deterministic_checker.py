@@ -1,9 +1,15 @@
-import PyPDF2
-import re
-import json
+from .slide_deck import SlideDeck
+from .conference_profile import (CODE_PATTERNS, TECH_TERMS, STAT_TERMS,
+                                 get_profile)
+
+# Handlers report the converted deck as 'application/pdf'; decks stored
+# before that used 'pdf'.
+PDF_TYPES = ('pdf', 'application/pdf')
 
 
 def run_deterministic_checks(slide_data, conference):
+    deck = SlideDeck.wrap(slide_data)
+    profile = get_profile(conference)
     results = []
 
     # Check file type
@@ -20,20 +26,22 @@ def run_deterministic_checks(slide_data, conference):
         'check':
         'Number of slides',
         'passed':
-        num_slides <= conference.max_slides,
+        num_slides <= profile.max_slides,
         'message':
-        f'The deck has {num_slides} slides. Maximum allowed for this conference is {conference.max_slides} slides.'
+        f'The deck has {num_slides} slides. Maximum allowed for this conference is {profile.max_slides} slides.'
     })
 
     # Check for required sections
-    required_sections = conference.required_sections.split(
-        ',') if conference.required_sections else []
-    found_sections = set()
-    all_text = ' '.join(slide_data['content']).lower()
+    required_sections = profile.required_sections
+
+    # Every keyword and pattern is found in a single pass over each changed
+    # slide; unchanged slides reuse their cached hits
+    scan = profile.scan(deck)
 
-    for section in required_sections:
-        if section.lower() in all_text:
-            found_sections.add(section)
+    found_sections = {
+        section
+        for section in required_sections if scan.found(f'section:{section}')
+    }
 
     missing_sections = set(required_sections) - found_sections
     results.append({
@@ -47,106 +55,85 @@ def run_deterministic_checks(slide_data, conference):
     })
 
     # Conference-specific checks
-    # custom_checks = json.loads(
-    #     conference.custom_checks) if conference.custom_checks else {}
-
-    # if custom_checks.get('code_snippets', {}).get('enabled', False):
+    # if 'code_snippets' in profile.custom_checks:
     #     results.append(
-    #         check_code_snippets(all_text,
-    #                             custom_checks['code_snippets']['threshold']))
+    #         check_code_snippets(scan,
+    #                             profile.custom_checks['code_snippets']))
 
-    # if custom_checks.get('technical_terminology', {}).get('enabled', False):
+    # if 'technical_terminology' in profile.custom_checks:
     #     results.append(
     #         check_technical_terminology(
-    #             all_text, custom_checks['technical_terminology']['threshold']))
+    #             scan, profile.custom_checks['technical_terminology']))
 
-    # if custom_checks.get('data_visualization', {}).get('enabled', False):
+    # if 'data_visualization' in profile.custom_checks:
     #     results.append(
     #         check_data_visualization(
-    #             all_text, custom_checks['data_visualization']['threshold']))
+    #             scan, profile.custom_checks['data_visualization']))
 
-    # if custom_checks.get('statistical_terms', {}).get('enabled', False):
+    # if 'statistical_terms' in profile.custom_checks:
     #     results.append(
     #         check_statistical_terms(
-    #             all_text, custom_checks['statistical_terms']['threshold']))
+    #             scan, profile.custom_checks['statistical_terms']))
 
     # Check font usage
-    results.append(check_font_usage(slide_data, conference))
+    results.append(check_font_usage(slide_data, profile))
 
     return results
 
 
+def check_code_snippets(scan, threshold):
+    code_snippet_count = sum(1 for index in range(len(CODE_PATTERNS))
+                             if scan.found(f'code:{index}'))
+    has_code = code_snippet_count >= threshold
+    return {
+        'check':
+        'Code Snippets',
+        'passed':
+        has_code,
+        'message':
+        f'The presentation contains {code_snippet_count} code snippet(s). Threshold: {threshold}.'
+    }
+
+
+def check_technical_terminology(scan, threshold):
+    found_terms = [
+        term for term in TECH_TERMS
+        if term in scan.terms('technical_terminology')
+    ]
+    has_tech_terms = len(found_terms) >= threshold
+    return {
+        'check':
+        'Technical Terminology',
+        'passed':
+        has_tech_terms,
+        'message':
+        f'The presentation includes {len(found_terms)} technical term(s): {", ".join(found_terms)}. Threshold: {threshold}.'
+    }
+
 
-# def check_code_snippets(text, threshold):
-#     code_patterns = [
-#         r'\bdef\s+\w+\s*\(.*\):',  # Python function definition
-#         r'\bclass\s+\w+:',  # Python class definition
-#         r'\bif\s+.*:',  # Python if statement
-#         r'\bfor\s+.*:',  # Python for loop
-#         r'\bwhile\s+.*:',  # Python while loop
-#         r'\bfunction\s+\w+\s*\(.*\)\s*{',  # JavaScript function
-#         r'\bconst\s+\w+\s*=',  # JavaScript const declaration
-#         r'\blet\s+\w+\s*=',  # JavaScript let declaration
-#         r'\bvar\s+\w+\s*=',  # JavaScript var declaration
-#     ]
-
-#     code_snippet_count = sum(1 for pattern in code_patterns
-#                              if re.search(pattern, text, re.IGNORECASE))
-#     has_code = code_snippet_count >= threshold
-#     return {
-#         'check':
-#         'Code Snippets',
-#         'passed':
-#         has_code,
-#         'message':
-#         f'The presentation contains {code_snippet_count} code snippet(s). Threshold: {threshold}.'
-#     }
-
-
-# def check_technical_terminology(text, threshold):
-#     tech_terms = [
-#         'algorithm', 'api', 'database', 'framework', 'machine learning',
-#         'cloud computing', 'blockchain', 'cybersecurity',
-#         'artificial intelligence', 'iot'
-#     ]
-#     found_terms = [term for term in tech_terms if term in text.lower()]
-#     has_tech_terms = len(found_terms) >= threshold
-#     return {
-#         'check':
-#         'Technical Terminology',
-#         'passed':
-#         has_tech_terms,
-#         'message':
-#         f'The presentation includes {len(found_terms)} technical term(s): {", ".join(found_terms)}. Threshold: {threshold}.'
-#     }
-
-
-# def check_statistical_terms(text, threshold):
-#     stat_terms = [
-#         'mean', 'median', 'mode', 'standard deviation', 'variance',
-#         'regression', 'correlation', 'p-value', 'confidence interval',
-#         'hypothesis test'
-#     ]
-#     found_terms = [term for term in stat_terms if term in text.lower()]
-#     has_stat_terms = len(found_terms) >= threshold
-#     return {
-#         'check':
-#         'Statistical Terms',
-#         'passed':
-#         has_stat_terms,
-#         'message':
-#         f'The presentation includes {len(found_terms)} statistical term(s): {", ".join(found_terms)}. Threshold: {threshold}.'
-#     }
+def check_statistical_terms(scan, threshold):
+    found_terms = [
+        term for term in STAT_TERMS if term in scan.terms('statistical_terms')
+    ]
+    has_stat_terms = len(found_terms) >= threshold
+    return {
+        'check':
+        'Statistical Terms',
+        'passed':
+        has_stat_terms,
+        'message':
+        f'The presentation includes {len(found_terms)} statistical term(s): {", ".join(found_terms)}. Threshold: {threshold}.'
+    }
 
 
 def check_font_usage(slide_data, conference):
     file_type = slide_data['type']
 
-    if file_type == 'pdf' and 'fonts' in slide_data:
+    if file_type in PDF_TYPES and 'fonts' in slide_data:
         fonts_used = slide_data['fonts']
-        allowed_fonts = conference.allowed_fonts.split(',') if conference.allowed_fonts and conference.allowed_fonts != '*' else []
+        profile = get_profile(conference)
 
-        if not allowed_fonts or conference.allowed_fonts == '*':
+        if profile.allowed_fonts is None:
             return {
                 'check':
                 'Font usage',
@@ -157,7 +144,7 @@ def check_font_usage(slide_data, conference):
             }
 
         disallowed_fonts = [
-            font for font in fonts_used if font not in allowed_fonts
+            font for font in fonts_used if not profile.is_font_allowed(font)
         ]
 
         if disallowed_fonts:
@@ -167,7 +154,7 @@ def check_font_usage(slide_data, conference):
                 'passed':
                 False,
                 'message':
-                f'Disallowed fonts used: {", ".join(disallowed_fonts)}. Allowed fonts: {", ".join(allowed_fonts)}'
+                f'Disallowed fonts used: {", ".join(disallowed_fonts)}. Allowed fonts: {", ".join(profile.allowed_font_names)}'
             }
         else:
             return {
@@ -182,4 +169,3 @@ def check_font_usage(slide_data, conference):
             'passed': True,
             'message': 'Font check not applicable for this file type.'
         }
-
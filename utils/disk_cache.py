@@ -0,0 +1,200 @@
+import os
+import re
+import json
+import time
+import hashlib
+import threading
+import logging
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = os.environ.get(
+    'SLIDECHECK_CACHE_DIR',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                 'instance', 'cache'))
+
+
+def hash_file(path, chunk_size=1024 * 1024):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def hash_bytes(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def hash_text(text):
+    return hash_bytes(text.encode('utf-8'))
+
+
+def normalize_whitespace(text):
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+def hash_json(value):
+    encoded = json.dumps(value, sort_keys=True, default=str).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class DiskCache:
+    """JSON values stored one file per key, evicted least-recently-used once
+    the directory grows past `max_bytes`. Entries older than `ttl` seconds
+    are treated as misses. An entry may own one binary attachment file
+    (see `attachment_path`), which counts toward the size bound and is
+    evicted with it.
+
+    Sizes and recency are tracked in memory; the directory is scanned once
+    on first use and again every `rescan_interval` seconds to pick up
+    writes from other processes, never on every write."""
+
+    def __init__(self,
+                 directory,
+                 max_bytes=256 * 1024 * 1024,
+                 ttl=None,
+                 rescan_interval=300):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.rescan_interval = rescan_interval
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        # key -> size in bytes, least recently used first
+        self._index = None
+        self._total = 0
+        self._scanned = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses}
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def attachment_path(self, key):
+        return os.path.join(self.directory, f"{key}.body")
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, 'r') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        if self.ttl is not None and time.time() - entry['created'] > self.ttl:
+            self.delete(key)
+            self.misses += 1
+            return None
+        # The file mtime doubles as the LRU timestamp across restarts.
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        with self._lock:
+            index = self._load_index()
+            if key in index:
+                index.move_to_end(key)
+        self.hits += 1
+        return entry['value']
+
+    def set(self, key, value):
+        path = self._path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({'created': time.time(), 'value': value}, f, default=str)
+        os.replace(tmp_path, path)
+        size = self._entry_size(key)
+        with self._lock:
+            index = self._load_index()
+            self._total += size - index.pop(key, 0)
+            index[key] = size
+            self._evict()
+
+    def delete(self, key):
+        for path in (self._path(key), self.attachment_path(key)):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        with self._lock:
+            if self._index is not None:
+                self._total -= self._index.pop(key, 0)
+
+    def clear(self):
+        for entry in self._entries():
+            self.delete(entry[2])
+
+    def _entry_size(self, key):
+        size = 0
+        for path in (self._path(key), self.attachment_path(key)):
+            try:
+                size += os.path.getsize(path)
+            except OSError:
+                pass
+        return size
+
+    def _load_index(self):
+        # Called with the lock held
+        if (self._index is None
+                or time.monotonic() - self._scanned > self.rescan_interval):
+            entries = sorted(self._entries())
+            self._index = OrderedDict(
+                (key, size) for _, size, key in entries)
+            self._total = sum(self._index.values())
+            self._scanned = time.monotonic()
+        return self._index
+
+    def _entries(self):
+        entries = []
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if not entry.name.endswith('.json'):
+                    continue
+                key = entry.name[:-len('.json')]
+                try:
+                    stat = entry.stat()
+                    size = stat.st_size
+                    if os.path.exists(self.attachment_path(key)):
+                        size += os.path.getsize(self.attachment_path(key))
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, size, key))
+        return entries
+
+    def _evict(self):
+        # Called with the lock held
+        while self._total > self.max_bytes and self._index:
+            key, size = self._index.popitem(last=False)
+            self._total -= size
+            for path in (self._path(key), self.attachment_path(key)):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            logger.debug(f"Evicted cache entry {key}")
+
+
+class NullCache:
+    """DiskCache stand-in that stores nothing, so every lookup misses."""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses}
+
+    def get(self, key):
+        self.misses += 1
+        return None
+
+    def set(self, key, value):
+        pass
+
+    def delete(self, key):
+        pass
@@ -0,0 +1,126 @@
+import os
+import importlib
+import threading
+import logging
+from collections import namedtuple
+
+logger = logging.getLogger(__name__)
+
+# Detected MIME types too generic to pick a handler; the extension decides.
+GENERIC_MIME_TYPES = ('application/octet-stream', 'text/plain',
+                      'application/zip')
+
+# Modules that register additional formats, imported on the first lookup
+FORMAT_PLUGINS = [
+    name.strip()
+    for name in os.environ.get('SLIDECHECK_FORMAT_PLUGINS', '').split(',')
+    if name.strip()
+]
+
+FormatHandler = namedtuple('FormatHandler',
+                           ['name', 'target', 'mime_types', 'extensions'])
+
+_handlers = {}
+_loaded = {}
+_plugins_loaded = False
+_lock = threading.RLock()
+
+
+def register_format(name, target, mime_types=(), extensions=()):
+    """Register a deck format.
+
+    `target` is either a callable or a 'module:function' string, which is
+    only imported the first time a deck of this format is processed.
+    Relative module names resolve against this package. The handler is
+    called as handler(input_data, file_type), where `input_data` is a path
+    or bytes, and returns slide data.
+    """
+    with _lock:
+        _handlers[name] = FormatHandler(name, target, tuple(mime_types),
+                                        tuple(ext.lower()
+                                              for ext in extensions))
+        _loaded.pop(name, None)
+
+
+def _load_plugins():
+    global _plugins_loaded
+    with _lock:
+        if _plugins_loaded:
+            return
+        _plugins_loaded = True
+        for module in FORMAT_PLUGINS:
+            try:
+                importlib.import_module(module)
+            except ImportError as e:
+                logger.error(f"Could not load format plugin {module}: {str(e)}")
+
+
+def handler_for(mime_type=None, extension=None):
+    """Name of the format for a detected MIME type and file extension."""
+    _load_plugins()
+    extension = (extension or '').lower()
+    with _lock:
+        by_mime = next((handler.name for handler in _handlers.values()
+                        if mime_type in handler.mime_types), None)
+        if by_mime is not None and mime_type not in GENERIC_MIME_TYPES:
+            return by_mime
+        by_extension = next((handler.name for handler in _handlers.values()
+                             if extension in handler.extensions), None)
+        return by_extension or by_mime
+
+
+def mime_type_for(name):
+    """The canonical MIME type of a registered format, if it has one."""
+    with _lock:
+        handler = _handlers.get(name)
+        return handler.mime_types[0] if handler and handler.mime_types else None
+
+
+def get_handler(name):
+    """Return the handler callable for `name`, importing it on first use."""
+    _load_plugins()
+    with _lock:
+        if name in _loaded:
+            return _loaded[name]
+        handler = _handlers.get(name)
+        if handler is None:
+            raise ValueError(f"Unsupported format: {name}")
+        target = handler.target
+        if isinstance(target, str):
+            module_name, _, attribute = target.partition(':')
+            module = importlib.import_module(module_name, package=__package__)
+            target = getattr(module, attribute)
+        _loaded[name] = target
+        return target
+
+
+def loaded_formats():
+    with _lock:
+        return sorted(_loaded)
+
+
+register_format('pdf',
+                '.pdf_format:handle',
+                mime_types=('application/pdf', ),
+                extensions=('.pdf', ))
+register_format(
+    'pptx',
+    '.pptx_format:handle',
+    mime_types=(
+        'application/vnd.openxmlformats-officedocument.presentationml.presentation',
+    ),
+    extensions=('.pptx', ))
+register_format('key',
+                '.keynote_format:handle',
+                mime_types=('application/x-iwork-keynote-sffkey', ),
+                extensions=('.key', ))
+register_format('md',
+                '.markdown_format:handle',
+                mime_types=('text/markdown', ),
+                extensions=('.md', ))
+register_format('odp',
+                '.odp_format:handle',
+                mime_types=('application/vnd.oasis.opendocument.presentation',
+                            ),
+                extensions=('.odp', ))
+register_format('url', '.url_format:process_url')
@@ -0,0 +1,171 @@
+import os
+import shutil
+import threading
+import logging
+import requests
+from requests.adapters import HTTPAdapter
+from requests.utils import get_encoding_from_headers
+from .disk_cache import CACHE_DIR, DiskCache, hash_text
+from .workspace import workspace
+
+logger = logging.getLogger(__name__)
+
+CONNECT_TIMEOUT = float(os.environ.get('SLIDECHECK_CONNECT_TIMEOUT', '10'))
+READ_TIMEOUT = float(os.environ.get('SLIDECHECK_READ_TIMEOUT', '60'))
+MAX_DOWNLOAD_BYTES = int(os.environ.get('SLIDECHECK_MAX_DOWNLOAD_MB',
+                                        '200')) * 1024 * 1024
+POOL_SIZE = int(os.environ.get('SLIDECHECK_HTTP_POOL_SIZE', '10'))
+CHUNK_SIZE = 64 * 1024
+
+
+class DownloadTooLargeError(Exception):
+    pass
+
+
+class FetchResult:
+
+    def __init__(self, url, path, status_code, headers, not_modified=False):
+        self.url = url
+        self.path = path
+        self.status_code = status_code
+        self.headers = headers
+        self.not_modified = not_modified
+
+    @property
+    def content_type(self):
+        return self.headers.get('Content-Type', '')
+
+    def read_bytes(self):
+        with open(self.path, 'rb') as f:
+            return f.read()
+
+    def read_text(self):
+        encoding = get_encoding_from_headers(self.headers) or 'utf-8'
+        with open(self.path, 'r', encoding=encoding, errors='replace') as f:
+            return f.read()
+
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=POOL_SIZE,
+                                  pool_maxsize=POOL_SIZE)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            _session = session
+        return _session
+
+
+# Bodies of remote decks that advertise ETag/Last-Modified, kept so an
+# unchanged deck can be revalidated with a 304 instead of downloaded again.
+download_cache = DiskCache(os.path.join(CACHE_DIR, 'downloads'),
+                           max_bytes=int(
+                               os.environ.get('SLIDECHECK_DOWNLOAD_CACHE_MB',
+                                              '512')) * 1024 * 1024)
+
+
+def _workspace_link(path, suffix):
+    """Give the caller its own name for a cached download, so eviction or a
+    concurrent refetch of the same URL cannot remove or replace the file
+    while it is being read. Returns None if `path` is already gone."""
+    target = workspace.path(suffix)
+    try:
+        os.link(path, target)
+    except FileNotFoundError:
+        return None
+    except OSError:
+        # Another filesystem, or one without hard links
+        try:
+            shutil.copyfile(path, target)
+        except FileNotFoundError:
+            return None
+    return target
+
+
+def fetch(url,
+          max_bytes=None,
+          conditional=True,
+          suffix='',
+          timeout=None,
+          session=None):
+    """Stream `url` to disk and return a FetchResult pointing at the file.
+
+    Raises DownloadTooLargeError if the body exceeds `max_bytes` and
+    requests.HTTPError for non-success responses.
+    """
+    max_bytes = max_bytes or MAX_DOWNLOAD_BYTES
+    timeout = timeout or (CONNECT_TIMEOUT, READ_TIMEOUT)
+    session = session or get_session()
+    key = hash_text(url)
+
+    cached = download_cache.get(key) if conditional else None
+    headers = {}
+    if cached and os.path.exists(download_cache.attachment_path(key)):
+        if cached.get('etag'):
+            headers['If-None-Match'] = cached['etag']
+        if cached.get('last_modified'):
+            headers['If-Modified-Since'] = cached['last_modified']
+    else:
+        cached = None
+
+    with session.get(url, headers=headers, stream=True,
+                     timeout=timeout) as response:
+        if response.status_code == 304 and cached:
+            path = _workspace_link(download_cache.attachment_path(key),
+                                   suffix)
+            if path is None:
+                logger.debug(f"Cached copy of {url} is gone, refetching")
+                return fetch(url, max_bytes, conditional=False, suffix=suffix,
+                             timeout=timeout, session=session)
+            logger.debug(f"Not modified, reusing download of {url}")
+            return FetchResult(url, path, 304, cached['headers'],
+                               not_modified=True)
+        response.raise_for_status()
+
+        content_length = response.headers.get('Content-Length')
+        if content_length and int(content_length) > max_bytes:
+            raise DownloadTooLargeError(
+                f"{url} is {content_length} bytes; the limit is {max_bytes}")
+
+        validators = {
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+        }
+        cacheable = conditional and any(validators.values())
+        if cacheable:
+            path = f"{download_cache.attachment_path(key)}.{threading.get_ident()}.tmp"
+        else:
+            path = workspace.path(suffix)
+
+        received = 0
+        try:
+            with open(path, 'wb') as f:
+                for chunk in response.iter_content(CHUNK_SIZE):
+                    received += len(chunk)
+                    if received > max_bytes:
+                        raise DownloadTooLargeError(
+                            f"{url} exceeded the {max_bytes} byte limit")
+                    f.write(chunk)
+        except Exception:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            raise
+
+        response_headers = dict(response.headers)
+        status_code = response.status_code
+
+    if cacheable:
+        private_path = _workspace_link(path, suffix)
+        os.replace(path, download_cache.attachment_path(key))
+        validators['headers'] = response_headers
+        download_cache.set(key, validators)
+        path = private_path
+    return FetchResult(url, path, status_code, response_headers)
@@ -0,0 +1,62 @@
+import os
+import sys
+import json
+import subprocess
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_MODULES = ['utils.file_processor', 'utils.ai_checker',
+                   'utils.validator']
+
+# Libraries a single-format run should not have to load
+HEAVY_MODULES = ['fitz', 'pptx', 'reportlab', 'weasyprint', 'docx',
+                 'striprtf', 'bs4', 'markdown', 'magic', 'openai',
+                 'playwright']
+
+_PROBE = """
+import sys, time, json, resource
+started = time.perf_counter()
+import {module}
+imported = time.perf_counter() - started
+path = {path!r}
+if path:
+    from utils.file_processor import process_file
+    result = process_file(path)
+    if hasattr(result, 'close'):
+        result.close()
+print(json.dumps({{
+    'import_seconds': imported,
+    'total_seconds': time.perf_counter() - started,
+    'max_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    'loaded': [name for name in {heavy!r} if name in sys.modules],
+}}))
+"""
+
+
+def measure_import(module, path=None):
+    """Import `module` (and optionally process `path`) in a fresh
+    interpreter and return its timings, peak RSS and the heavy libraries
+    it ended up loading."""
+    code = _PROBE.format(module=module, path=path, heavy=HEAVY_MODULES)
+    output = subprocess.run([sys.executable, '-c', code],
+                            cwd=REPO_ROOT,
+                            capture_output=True,
+                            text=True,
+                            check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def run_benchmark(modules=None, path=None, repeat=5):
+    """Best-of-`repeat` cold import for each module."""
+    results = []
+    for module in modules or DEFAULT_MODULES:
+        runs = [measure_import(module, path) for _ in range(repeat)]
+        best = min(runs, key=lambda run: run['total_seconds'])
+        results.append({
+            'module': module,
+            'import_seconds': best['import_seconds'],
+            'total_seconds': best['total_seconds'],
+            'max_rss_kb': max(run['max_rss_kb'] for run in runs),
+            'loaded': best['loaded'],
+        })
+    return results
@@ -0,0 +1,390 @@
+import os
+import json
+import time
+import uuid
+import socket
+import sqlite3
+import threading
+import multiprocessing
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DB_PATH = os.environ.get(
+    'SLIDECHECK_JOB_DB',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                 'instance', 'jobs.db'))
+
+# Seconds a claimed job stays owned by its worker without a renewal. Workers
+# renew while the handler runs, so only jobs of dead workers expire.
+LEASE_SECONDS = float(os.environ.get('SLIDECHECK_JOB_LEASE', '60'))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    stage TEXT,
+    partial TEXT NOT NULL DEFAULT '{}',
+    result TEXT,
+    error TEXT,
+    timings TEXT NOT NULL DEFAULT '{}',
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    worker_id TEXT,
+    lease_expires REAL
+);
+CREATE INDEX IF NOT EXISTS ix_jobs_status_created ON jobs (status, created_at);
+"""
+
+# Columns added after the first release; created on databases that predate them
+MIGRATIONS = (
+    ('worker_id', 'ALTER TABLE jobs ADD COLUMN worker_id TEXT'),
+    ('lease_expires', 'ALTER TABLE jobs ADD COLUMN lease_expires REAL'),
+)
+
+# Stages reported repeatedly while a step is still running (e.g. each AI
+# check as it completes); they update the partial results but not timings.
+PARTIAL_STAGES = ('ai_check', )
+
+
+def _connect(db_path):
+    conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    return conn
+
+
+class JobQueue:
+    """Persistent job queue backed by a local SQLite database.
+
+    Jobs survive restarts: a claimed job carries a lease that its worker
+    renews while it runs, and a 'running' job whose lease has expired (its
+    worker died) is claimed again or put back on the queue by `recover()`.
+    Workers may be threads in the web process or separate processes; both
+    claim jobs through the database.
+    """
+
+    def __init__(self,
+                 db_path=DEFAULT_DB_PATH,
+                 handler=None,
+                 lease_seconds=LEASE_SECONDS):
+        self.db_path = db_path
+        self.handler = handler
+        self.lease_seconds = lease_seconds
+        self._local = threading.local()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._changed = threading.Condition()
+        self._workers = []
+        os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+        conn = self._conn()
+        conn.executescript(SCHEMA)
+        columns = {
+            row['name']
+            for row in conn.execute('PRAGMA table_info(jobs)')
+        }
+        for column, statement in MIGRATIONS:
+            if column not in columns:
+                conn.execute(statement)
+
+    def _conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = _connect(self.db_path)
+        return conn
+
+    def submit(self, payload):
+        job_id = uuid.uuid4().hex
+        self._conn().execute(
+            "INSERT INTO jobs (id, status, payload, created_at) VALUES (?, 'queued', ?, ?)",
+            (job_id, json.dumps(payload), time.time()))
+        self._wakeup.set()
+        return job_id
+
+    def get(self, job_id):
+        row = self._conn().execute("SELECT * FROM jobs WHERE id = ?",
+                                   (job_id, )).fetchone()
+        if row is None:
+            return None
+        return {
+            'id': row['id'],
+            'status': row['status'],
+            'stage': row['stage'],
+            'partial': json.loads(row['partial']),
+            'result': json.loads(row['result']) if row['result'] else None,
+            'error': row['error'],
+            'timings': json.loads(row['timings']),
+            'created_at': row['created_at'],
+            'started_at': row['started_at'],
+            'finished_at': row['finished_at'],
+        }
+
+    def worker_id(self):
+        return (f"{socket.gethostname()}:{os.getpid()}:"
+                f"{threading.current_thread().name}")
+
+    def claim(self, worker_id=None):
+        """Take the oldest queued job, or a running one whose lease expired,
+        and lease it to `worker_id`."""
+        worker_id = worker_id or self.worker_id()
+        conn = self._conn()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            now = time.time()
+            row = conn.execute(
+                "SELECT id, payload, status FROM jobs WHERE status = 'queued' "
+                "OR (status = 'running' AND lease_expires < ?) "
+                "ORDER BY created_at LIMIT 1", (now, )).fetchone()
+            if row is None:
+                conn.execute('COMMIT')
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = 'running', started_at = ?, "
+                "worker_id = ?, lease_expires = ? WHERE id = ?",
+                (now, worker_id, now + self.lease_seconds, row['id']))
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        if row['status'] == 'running':
+            logger.info(f"Reclaimed job {row['id']} from an expired lease")
+        return row['id'], json.loads(row['payload'])
+
+    def renew(self, job_id, worker_id):
+        """Extend the lease; False if the job is no longer ours."""
+        cursor = self._conn().execute(
+            "UPDATE jobs SET lease_expires = ? "
+            "WHERE id = ? AND worker_id = ? AND status = 'running'",
+            (time.time() + self.lease_seconds, job_id, worker_id))
+        return cursor.rowcount == 1
+
+    def report(self, job_id, stage, data, elapsed=None):
+        conn = self._conn()
+        row = conn.execute("SELECT partial, timings FROM jobs WHERE id = ?",
+                           (job_id, )).fetchone()
+        partial = json.loads(row['partial'])
+        timings = json.loads(row['timings'])
+        partial[stage] = data
+        if elapsed is not None:
+            timings[stage] = elapsed
+        conn.execute(
+            "UPDATE jobs SET stage = ?, partial = ?, timings = ? WHERE id = ?",
+            (stage, json.dumps(partial, default=str), json.dumps(timings),
+             job_id))
+        self._notify()
+
+    def finish(self, job_id, result=None, error=None):
+        conn = self._conn()
+        conn.execute(
+            "UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ?, "
+            "lease_expires = NULL WHERE id = ?",
+            ('failed' if error else 'done',
+             json.dumps(result, default=str) if result is not None else None,
+             error, time.time(), job_id))
+        self._notify()
+
+    def _notify(self):
+        with self._changed:
+            self._changed.notify_all()
+
+    def watch(self, job_id, poll_interval=0.25, heartbeat=15):
+        """Yield the job each time it changes until it is done or failed.
+
+        Workers in this process wake the watcher directly; changes made by
+        worker processes are picked up by polling. None is yielded after
+        `heartbeat` seconds without a change so streams can keep their
+        connection alive.
+        """
+        last = None
+        idle_since = time.monotonic()
+        while True:
+            job = self.get(job_id)
+            if job is None:
+                return
+            snapshot = (job['status'], job['partial'], job['result'])
+            if snapshot != last:
+                last = snapshot
+                idle_since = time.monotonic()
+                yield job
+                if job['status'] in ('done', 'failed'):
+                    return
+            elif time.monotonic() - idle_since >= heartbeat:
+                idle_since = time.monotonic()
+                yield None
+            with self._changed:
+                self._changed.wait(poll_interval)
+
+    def recover(self):
+        """Requeue running jobs whose worker stopped renewing the lease.
+
+        Jobs leased by live workers, in this or another process, are left
+        alone. Rows written before leases existed have none and count as
+        expired.
+        """
+        cursor = self._conn().execute(
+            "UPDATE jobs SET status = 'queued', started_at = NULL, "
+            "worker_id = NULL, lease_expires = NULL WHERE status = 'running' "
+            "AND (lease_expires IS NULL OR lease_expires < ?)",
+            (time.time(), ))
+        if cursor.rowcount:
+            logger.info(f"Requeued {cursor.rowcount} interrupted job(s)")
+
+    def _keep_leased(self, job_id, worker_id, done):
+        while not done.wait(self.lease_seconds / 3):
+            try:
+                if not self.renew(job_id, worker_id):
+                    logger.warning(f"Lost the lease on job {job_id}")
+                    return
+            except Exception as e:
+                logger.error(f"Failed to renew lease on job {job_id}: {str(e)}")
+
+    def run_one(self):
+        worker_id = self.worker_id()
+        claimed = self.claim(worker_id)
+        if claimed is None:
+            return False
+        job_id, payload = claimed
+        done = threading.Event()
+        renewer = threading.Thread(target=self._keep_leased,
+                                   args=(job_id, worker_id, done),
+                                   name=f'job-lease-{job_id[:8]}',
+                                   daemon=True)
+        renewer.start()
+        started = time.monotonic()
+        last = [started]
+
+        def progress(stage, data):
+            if stage in PARTIAL_STAGES:
+                self.report(job_id, stage, data)
+                return
+            now = time.monotonic()
+            self.report(job_id, stage, data, now - last[0])
+            last[0] = now
+
+        result = error = None
+        try:
+            result = self.handler(payload, progress)
+        except Exception as e:
+            logger.error(f"Job {job_id} failed: {str(e)}", exc_info=True)
+            error = str(e)
+        finally:
+            done.set()
+            renewer.join()
+        self.finish(job_id, result=result, error=error)
+        return True
+
+    def work(self, poll_interval=0.5):
+        while not self._stop.is_set():
+            try:
+                if self.run_one():
+                    continue
+            except Exception as e:
+                logger.error(f"Job worker error: {str(e)}", exc_info=True)
+            self._wakeup.wait(poll_interval)
+            self._wakeup.clear()
+
+    def start_workers(self, workers=2, mode='thread'):
+        self.recover()
+        for i in range(workers):
+            if mode == 'process':
+                worker = multiprocessing.Process(target=_process_worker,
+                                                 args=(self.db_path,
+                                                       self.handler,
+                                                       self.lease_seconds),
+                                                 name=f'job-worker-{i}',
+                                                 daemon=True)
+            else:
+                worker = threading.Thread(target=self.work,
+                                          name=f'job-worker-{i}',
+                                          daemon=True)
+            worker.start()
+            self._workers.append(worker)
+
+    def stop(self):
+        self._stop.set()
+        self._wakeup.set()
+        for worker in self._workers:
+            if isinstance(worker, multiprocessing.Process):
+                worker.terminate()
+            worker.join(timeout=5)
+        self._workers = []
+
+
+def _process_worker(db_path, handler, lease_seconds):
+    JobQueue(db_path, handler=handler, lease_seconds=lease_seconds).work()
+
+
+def validation_events(jobs):
+    """Turn the snapshots from `JobQueue.watch` into client events.
+
+    'extraction' and 'deterministic' are sent once each, then one 'check'
+    per AI result as it completes and finally 'done' (with the AI results in
+    their final order) or 'failed'. 'keepalive' stands in for heartbeats.
+    """
+    sent = set()
+    checks = []
+    for job in jobs:
+        if job is None:
+            yield 'keepalive', None
+            continue
+        partial = job['partial']
+        for stage in ('extraction', 'deterministic'):
+            if stage in partial and stage not in sent:
+                sent.add(stage)
+                yield stage, partial[stage]
+        # Cached results arrive as a single 'ai' stage
+        for result in (partial.get('ai_check') or []) + (partial.get('ai')
+                                                          or []):
+            if result not in checks:
+                checks.append(result)
+                yield 'check', result
+
+        result = job['result'] or {}
+        if job['status'] == 'failed' or result.get('error'):
+            yield 'failed', {'error': job['error'] or result.get('error')}
+        elif job['status'] == 'done':
+            yield 'done', {
+                'ai_results': result.get('ai_results', []),
+                'cached': result.get('cached', False),
+                'processing_time': result.get('processing_time'),
+            }
+
+
+def run_validation_job(payload, progress):
+    # Imported here so process workers only load the pipeline they run.
+    from types import SimpleNamespace
+    from .validator import (checks_passed, resolve_url, validate_file,
+                            validate_url)
+    from .file_processor import process_file
+    from .master_deck import keep_deck
+    from .workspace import workspace
+
+    conference = SimpleNamespace(**payload['conference'])
+    # Scratch files from conversion are only needed while the job runs.
+    with workspace.scope():
+        try:
+            if payload.get('url'):
+                result = validate_url(payload['url'],
+                                      conference,
+                                      progress=progress)
+                reextract = lambda: resolve_url(payload['url'])[1]()
+            else:
+                result = validate_file(payload['file_path'],
+                                       conference,
+                                       progress=progress)
+                reextract = lambda: process_file(payload['file_path'])
+            # Accepted decks outlive the scope for the master deck
+            if payload.get('keep_accepted') and checks_passed(result):
+                result['deck_file'] = keep_deck(result['content_hash'],
+                                                result['slide_data'],
+                                                reextract)
+            return result
+        finally:
+            if payload.get('cleanup'):
+                try:
+                    os.remove(payload['file_path'])
+                except OSError:
+                    pass
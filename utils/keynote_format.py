@@ -0,0 +1,70 @@
+import logging
+import zipfile
+import xml.etree.ElementTree as ET
+from io import BytesIO
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen import canvas
+from .pdf_format import process_pdf
+from .workspace import workspace
+
+logger = logging.getLogger(__name__)
+
+
+def handle(input_data, file_type):
+    temp_pdf_path = convert_keynote_to_pdf(
+        BytesIO(input_data) if isinstance(input_data, bytes) else input_data)
+    result = process_pdf(temp_pdf_path)
+    result.update({
+        'original_type': file_type,
+        'type': 'application/pdf',
+        'temp_file_path': temp_pdf_path,
+        'video_tracks': [],
+        'audio_tracks': []
+    })
+    return result
+
+
+def convert_keynote_to_pdf(input_file):
+    output_file = workspace.path('.pdf')
+
+    try:
+        slides = extract_text_from_keynote(input_file)
+
+        pdf = canvas.Canvas(output_file, pagesize=letter)
+        pdf.setFont("Helvetica", 12)
+
+        for i, slide_content in enumerate(slides):
+            pdf.drawString(100, 750, f"Slide {i + 1}")
+            y = 720
+            for line in slide_content.split('\n'):
+                pdf.drawString(100, y, line)
+                y -= 20
+                if y < 50:
+                    pdf.showPage()
+                    y = 750
+            pdf.showPage()
+
+        pdf.save()
+        return output_file
+    except Exception as e:
+        logger.error(f"Error converting Keynote to PDF: {str(e)}",
+                     exc_info=True)
+        raise
+
+
+def extract_text_from_keynote(keynote_file):
+    slides = []
+    with zipfile.ZipFile(keynote_file, 'r') as zip_ref:
+        for filename in zip_ref.namelist():
+            if filename.startswith('Data/Slide') and filename.endswith(
+                    '.apxl'):
+                with zip_ref.open(filename) as file:
+                    tree = ET.parse(file)
+                    root = tree.getroot()
+                    slide_content = ""
+                    for text_elem in root.iter(
+                            '{http://developer.apple.com/namespaces/keynote2}text'
+                    ):
+                        slide_content += text_elem.text + "\n" if text_elem.text else ""
+                    slides.append(slide_content)
+    return slides
@@ -0,0 +1,297 @@
+import os
+import json
+import math
+import time
+import random
+import threading
+import logging
+from collections import deque
+from email.utils import parsedate_to_datetime
+
+logger = logging.getLogger(__name__)
+
+
+class LLMError(Exception):
+    """A failed backend call that may succeed if retried."""
+
+
+class RateLimitedError(LLMError):
+    """The backend answered 429; `retry_after` is in seconds, if given."""
+
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class LLMFatalError(Exception):
+    """A request the provider will keep refusing (bad key, bad request)."""
+
+
+class LLMBackend:
+    """What the checks need from a chat model.
+
+    `complete` returns the text of the first choice and raises on failure.
+    `available` is False when the backend cannot be used at all (e.g. no
+    API key), and `cacheable` says whether its answers may be stored in the
+    response cache.
+    """
+    name = 'base'
+    cacheable = True
+
+    @property
+    def available(self):
+        return True
+
+    def complete(self,
+                 model,
+                 messages,
+                 max_tokens,
+                 response_format=None,
+                 timeout=None):
+        raise NotImplementedError
+
+
+class OpenAIBackend(LLMBackend):
+    name = 'openai'
+
+    def __init__(self, api_key=None):
+        self.api_key = api_key
+        self._client = None
+        self._lock = threading.Lock()
+
+    @property
+    def available(self):
+        return bool(self.api_key)
+
+    @property
+    def client(self):
+        # The SDK is imported with the first call so processes that never
+        # reach the API don't pay for it.
+        with self._lock:
+            if self._client is None:
+                from openai import OpenAI
+                logger.debug(
+                    f"Initializing OpenAI client with API key: {'[REDACTED]' if self.api_key else 'Not set'}"
+                )
+                # Retries are left to the caller's retry policy
+                self._client = OpenAI(api_key=self.api_key, max_retries=0)
+            return self._client
+
+    def complete(self,
+                 model,
+                 messages,
+                 max_tokens,
+                 response_format=None,
+                 timeout=None):
+        options = {
+            'response_format': response_format
+        } if response_format else {}
+        if timeout is not None:
+            options['timeout'] = timeout
+        try:
+            response = self.client.chat.completions.create(
+                model=model,
+                messages=messages,
+                max_tokens=max_tokens,
+                **options,
+            )
+        except Exception as e:
+            raise translate_openai_error(e) from e
+        # Tool calls and refusals come back without text content
+        return response.choices[0].message.content or ''
+
+
+def translate_openai_error(error):
+    """Map an OpenAI SDK exception onto the LLMError hierarchy; anything
+    that did not come from the SDK is returned unchanged."""
+    status = getattr(error, 'status_code', None)
+    if status == 429:
+        response = getattr(error, 'response', None)
+        return RateLimitedError(
+            str(error),
+            retry_after=retry_after_seconds(
+                response.headers if response is not None else {}))
+    # 408 and 409 are worth another try; other 4xx will fail the same way
+    if status is not None and 400 <= status < 500 and status not in (408,
+                                                                     409):
+        return LLMFatalError(str(error))
+    if status is not None or type(error).__module__.startswith('openai'):
+        return LLMError(str(error))
+    return error
+
+
+def retry_after_seconds(headers):
+    """Seconds to wait according to 'retry-after-ms' or 'retry-after'
+    (either delta-seconds or an HTTP date), or None."""
+    try:
+        if headers.get('retry-after-ms'):
+            return float(headers['retry-after-ms']) / 1000
+        value = headers.get('retry-after')
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            return max(0.0,
+                       parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_latency(spec):
+    """Build a latency sampler from 'constant:S', 'uniform:LO:HI',
+    'exponential:MEAN' or 'lognormal:MEDIAN:SIGMA' (seconds)."""
+    kind, *args = spec.split(':')
+    args = [float(arg) for arg in args]
+    if kind == 'constant':
+        return lambda rng: args[0]
+    if kind == 'uniform':
+        return lambda rng: rng.uniform(args[0], args[1])
+    if kind == 'exponential':
+        return lambda rng: rng.expovariate(1 / args[0])
+    if kind == 'lognormal':
+        return lambda rng: rng.lognormvariate(math.log(args[0]), args[1])
+    raise ValueError(f"Unknown latency distribution: {spec}")
+
+
+def default_response(model, messages, response_format):
+    if response_format:
+        return json.dumps({
+            'title_slide': True,
+            'text_heavy': False,
+            'relevant': True
+        })
+    content = messages[0]['content']
+    if isinstance(content, list):
+        return 'The images show a bar chart and a photo.'
+    return 'Yes'
+
+
+class FakeBackend(LLMBackend):
+    """In-process stand-in for load tests; nothing leaves the machine.
+
+    Each call sleeps for a latency drawn from `latency`, then fails with
+    probability `error_rate` (LLMError) or `rate_limit_rate` (429), and
+    otherwise answers via `responder`; calls slower than `timeout` time out
+    with an LLMError. With `requests_per_minute` set, calls beyond that rate
+    within a sliding minute get a 429 whose `retry_after` says when a slot
+    frees up, like a real provider. `seed` makes runs reproducible.
+    """
+    name = 'fake'
+    cacheable = False
+
+    def __init__(self,
+                 latency='constant:0',
+                 error_rate=0.0,
+                 rate_limit_rate=0.0,
+                 requests_per_minute=None,
+                 seed=None,
+                 responder=default_response,
+                 sleep=time.sleep,
+                 clock=time.monotonic):
+        self._sample_latency = parse_latency(latency) if isinstance(
+            latency, str) else latency
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.requests_per_minute = requests_per_minute
+        self.responder = responder
+        self._rng = random.Random(seed)
+        self._sleep = sleep
+        self._clock = clock
+        self._window = deque()
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.failures = 0
+
+    def _admit(self):
+        if not self.requests_per_minute:
+            return None
+        now = self._clock()
+        while self._window and self._window[0] <= now - 60:
+            self._window.popleft()
+        if len(self._window) >= self.requests_per_minute:
+            return self._window[0] + 60 - now
+        self._window.append(now)
+        return None
+
+    def complete(self,
+                 model,
+                 messages,
+                 max_tokens,
+                 response_format=None,
+                 timeout=None):
+        with self._lock:
+            self.calls += 1
+            retry_after = self._admit()
+            latency = max(0.0, self._sample_latency(self._rng))
+            roll = self._rng.random()
+        if retry_after is not None:
+            with self._lock:
+                self.failures += 1
+            raise RateLimitedError('Rate limit exceeded (fake backend)',
+                                   retry_after=retry_after)
+
+        if timeout is not None and latency > timeout:
+            self._sleep(timeout)
+            with self._lock:
+                self.failures += 1
+            raise LLMError('Request timed out (fake backend)')
+        self._sleep(latency)
+        if roll < self.error_rate:
+            with self._lock:
+                self.failures += 1
+            raise LLMError('Internal server error (fake backend)')
+        if roll < self.error_rate + self.rate_limit_rate:
+            with self._lock:
+                self.failures += 1
+            raise RateLimitedError('Rate limit exceeded (fake backend)',
+                                   retry_after=1.0)
+        return self.responder(model, messages, response_format)
+
+
+def fake_backend_from_spec(spec):
+    """Parse 'latency=lognormal:0.8:0.5,error_rate=0.01,seed=7' style
+    settings (as in SLIDECHECK_FAKE_LLM) into a FakeBackend."""
+    options = {}
+    for item in filter(None, (part.strip() for part in spec.split(','))):
+        key, _, value = item.partition('=')
+        if key == 'latency':
+            options[key] = value
+        elif key in ('requests_per_minute', 'seed'):
+            options[key] = int(value)
+        elif key in ('error_rate', 'rate_limit_rate'):
+            options[key] = float(value)
+        else:
+            raise ValueError(f"Unknown fake backend option: {key}")
+    return FakeBackend(**options)
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def backend_from_env():
+    name = os.environ.get('SLIDECHECK_LLM_BACKEND', 'openai')
+    if name == 'fake':
+        return fake_backend_from_spec(
+            os.environ.get('SLIDECHECK_FAKE_LLM', ''))
+    if name == 'openai':
+        return OpenAIBackend(os.environ.get('OPENAI_API_KEY'))
+    raise ValueError(f"Unknown LLM backend: {name}")
+
+
+def get_backend():
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            _backend = backend_from_env()
+        return _backend
+
+
+def set_backend(backend):
+    """Swap the process-wide backend (e.g. for a load test); returns the
+    previous one."""
+    global _backend
+    with _backend_lock:
+        previous, _backend = _backend, backend
+        return previous
@@ -0,0 +1,98 @@
+import time
+import threading
+from types import SimpleNamespace
+from concurrent.futures import ThreadPoolExecutor
+
+from .disk_cache import NullCache
+from .llm_backend import FakeBackend, set_backend
+from .rate_limiter import UnlimitedRateLimiter
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def run_load_test(paths, rules, submissions=20, concurrency=4, backend=None):
+    """Validate `submissions` decks (cycling through `paths`) with
+    `concurrency` submissions in flight, against `backend` instead of the
+    real provider, and report throughput and latency percentiles.
+
+    The result, per-slide and response caches are swapped out and the
+    shared rate limiter is replaced by an unthrottled one for the run, so
+    every submission does the full work and only `backend` paces the
+    model calls.
+    """
+    from . import ai_checker, slide_deck, validator
+    from .validator import validate_file
+
+    backend = backend or FakeBackend()
+    conference = SimpleNamespace(**rules)
+    latencies = []
+    outcomes = {
+        'passed': 0,
+        'failed': 0,
+        'ai_failed': 0,
+        'ai_deferred': 0,
+        'errors': 0
+    }
+    lock = threading.Lock()
+
+    def submit(path):
+        started = time.monotonic()
+        try:
+            result = validate_file(path, conference, use_cache=False)
+        except Exception:
+            with lock:
+                outcomes['errors'] += 1
+            return
+        elapsed = time.monotonic() - started
+        checks = result['deterministic_results'] + result['ai_results']
+        with lock:
+            latencies.append(elapsed)
+            messages = [r['message'] for r in result['ai_results']]
+            if any(m.startswith(ai_checker.AI_CHECK_FAILED)
+                   for m in messages):
+                outcomes['ai_failed'] += 1
+            if any(m.startswith(ai_checker.AI_CHECK_DEFERRED)
+                   for m in messages):
+                outcomes['ai_deferred'] += 1
+            outcomes['passed' if checks and all(r['passed'] for r in checks)
+                     else 'failed'] += 1
+
+    swapped = [(validator, 'result_cache', NullCache()),
+               (slide_deck, 'slide_cache', NullCache()),
+               (ai_checker, 'response_cache', NullCache()),
+               (ai_checker, 'rate_limiter', UnlimitedRateLimiter())]
+    originals = [(module, name, getattr(module, name))
+                 for module, name, _ in swapped]
+    for module, name, replacement in swapped:
+        setattr(module, name, replacement)
+    previous = set_backend(backend)
+    started = time.monotonic()
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            list(executor.map(submit,
+                              (paths[i % len(paths)]
+                               for i in range(submissions))))
+    finally:
+        set_backend(previous)
+        for module, name, original in originals:
+            setattr(module, name, original)
+    wall = time.monotonic() - started
+
+    return {
+        'submissions': submissions,
+        'concurrency': concurrency,
+        'wall_seconds': wall,
+        'throughput': len(latencies) / wall if wall else 0.0,
+        'p50': percentile(latencies, 0.50),
+        'p95': percentile(latencies, 0.95),
+        'p99': percentile(latencies, 0.99),
+        'llm_calls': getattr(backend, 'calls', None),
+        'llm_failures': getattr(backend, 'failures', None),
+        **outcomes,
+    }
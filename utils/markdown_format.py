@@ -0,0 +1,36 @@
+import logging
+import markdown
+from weasyprint import HTML
+from weasyprint.text.fonts import FontConfiguration
+from .pdf_format import process_pdf_bytes
+
+logger = logging.getLogger(__name__)
+
+
+def handle(input_data, file_type):
+    # Use the result directly instead of further processing
+    return convert_markdown_to_pdf(input_data)
+
+
+def convert_markdown_to_pdf(markdown_source):
+    try:
+        if isinstance(markdown_source, bytes):
+            md_content = markdown_source.decode('utf-8')
+        else:
+            with open(markdown_source, 'r', encoding='utf-8') as md_file:
+                md_content = md_file.read()
+        html = markdown.markdown(md_content)
+        font_config = FontConfiguration()
+        pdf_content = HTML(string=html).write_pdf(font_config=font_config)
+
+        # Process the PDF to get additional information
+        pdf_info = process_pdf_bytes(pdf_content)
+        pdf_info.update({
+            'type': 'application/pdf',
+            'original_type': 'markdown'
+        })
+        return pdf_info
+    except Exception as e:
+        logger.error(f"Error converting Markdown to PDF: {str(e)}",
+                     exc_info=True)
+        raise
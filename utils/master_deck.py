@@ -0,0 +1,141 @@
+import os
+import json
+import logging
+import threading
+import fitz  # PyMuPDF
+from .disk_cache import hash_json
+from .slide_deck import SlideDeck
+
+logger = logging.getLogger(__name__)
+
+INSTANCE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'instance')
+
+# Accepted decks are kept here as PDFs named by content hash; job scratch
+# files (uploads, conversions) are deleted once validation finishes.
+DECK_DIR = os.environ.get('SLIDECHECK_DECK_DIR',
+                          os.path.join(INSTANCE_DIR, 'decks'))
+
+MASTER_DECK_DIR = os.environ.get('SLIDECHECK_MASTER_DECK_DIR',
+                                 os.path.join(INSTANCE_DIR, 'master'))
+
+
+def keep_deck(content_hash, slide_data=None, reextract=None):
+    """Save an accepted deck's PDF under DECK_DIR and return its path.
+
+    The PDF comes from `slide_data` when its document can still be opened
+    (converting it if needed), otherwise from `reextract()`, e.g. after a
+    result cache hit whose scratch files are long gone.
+    """
+    target = os.path.join(DECK_DIR, f'{content_hash}.pdf')
+    if os.path.exists(target):
+        return target
+    os.makedirs(DECK_DIR, exist_ok=True)
+
+    for source in (lambda: slide_data, reextract):
+        data = source() if source is not None else None
+        if data is None or 'error' in data:
+            continue
+        deck = SlideDeck.wrap(data)
+        try:
+            temp_path = f'{target}.{os.getpid()}.{threading.get_ident()}.tmp'
+            deck.doc.save(temp_path, garbage=1)
+            os.replace(temp_path, target)
+            return target
+        except Exception as e:
+            logger.warning(f"Could not keep deck {content_hash}: {str(e)}")
+        finally:
+            deck.close()
+    return None
+
+
+class MasterDeck:
+    """One merged PDF of the accepted talks, kept next to a manifest of what
+    it contains.
+
+    `update` appends talks added after the last build with `insert_pdf`, so
+    earlier decks are not merged again; only removing, replacing or
+    reordering a talk rebuilds the file. Each talk gets a top-level bookmark
+    with its own bookmarks nested below it. The PDF is replaced atomically,
+    so downloads in progress keep reading the previous version.
+    """
+
+    def __init__(self, directory=MASTER_DECK_DIR):
+        self.directory = directory
+        self.pdf_path = os.path.join(directory, 'master_deck.pdf')
+        self.manifest_path = os.path.join(directory, 'manifest.json')
+        self._lock = threading.Lock()
+
+    def manifest(self):
+        try:
+            with open(self.manifest_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {'talks': [], 'etag': None}
+
+    def update(self, talks):
+        """Bring the merged PDF in line with `talks`, an ordered list of
+        dicts with 'key', 'title' and 'path'. Returns the manifest, or None
+        when there is nothing to merge."""
+        entries = []
+        for talk in talks:
+            if not talk.get('path') or not os.path.exists(talk['path']):
+                logger.warning(f"Deck for talk {talk['key']} is missing")
+                continue
+            entries.append({
+                'key': str(talk['key']),
+                'title': talk['title'] or f"Talk {talk['key']}",
+                'path': talk['path']
+            })
+
+        with self._lock:
+            manifest = self.manifest()
+            built = manifest['talks']
+            if not entries:
+                return None
+
+            identity = lambda entry: (entry['key'], entry['title'],
+                                      entry['path'])
+            if (os.path.exists(self.pdf_path) and list(
+                    map(identity, built)) == list(
+                        map(identity, entries[:len(built)]))):
+                pending = entries[len(built):]
+                if not pending:
+                    return manifest
+                merged = fitz.open(self.pdf_path)
+                logger.info(f"Appending {len(pending)} talk(s) to the master deck")
+            else:
+                built, pending = [], entries
+                merged = fitz.open()
+                logger.info(f"Rebuilding the master deck from {len(pending)} talk(s)")
+
+            try:
+                toc = merged.get_toc(simple=True)
+                for entry in pending:
+                    with fitz.open(entry['path']) as talk:
+                        start = len(merged)
+                        merged.insert_pdf(talk)
+                        toc.append([1, entry['title'], start + 1])
+                        toc.extend([level + 1, title, page + start]
+                                   for level, title, page in talk.get_toc(
+                                       simple=True) if page > 0)
+                        entry['first_page'] = start + 1
+                        entry['pages'] = len(talk)
+                merged.set_toc(toc)
+                os.makedirs(self.directory, exist_ok=True)
+                temp_path = f'{self.pdf_path}.{os.getpid()}.tmp'
+                merged.save(temp_path, garbage=1)
+            finally:
+                merged.close()
+            os.replace(temp_path, self.pdf_path)
+
+            talks = built + pending
+            manifest = {
+                'talks': talks,
+                'etag': hash_json([identity(entry) for entry in talks])
+            }
+            temp_path = f'{self.manifest_path}.{os.getpid()}.tmp'
+            with open(temp_path, 'w') as f:
+                json.dump(manifest, f)
+            os.replace(temp_path, self.manifest_path)
+            return manifest
@@ -0,0 +1,122 @@
+import os
+import re
+import fitz  # PyMuPDF
+
+# Images smaller than this on both sides are bullets, icons or spacers
+MIN_IMAGE_DIMENSION = int(os.environ.get('SLIDECHECK_MIN_IMAGE_DIMENSION',
+                                         '48'))
+# A page without embedded media but with this many vector paths may hold a
+# chart or diagram drawn as vectors; only those pages go to the vision model.
+VECTOR_PATH_THRESHOLD = int(
+    os.environ.get('SLIDECHECK_VECTOR_PATH_THRESHOLD', '20'))
+
+ANNOTATION_KINDS = {
+    fitz.PDF_ANNOT_MOVIE: 'video',
+    fitz.PDF_ANNOT_SCREEN: 'video',
+    fitz.PDF_ANNOT_RICH_MEDIA: 'video',
+    fitz.PDF_ANNOT_SOUND: 'audio',
+}
+
+VIDEO_LINK_RE = re.compile(
+    r'(youtube\.com/|youtu\.be/|vimeo\.com/|\.(mp4|mov|m4v|webm|avi)(\?|$))',
+    re.IGNORECASE)
+
+IMAGE_FILTERS = {
+    'DCTDecode': 'image/jpeg',
+    'JPXDecode': 'image/jp2',
+    'JBIG2Decode': 'image/jbig2',
+    'CCITTFaxDecode': 'image/tiff',
+}
+
+
+def _is_media_image(image):
+    width, height = image[2:4]
+    return width >= MIN_IMAGE_DIMENSION or height >= MIN_IMAGE_DIMENSION
+
+
+def page_media(deck, index):
+    """Images, movies, sounds and video links on one PDF page, plus the
+    number of vector paths drawn on it.
+
+    The entries are cached under the slide fingerprint, so they leave out
+    the slide number and the xrefs of images and annotations, which depend
+    on where the slide sits in its document; `media_inventory` adds them.
+    """
+    record = deck.page_record(index)
+    if 'media' not in record:
+        page = deck.doc[index]
+        media = []
+        for image in deck.page_images(index):
+            if not _is_media_image(image):
+                continue
+            length = deck.doc.xref_get_key(image[0], 'Length')
+            media.append({
+                'kind': 'image',
+                'content_type': IMAGE_FILTERS.get(image[8], 'image/x-pdf'),
+                'size': int(length[1]) if length[0] == 'int' else None,
+                'width': image[2],
+                'height': image[3],
+            })
+        for annot in page.annots(types=list(ANNOTATION_KINDS)):
+            media.append({
+                'kind': ANNOTATION_KINDS[annot.type[0]],
+                'content_type': None,
+                'size': None,
+            })
+        for link in page.get_links():
+            uri = link.get('uri') or ''
+            if VIDEO_LINK_RE.search(uri):
+                media.append({
+                    'kind': 'video',
+                    'content_type': None,
+                    'part': uri,
+                    'size': None,
+                })
+        deck.update_page_record(index,
+                                media=media,
+                                vector_paths=len(page.get_cdrawings()))
+    return record['media'], record['vector_paths']
+
+
+def page_parts(deck, index):
+    """Parts of the page's media images and annotations in this document,
+    in the order `page_media` lists them."""
+    parts = [
+        f'xref:{image[0]}' for image in deck.page_images(index)
+        if _is_media_image(image)
+    ]
+    parts.extend(f'annot:{annot.xref}'
+                 for annot in deck.doc[index].annots(
+                     types=list(ANNOTATION_KINDS)))
+    return parts
+
+
+def media_inventory(deck):
+    """Return (media, ambiguous_pages) read from the document structure.
+
+    PPTX decks carry their media list from extraction. For PDFs,
+    `ambiguous_pages` lists pages with vector graphics but no embedded
+    media, which only a render can classify. Both are stored on the deck.
+    Returns None when the deck has neither a media list nor a PDF.
+    """
+    if 'media' in deck:
+        return deck['media'], deck.get('ambiguous_media_pages', [])
+    if not deck.has_pdf():
+        return None
+
+    media = []
+    ambiguous_pages = []
+    for index in range(deck.page_count):
+        slide_media, vector_paths = page_media(deck, index)
+        if slide_media:
+            parts = iter(page_parts(deck, index))
+            media.extend(
+                dict(item,
+                     slide=index + 1,
+                     part=item['part'] if 'part' in item else next(parts))
+                for item in slide_media)
+        if not slide_media and vector_paths >= VECTOR_PATH_THRESHOLD:
+            ambiguous_pages.append(index)
+    deck['media'] = media
+    deck['ambiguous_media_pages'] = ambiguous_pages
+    return media, ambiguous_pages
@@ -0,0 +1,195 @@
+import struct
+import logging
+
+logger = logging.getLogger(__name__)
+
+# ISO base media (MP4/MOV) boxes that only hold other boxes
+MP4_CONTAINER_BOXES = {b'moov', b'trak', b'mdia', b'minf', b'stbl'}
+
+# Matroska/WebM element IDs, marker bits included
+EBML_HEADER = 0x1A45DFA3
+EBML_DOCTYPE = 0x4282
+MKV_SEGMENT = 0x18538067
+MKV_INFO = 0x1549A966
+MKV_TIMECODE_SCALE = 0x2AD7B1
+MKV_DURATION = 0x4489
+MKV_TRACKS = 0x1654AE6B
+MKV_TRACK_ENTRY = 0xAE
+MKV_TRACK_TYPE = 0x83
+MKV_CODEC_ID = 0x86
+MKV_CLUSTER = 0x1F43B675
+
+MKV_TRACK_KINDS = {1: 'video', 2: 'audio'}
+MP4_TRACK_KINDS = {b'vide': 'video', b'soun': 'audio'}
+
+
+def probe_media(f, size):
+    """Read the container headers of a seekable media stream of `size` bytes.
+
+    Returns a dict with 'container', 'duration' (seconds, or None),
+    'has_video', 'has_audio' and 'codecs', or None for containers other
+    than MP4/MOV and Matroska/WebM. Only headers are read; sample data is
+    skipped by seeking.
+    """
+    start = f.read(12)
+    f.seek(0)
+    if start[4:8] in (b'ftyp', b'moov', b'mdat', b'wide', b'free', b'skip'):
+        return _probe_mp4(f, size)
+    if start[:4] == EBML_HEADER.to_bytes(4, 'big'):
+        return _probe_matroska(f, size)
+    return None
+
+
+def _probe_result(container, duration, tracks):
+    return {
+        'container': container,
+        'duration': duration,
+        'has_video': any(kind == 'video' for kind, _ in tracks),
+        'has_audio': any(kind == 'audio' for kind, _ in tracks),
+        'codecs': [codec for _, codec in tracks if codec],
+    }
+
+
+def _mp4_boxes(f, end):
+    position = f.tell()
+    while position + 8 <= end:
+        f.seek(position)
+        size, box_type = struct.unpack('>I4s', f.read(8))
+        header_size = 8
+        if size == 1:
+            size = struct.unpack('>Q', f.read(8))[0]
+            header_size = 16
+        elif size == 0:
+            size = end - position
+        if size < header_size:
+            return
+        yield box_type, position + header_size, min(position + size, end)
+        position += size
+
+
+def _probe_mp4(f, size):
+    duration = None
+    tracks = []
+
+    def walk(start, end, track):
+        nonlocal duration
+        f.seek(start)
+        for box_type, body, box_end in list(_mp4_boxes(f, end)):
+            if box_type == b'trak':
+                track = {'kind': None, 'codec': None}
+                walk(body, box_end, track)
+                tracks.append((track['kind'], track['codec']))
+            elif box_type in MP4_CONTAINER_BOXES:
+                walk(body, box_end, track)
+            elif box_type == b'mvhd':
+                f.seek(body)
+                version = f.read(4)[0]
+                if version == 1:
+                    f.seek(16, 1)
+                    timescale, length = struct.unpack('>IQ', f.read(12))
+                else:
+                    f.seek(8, 1)
+                    timescale, length = struct.unpack('>II', f.read(8))
+                if timescale:
+                    duration = length / timescale
+            elif box_type == b'hdlr' and track is not None:
+                f.seek(body + 8)
+                track['kind'] = MP4_TRACK_KINDS.get(f.read(4))
+            elif box_type == b'stsd' and track is not None:
+                f.seek(body + 8)
+                entry = f.read(8)
+                if len(entry) == 8:
+                    track['codec'] = entry[4:8].decode('latin-1').strip()
+
+    # moov may sit after mdat; top-level boxes are visited by seeking past
+    # each one, so the sample data is never read.
+    f.seek(0)
+    for box_type, body, box_end in list(_mp4_boxes(f, size)):
+        if box_type == b'moov':
+            walk(body, box_end, None)
+            break
+    return _probe_result('mp4', duration, tracks)
+
+
+def _read_vint(f, keep_marker=False):
+    first = f.read(1)
+    if not first:
+        raise EOFError('Unexpected end of EBML stream')
+    value = first[0]
+    length = 1
+    mask = 0x80
+    while length <= 8 and not value & mask:
+        mask >>= 1
+        length += 1
+    if length > 8:
+        raise ValueError('Invalid EBML variable-length integer')
+    if not keep_marker:
+        value &= mask - 1
+    for byte in f.read(length - 1):
+        value = (value << 8) | byte
+    unknown = not keep_marker and value == (1 << (7 * length)) - 1
+    return value, unknown
+
+
+def _ebml_elements(f, end):
+    while f.tell() < end:
+        element_id, _ = _read_vint(f, keep_marker=True)
+        element_size, unknown = _read_vint(f)
+        body = f.tell()
+        element_end = end if unknown else min(body + element_size, end)
+        yield element_id, body, element_end, unknown
+        if not unknown:
+            f.seek(element_end)
+
+
+def _read_uint(f, end):
+    return int.from_bytes(f.read(end - f.tell()), 'big')
+
+
+def _probe_matroska(f, size):
+    container = 'matroska'
+    duration = None
+    timecode_scale = 1000000
+    tracks = []
+
+    for element_id, body, end, unknown in _ebml_elements(f, size):
+        if element_id == EBML_HEADER:
+            for child_id, child_body, child_end, _ in _ebml_elements(f, end):
+                if child_id == EBML_DOCTYPE:
+                    container = f.read(child_end -
+                                       child_body).decode('ascii', 'replace')
+        elif element_id == MKV_SEGMENT:
+            for child_id, child_body, child_end, child_unknown in _ebml_elements(
+                    f, end):
+                if child_id == MKV_INFO:
+                    for info_id, info_body, info_end, _ in _ebml_elements(
+                            f, child_end):
+                        if info_id == MKV_TIMECODE_SCALE:
+                            timecode_scale = _read_uint(f, info_end)
+                        elif info_id == MKV_DURATION:
+                            raw = f.read(info_end - info_body)
+                            duration = struct.unpack(
+                                '>f' if len(raw) == 4 else '>d', raw)[0]
+                elif child_id == MKV_TRACKS:
+                    for entry_id, _, entry_end, _ in _ebml_elements(
+                            f, child_end):
+                        if entry_id != MKV_TRACK_ENTRY:
+                            continue
+                        kind = codec = None
+                        for field_id, field_body, field_end, _ in _ebml_elements(
+                                f, entry_end):
+                            if field_id == MKV_TRACK_TYPE:
+                                kind = MKV_TRACK_KINDS.get(
+                                    _read_uint(f, field_end))
+                            elif field_id == MKV_CODEC_ID:
+                                codec = f.read(field_end - field_body).decode(
+                                    'ascii', 'replace').rstrip('\x00')
+                        tracks.append((kind, codec))
+                elif child_id == MKV_CLUSTER or child_unknown:
+                    # Headers come before the first cluster of media data
+                    break
+            break
+
+    if duration is not None:
+        duration = duration * timecode_scale / 1e9
+    return _probe_result(container, duration, tracks)
@@ -0,0 +1,199 @@
+import logging
+import zipfile
+import xml.etree.ElementTree as ET
+from io import BytesIO
+from .slide_deck import SlideDeck
+from .disk_cache import hash_bytes, hash_json, hash_text
+from .media_probe import probe_media
+
+logger = logging.getLogger(__name__)
+
+NS = {
+    'office': 'urn:oasis:names:tc:opendocument:xmlns:office:1.0',
+    'style': 'urn:oasis:names:tc:opendocument:xmlns:style:1.0',
+    'text': 'urn:oasis:names:tc:opendocument:xmlns:text:1.0',
+    'draw': 'urn:oasis:names:tc:opendocument:xmlns:drawing:1.0',
+    'presentation':
+    'urn:oasis:names:tc:opendocument:xmlns:presentation:1.0',
+    'fo': 'urn:oasis:names:tc:opendocument:xmlns:xsl-fo-compatible:1.0',
+    'svg': 'urn:oasis:names:tc:opendocument:xmlns:svg-compatible:1.0',
+    'xlink': 'http://www.w3.org/1999/xlink',
+}
+
+TEXT_TAGS = {f"{{{NS['text']}}}p", f"{{{NS['text']}}}h"}
+LIST_ITEM_TAG = f"{{{NS['text']}}}list-item"
+STYLE_NAME_ATTRS = (f"{{{NS['text']}}}style-name",
+                    f"{{{NS['draw']}}}text-style-name",
+                    f"{{{NS['presentation']}}}style-name",
+                    f"{{{NS['draw']}}}style-name")
+
+
+def handle(input_data, file_type):
+    source = BytesIO(input_data) if isinstance(input_data,
+                                               bytes) else input_data
+    result = extract_odp(source)
+    result.update({'original_type': file_type, 'type': 'application/pdf'})
+    return result
+
+
+def extract_odp(input_file):
+    """Build slide data from an OpenDocument presentation's content.xml.
+
+    Fonts are those named by the automatic styles each slide uses; fonts
+    inherited only from the master styles are not listed. Paragraphs in
+    list items count as bullets. There is no PDF
+    to render, so media comes from the package inventory alone.
+    """
+    with zipfile.ZipFile(input_file) as package:
+        root = ET.fromstring(package.read('content.xml'))
+        font_families = _font_families(root)
+        style_fonts = _style_fonts(root, font_families)
+
+        deck = SlideDeck()
+        content = []
+        fingerprints = []
+        bullets = []
+        fonts = set()
+        media = []
+        video_tracks = []
+        audio_tracks = []
+
+        pages = root.findall(
+            'office:body/office:presentation/draw:page', NS)
+        for slide_index, page in enumerate(pages):
+            slide_number = slide_index + 1
+            slide_text = []
+            slide_fonts = set()
+            slide_bullets = 0
+            for element in _iter_slide(page):
+                if element.tag in TEXT_TAGS:
+                    slide_text.append(''.join(element.itertext()))
+                elif element.tag == LIST_ITEM_TAG:
+                    slide_bullets += sum(
+                        1 for child in element if child.tag in TEXT_TAGS
+                        and ''.join(child.itertext()).strip())
+                for attr in STYLE_NAME_ATTRS:
+                    font = style_fonts.get(element.get(attr))
+                    if font:
+                        slide_fonts.add(font)
+
+            slide_media = _slide_media(package, page, slide_number)
+            for item in slide_media:
+                if item['kind'] == 'video':
+                    video_tracks.append(f"Video on slide {slide_number}")
+                elif item['kind'] == 'audio':
+                    audio_tracks.append(f"Audio on slide {slide_number}")
+
+            text = '\n'.join(slide_text)
+            fingerprint = hash_json([
+                hash_text(text),
+                hash_bytes(ET.tostring(page)),
+                sorted(_crc(package, item['part']) for item in slide_media)
+            ])
+            deck.seed_page(slide_index,
+                           text=text,
+                           fonts=slide_fonts,
+                           fingerprint=fingerprint)
+            content.append(text)
+            fingerprints.append(fingerprint)
+            bullets.append(slide_bullets)
+            fonts.update(slide_fonts)
+            media.extend(slide_media)
+
+    deck.update({
+        'type': 'pdf',
+        'num_slides': len(content),
+        'content': content,
+        'fonts': sorted(fonts),
+        'slide_fingerprints': fingerprints,
+        'slide_bullets': bullets,
+        'media': media,
+        'video_tracks': video_tracks,
+        'audio_tracks': audio_tracks,
+    })
+    return deck
+
+
+def _iter_slide(page):
+    # Speaker notes are not part of what the audience sees
+    notes = f"{{{NS['presentation']}}}notes"
+    for child in page:
+        if child.tag == notes:
+            continue
+        yield from child.iter()
+
+
+def _font_families(root):
+    families = {}
+    for face in root.iterfind('office:font-face-decls/style:font-face', NS):
+        family = face.get(f"{{{NS['svg']}}}font-family", '').strip("'\"")
+        families[face.get(f"{{{NS['style']}}}name")] = family
+    return families
+
+
+def _style_fonts(root, font_families):
+    style_fonts = {}
+    for style in root.iterfind('office:automatic-styles/style:style', NS):
+        properties = style.find('style:text-properties', NS)
+        if properties is None:
+            continue
+        name = properties.get(f"{{{NS['style']}}}font-name")
+        font = font_families.get(name, name) or properties.get(
+            f"{{{NS['fo']}}}font-family")
+        if font:
+            style_fonts[style.get(f"{{{NS['style']}}}name")] = font
+    return style_fonts
+
+
+def _slide_media(package, page, slide_number):
+    media = []
+    for frame in page.iter(f"{{{NS['draw']}}}frame"):
+        for child in frame:
+            href = child.get(f"{{{NS['xlink']}}}href", '')
+            if child.tag == f"{{{NS['draw']}}}image":
+                kind = 'image'
+                content_type = None
+            elif child.tag == f"{{{NS['draw']}}}plugin":
+                content_type = child.get(f"{{{NS['draw']}}}mime-type", '')
+                kind = 'audio' if content_type.startswith(
+                    'audio') else 'video'
+            elif child.tag == f"{{{NS['draw']}}}object":
+                kind = 'chart'
+                content_type = None
+            else:
+                continue
+            name = href.lstrip('./')
+            try:
+                info = package.getinfo(name)
+            except KeyError:
+                info = None
+            item = {
+                'slide': slide_number,
+                'kind': kind,
+                'content_type': content_type,
+                'part': f'/{name}' if info else href,
+                'size': info.file_size if info else None,
+            }
+            if kind == 'video':
+                item['probe'] = _probe(package, info)
+            media.append(item)
+            break
+    return media
+
+
+def _probe(package, info):
+    if info is None:
+        return None
+    try:
+        with package.open(info) as f:
+            return probe_media(f, info.file_size)
+    except Exception as e:
+        logger.debug(f"Could not probe {info.filename}: {str(e)}")
+        return None
+
+
+def _crc(package, part):
+    try:
+        return str(package.getinfo(part.lstrip('/')).CRC)
+    except KeyError:
+        return part
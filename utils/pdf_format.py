@@ -0,0 +1,50 @@
+import logging
+from .slide_deck import SlideDeck
+
+logger = logging.getLogger(__name__)
+
+
+def handle(input_data, file_type):
+    if isinstance(input_data, bytes):
+        result = process_pdf(stream=input_data)
+        result.update({
+            'original_type': file_type,
+            'type': 'application/pdf',
+            'video_tracks': [],
+            'audio_tracks': []
+        })
+        return result
+
+    result = process_pdf(input_data)
+    result.update({
+        'original_type': file_type,
+        'type': 'application/pdf',
+        'temp_file_path': input_data,
+        'video_tracks': [],
+        'audio_tracks': []
+    })
+    return result
+
+
+def process_pdf(pdf_path=None, stream=None):
+    try:
+        deck = SlideDeck(pdf_path, stream=stream)
+        num_pages = len(deck.doc)
+        deck['type'] = 'pdf'
+        deck['num_slides'] = num_pages
+        deck['content'] = deck.texts()
+        deck['fonts'] = list(deck.fonts())
+        deck['slide_fingerprints'] = deck.fingerprints()
+        return deck
+    except Exception as e:
+        logger.error(f"Error processing PDF: {str(e)}", exc_info=True)
+        return {'error': f"Failed to process PDF: {str(e)}"}
+
+
+def process_pdf_bytes(pdf_content):
+    """Parse PDF bytes in memory, keeping one workspace copy for consumers
+    that need a path (`temp_file_path`)."""
+    result = process_pdf(stream=pdf_content)
+    if 'error' not in result:
+        result.spill()
+    return result
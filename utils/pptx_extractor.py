@@ -0,0 +1,280 @@
+import logging
+import zipfile
+import xml.etree.ElementTree as ET
+from pptx import Presentation
+from pptx.enum.shapes import MSO_SHAPE_TYPE, PP_PLACEHOLDER
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from .slide_deck import SlideDeck
+from .disk_cache import hash_bytes, hash_json, hash_text
+from .media_probe import probe_media
+
+logger = logging.getLogger(__name__)
+
+DRAWINGML_NS = '{http://schemas.openxmlformats.org/drawingml/2006/main}'
+PRESENTATIONML_NS = (
+    '{http://schemas.openxmlformats.org/presentationml/2006/main}')
+
+MEDIA_RELATIONSHIPS = {
+    RT.IMAGE: 'image',
+    RT.VIDEO: 'video',
+    RT.AUDIO: 'audio',
+    RT.MEDIA: 'media',
+}
+
+TITLE_PLACEHOLDERS = (PP_PLACEHOLDER.TITLE, PP_PLACEHOLDER.CENTER_TITLE,
+                      PP_PLACEHOLDER.VERTICAL_TITLE)
+
+# Placeholders whose paragraphs follow the master's body style, which is
+# where decks usually get their bullets from.
+BODY_PLACEHOLDERS = (PP_PLACEHOLDER.BODY, PP_PLACEHOLDER.OBJECT,
+                     PP_PLACEHOLDER.VERTICAL_BODY,
+                     PP_PLACEHOLDER.VERTICAL_OBJECT)
+
+BULLET_TAGS = ('buChar', 'buAutoNum', 'buBlip')
+
+
+def extract_pptx(input_file, pdf_factory=None):
+    """Build slide data straight from the PPTX package.
+
+    Text, run-level fonts, bulleted paragraphs and the media inventory are
+    read from the slide XML; a PDF is only produced (via `pdf_factory`) if a
+    check renders pages.
+    """
+    prs = Presentation(input_file)
+    major_font, minor_font = _theme_fonts(prs)
+
+    deck = SlideDeck(pdf_factory=pdf_factory)
+    content = []
+    fingerprints = []
+    bullets = []
+    fonts = set()
+    media = []
+    video_tracks = []
+    audio_tracks = []
+
+    for slide_index, slide in enumerate(prs.slides):
+        slide_text = []
+        slide_fonts = set()
+        slide_bullets = 0
+        for shape in _iter_shapes(slide.shapes):
+            slide_bullets += _bulleted_paragraphs(shape, slide)
+            is_title = (shape.is_placeholder and
+                        shape.placeholder_format.type in TITLE_PLACEHOLDERS)
+            default_font = major_font if is_title else minor_font
+            for text_frame in _text_frames(shape):
+                for paragraph in text_frame.paragraphs:
+                    slide_text.append(paragraph.text)
+                    for run in paragraph.runs:
+                        font = _resolve_font(run.font.name, default_font,
+                                             major_font, minor_font)
+                        if font:
+                            slide_fonts.add(font)
+
+        slide_media = _slide_media(slide, slide_index + 1)
+        slide_media.extend(_slide_charts(slide, slide_index + 1))
+        for item in slide_media:
+            if item['kind'] == 'video':
+                video_tracks.append(f"Video on slide {slide_index + 1}")
+            elif item['kind'] == 'audio':
+                audio_tracks.append(f"Audio on slide {slide_index + 1}")
+
+        text = '\n'.join(slide_text)
+        fingerprint = _slide_fingerprint(slide, text)
+        deck.seed_page(slide_index,
+                       text=text,
+                       fonts=slide_fonts,
+                       fingerprint=fingerprint)
+        content.append(text)
+        fingerprints.append(fingerprint)
+        bullets.append(slide_bullets)
+        fonts.update(slide_fonts)
+        media.extend(slide_media)
+
+    _probe_videos(input_file, media)
+
+    deck.update({
+        'type': 'pdf',
+        'num_slides': len(content),
+        'content': content,
+        'fonts': sorted(fonts),
+        'slide_fingerprints': fingerprints,
+        'slide_bullets': bullets,
+        'media': media,
+        'video_tracks': video_tracks,
+        'audio_tracks': audio_tracks,
+    })
+    return deck
+
+
+def _iter_shapes(shapes):
+    for shape in shapes:
+        if shape.shape_type == MSO_SHAPE_TYPE.GROUP:
+            yield from _iter_shapes(shape.shapes)
+        else:
+            yield shape
+
+
+def _text_frames(shape):
+    if shape.has_text_frame:
+        yield shape.text_frame
+    if getattr(shape, 'has_table', False) and shape.has_table:
+        for row in shape.table.rows:
+            for cell in row.cells:
+                yield cell.text_frame
+
+
+def _bulleted_paragraphs(shape, slide):
+    """Non-empty paragraphs of `shape` that are drawn with a bullet.
+
+    A paragraph's bullet comes from its own properties or, failing that,
+    from the list styles it inherits: the shape's, its layout and master
+    placeholders', then the master's body style for body placeholders.
+    """
+    styles = [shape.element.find(f'.//{DRAWINGML_NS}lstStyle')]
+    if shape.is_placeholder:
+        placeholder = shape.placeholder_format
+        layout = slide.slide_layout
+        master = layout.slide_master
+        is_body = placeholder.type in BODY_PLACEHOLDERS
+        for inherited in (layout.placeholders.get(idx=placeholder.idx),
+                          master.placeholders.get(
+                              PP_PLACEHOLDER.BODY if is_body else
+                              placeholder.type)):
+            if inherited is not None:
+                styles.append(
+                    inherited.element.find(f'.//{DRAWINGML_NS}lstStyle'))
+        if is_body:
+            styles.append(
+                master.element.find(f'{PRESENTATIONML_NS}txStyles/'
+                                    f'{PRESENTATIONML_NS}bodyStyle'))
+    styles = [style for style in styles if style is not None]
+
+    count = 0
+    for paragraph in shape.element.iter(f'{DRAWINGML_NS}p'):
+        text = ''.join(run.text or ''
+                       for run in paragraph.iter(f'{DRAWINGML_NS}t'))
+        if text.strip() and _is_bulleted(paragraph, styles):
+            count += 1
+    return count
+
+
+def _is_bulleted(paragraph, styles):
+    properties = paragraph.find(f'{DRAWINGML_NS}pPr')
+    level = int(properties.get('lvl', '0')) if properties is not None else 0
+    candidates = [properties] + [
+        style.find(f'{DRAWINGML_NS}lvl{level + 1}pPr') for style in styles
+    ]
+    for candidate in candidates:
+        if candidate is None:
+            continue
+        for child in candidate:
+            tag = child.tag[len(DRAWINGML_NS):]
+            if tag == 'buNone':
+                return False
+            if tag in BULLET_TAGS:
+                return True
+    return False
+
+
+def _resolve_font(name, default_font, major_font, minor_font):
+    if not name:
+        return default_font
+    # Theme font references such as "+mj-lt" (headings) and "+mn-lt" (body)
+    if name.startswith('+mj'):
+        return major_font
+    if name.startswith('+mn'):
+        return minor_font
+    return name
+
+
+def _theme_fonts(prs):
+    try:
+        theme = prs.slide_master.part.part_related_by(RT.THEME)
+        root = ET.fromstring(theme.blob)
+    except Exception as e:
+        logger.debug(f"Could not read theme fonts: {str(e)}")
+        return None, None
+
+    def typeface(tag):
+        latin = root.find(f'.//{DRAWINGML_NS}{tag}/{DRAWINGML_NS}latin')
+        return latin.get('typeface') if latin is not None else None
+
+    return typeface('majorFont'), typeface('minorFont')
+
+
+def _slide_fingerprint(slide, text):
+    # The slide XML plus the bytes of everything it embeds stands in for a
+    # render, which would need the PDF conversion this module avoids.
+    related = sorted(
+        hash_bytes(rel.target_part.blob) for rel in slide.part.rels.values()
+        if rel.reltype in MEDIA_RELATIONSHIPS and not rel.is_external)
+    return hash_json([hash_text(text), hash_bytes(slide.part.blob), related])
+
+
+def _probe_videos(input_file, media):
+    """Add container details ('probe') to each video in `media`.
+
+    Parts are streamed from the package and only their headers are read.
+    """
+    videos = [item for item in media if item['kind'] == 'video']
+    if not videos:
+        return
+    probes = {}
+    try:
+        with zipfile.ZipFile(input_file) as package:
+            for item in videos:
+                if item['part'] not in probes:
+                    probes[item['part']] = _probe_part(package, item['part'])
+                item['probe'] = probes[item['part']]
+    except (OSError, zipfile.BadZipFile) as e:
+        logger.debug(f"Could not open package to probe media: {str(e)}")
+
+
+def _probe_part(package, partname):
+    try:
+        name = partname.lstrip('/')
+        with package.open(name) as f:
+            return probe_media(f, package.getinfo(name).file_size)
+    except Exception as e:
+        logger.debug(f"Could not probe {partname}: {str(e)}")
+        return None
+
+
+def _slide_charts(slide, slide_number):
+    charts = []
+    for shape in _iter_shapes(slide.shapes):
+        if getattr(shape, 'has_chart', False) and shape.has_chart:
+            part = shape.chart.part
+            charts.append({
+                'slide': slide_number,
+                'kind': 'chart',
+                'content_type': part.content_type,
+                'part': str(part.partname),
+                'size': len(part.blob),
+            })
+    return charts
+
+
+def _slide_media(slide, slide_number):
+    media = {}
+    for rel in slide.part.rels.values():
+        kind = MEDIA_RELATIONSHIPS.get(rel.reltype)
+        if kind is None or rel.is_external:
+            continue
+        part = rel.target_part
+        content_type = part.content_type
+        if kind == 'media':
+            # Office 2010+ links each movie/sound through both a generic
+            # media relationship and a typed one; classify by MIME type.
+            kind = 'audio' if content_type.startswith('audio') else 'video'
+        partname = str(part.partname)
+        if partname in media and media[partname]['kind'] != 'image':
+            continue
+        media[partname] = {
+            'slide': slide_number,
+            'kind': kind,
+            'content_type': content_type,
+            'part': partname,
+            'size': len(part.blob),
+        }
+    return list(media.values())
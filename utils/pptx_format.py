@@ -0,0 +1,70 @@
+import logging
+from io import BytesIO
+from pptx import Presentation
+from pptx.enum.shapes import MSO_SHAPE_TYPE
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen import canvas
+from .pptx_extractor import extract_pptx
+from .workspace import workspace
+
+logger = logging.getLogger(__name__)
+
+
+def handle(input_data, file_type):
+    source = BytesIO(input_data) if isinstance(input_data,
+                                               bytes) else input_data
+    # Read the package directly; a PDF is only built if a check
+    # needs to render pages.
+    result = extract_pptx(source,
+                          pdf_factory=lambda: convert_to_pdf(source)[0])
+    result.update({'original_type': file_type, 'type': 'application/pdf'})
+    return result
+
+
+def convert_to_pdf(input_file):
+    output_file = workspace.path('.pdf')
+
+    try:
+        prs = Presentation(input_file)
+        pdf = canvas.Canvas(output_file, pagesize=letter)
+
+        video_tracks = []
+        audio_tracks = []
+
+        for slide_index, slide in enumerate(prs.slides):
+            pdf.setFont("Helvetica", 12)
+            pdf.drawString(100, 700, f"Slide {slide_index + 1}")
+            y_position = 680
+            for shape in slide.shapes:
+                if hasattr(shape, 'text'):
+                    text_frame = shape.text_frame
+                    for paragraph in text_frame.paragraphs:
+                        text = paragraph.text
+                        pdf.drawString(100, y_position,
+                                       text[:80])  # Limit text to 80 chars
+                        y_position -= 20
+                elif shape.shape_type == MSO_SHAPE_TYPE.MEDIA:
+                    if hasattr(shape, 'media_format') and hasattr(
+                            shape.media_format, 'mime_type'):
+                        mime_type = shape.media_format.mime_type
+                        if mime_type.startswith('video'):
+                            video_tracks.append(
+                                f"Video on slide {slide_index + 1}")
+                            pdf.drawString(100, y_position, "[Video]")
+                        elif mime_type.startswith('audio'):
+                            audio_tracks.append(
+                                f"Audio on slide {slide_index + 1}")
+                            pdf.drawString(100, y_position, "[Audio]")
+                    y_position -= 20
+
+                if y_position < 50:
+                    pdf.showPage()
+                    y_position = 700
+            pdf.showPage()
+        pdf.save()
+        logger.debug(f"Successfully converted {input_file} to PDF")
+        return output_file, video_tracks, audio_tracks
+    except Exception as e:
+        logger.error(f"Error converting {input_file} to PDF: {str(e)}",
+                     exc_info=True)
+        raise
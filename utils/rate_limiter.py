@@ -0,0 +1,109 @@
+import os
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled continuously at `rate` per second."""
+
+    def __init__(self, rate, capacity, clock=time.monotonic):
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = self._clock()
+        elapsed = now - self._updated
+        if elapsed > 0:
+            self._tokens = min(self.capacity,
+                               self._tokens + elapsed * self.rate)
+            self._updated = now
+
+    def reserve(self, amount=1, max_wait=None):
+        """Take `amount` tokens and return how long the caller must wait
+        before using them. The bucket may go negative so that waiters queue
+        up in arrival order instead of starving large requests.
+
+        If the wait would exceed `max_wait`, nothing is taken and None is
+        returned."""
+        amount = min(float(amount), self.capacity)
+        with self._lock:
+            self._refill()
+            wait = max(0.0, amount - self._tokens) / self.rate
+            if max_wait is not None and wait > max_wait:
+                return None
+            self._tokens -= amount
+            return wait
+
+    def cancel(self, amount=1):
+        """Give back tokens from a reservation that will not be used."""
+        amount = min(float(amount), self.capacity)
+        with self._lock:
+            self._refill()
+            self._tokens = min(self.capacity, self._tokens + amount)
+
+
+class RateLimiter:
+    """Process-wide pacing for LLM calls: requests/sec and tokens/min."""
+
+    def __init__(self,
+                 requests_per_second=1.0,
+                 tokens_per_minute=None,
+                 burst=None,
+                 sleep=time.sleep,
+                 clock=time.monotonic):
+        self._sleep = sleep
+        burst = burst if burst is not None else max(1, int(requests_per_second))
+        self.requests = TokenBucket(requests_per_second, burst, clock=clock)
+        self.tokens = None
+        if tokens_per_minute:
+            self.tokens = TokenBucket(tokens_per_minute / 60.0,
+                                      tokens_per_minute,
+                                      clock=clock)
+
+    def acquire(self, tokens=0, max_wait=None):
+        """Wait for a request slot and `tokens` tokens and return the time
+        waited. Returns None without waiting, and without using up any
+        capacity, if that would take longer than `max_wait` seconds."""
+        wait = self.requests.reserve(1, max_wait)
+        if wait is None:
+            return None
+        if self.tokens is not None and tokens:
+            token_wait = self.tokens.reserve(tokens, max_wait)
+            if token_wait is None:
+                self.requests.cancel(1)
+                return None
+            wait = max(wait, token_wait)
+        if wait > 0:
+            logger.debug(f"Rate limiter pausing for {wait:.2f} seconds")
+            self._sleep(wait)
+        return wait
+
+
+class UnlimitedRateLimiter:
+    """RateLimiter stand-in that never waits, for callers (e.g. the load
+    generator) whose backend applies its own limits."""
+
+    def acquire(self, tokens=0, max_wait=None):
+        return 0.0
+
+
+def estimate_tokens(text, max_tokens=0, images=0):
+    # Roughly four characters per token for English text; each image is
+    # billed as a fixed block by the vision models.
+    return len(text) // 4 + max_tokens + images * 850
+
+
+def limiter_from_env():
+    requests_per_second = float(
+        os.environ.get('OPENAI_REQUESTS_PER_SECOND', '1'))
+    tokens_per_minute = os.environ.get('OPENAI_TOKENS_PER_MINUTE')
+    return RateLimiter(
+        requests_per_second=requests_per_second,
+        tokens_per_minute=int(tokens_per_minute) if tokens_per_minute else None)
@@ -0,0 +1,158 @@
+import os
+import time
+import random
+import logging
+import threading
+import contextvars
+from collections import namedtuple
+from contextlib import contextmanager
+
+from .llm_backend import LLMError, LLMFatalError, RateLimitedError
+
+logger = logging.getLogger(__name__)
+
+FATAL = 'fatal'
+RATE_LIMITED = 'rate_limited'
+TRANSIENT = 'transient'
+
+
+def classify_error(error):
+    """Whether a failed LLM call is worth retrying.
+
+    Auth and request errors (and anything that is not a provider error,
+    i.e. a bug) fail the same way every time, so they are never retried.
+    """
+    if isinstance(error, RateLimitedError):
+        return RATE_LIMITED
+    if isinstance(error, LLMError):
+        return TRANSIENT
+    return FATAL
+
+
+RetryPolicy = namedtuple('RetryPolicy', 'max_attempts base_delay max_delay')
+
+
+def backoff_delay(policy, attempt, retry_after=None, rng=random):
+    """Seconds to wait before retry number `attempt + 1`: the provider's
+    Retry-After when it sent one, otherwise exponential backoff with full
+    jitter. Both are capped at `policy.max_delay`."""
+    if retry_after is not None:
+        return min(policy.max_delay, retry_after)
+    return rng.uniform(0, min(policy.max_delay,
+                              policy.base_delay * 2**attempt))
+
+
+def policy_from_env():
+    return RetryPolicy(
+        max_attempts=int(os.environ.get('AI_RETRY_MAX_ATTEMPTS', '4')),
+        base_delay=float(os.environ.get('AI_RETRY_BASE_DELAY', '1')),
+        max_delay=float(os.environ.get('AI_RETRY_MAX_DELAY', '20')))
+
+
+class Deadline:
+
+    def __init__(self, seconds, clock=time.monotonic):
+        self._clock = clock
+        self.expires = clock() + seconds
+
+    def remaining(self):
+        return max(0.0, self.expires - self._clock())
+
+    def expired(self):
+        return self.remaining() <= 0
+
+
+_deadline = contextvars.ContextVar('llm_deadline', default=None)
+
+
+def current_deadline():
+    return _deadline.get()
+
+
+@contextmanager
+def deadline_scope(seconds, clock=time.monotonic):
+    """Give the LLM calls made inside the block (including threads started
+    with a copy of this context) `seconds` in total. An enclosing deadline
+    that is sooner stays in force."""
+    deadline = current_deadline()
+    if seconds and (deadline is None or deadline.remaining() > seconds):
+        deadline = Deadline(seconds, clock=clock)
+    token = _deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _deadline.reset(token)
+
+
+class CircuitBreaker:
+    """Process-wide breaker for the LLM provider.
+
+    After `threshold` consecutive failed calls it opens for `cooldown`
+    seconds (or the provider's Retry-After, if longer), during which calls
+    are refused without touching the provider. Then a single trial call is
+    let through: success closes the breaker, failure opens it again.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, threshold=5, cooldown=30.0, clock=time.monotonic):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_until = None
+        self._trial_running = False
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._state()
+
+    def _state(self):
+        if self._opened_until is None:
+            return self.CLOSED
+        if self._clock() < self._opened_until:
+            return self.OPEN
+        return self.HALF_OPEN
+
+    def allow(self):
+        with self._lock:
+            state = self._state()
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and not self._trial_running:
+                self._trial_running = True
+                return True
+            return False
+
+    def success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_until = None
+            self._trial_running = False
+
+    def release(self):
+        """Give up a trial call that never reached the provider, so the
+        next caller may make it; the breaker state is unchanged."""
+        with self._lock:
+            self._trial_running = False
+
+    def failure(self, retry_after=None):
+        with self._lock:
+            self._failures += 1
+            if self._trial_running or self._failures >= self.threshold:
+                pause = max(self.cooldown, retry_after or 0)
+                if self._opened_until is None:
+                    logger.warning(
+                        f"LLM provider failing, pausing calls for {pause:.0f} seconds")
+                self._opened_until = self._clock() + pause
+                self._trial_running = False
+
+
+def breaker_from_env():
+    return CircuitBreaker(
+        threshold=int(os.environ.get('AI_BREAKER_THRESHOLD', '5')),
+        cooldown=float(os.environ.get('AI_BREAKER_COOLDOWN', '30')))
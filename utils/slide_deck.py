@@ -0,0 +1,288 @@
+import os
+import io
+import threading
+import logging
+import fitz  # PyMuPDF
+from PIL import Image
+from .workspace import workspace
+from .disk_cache import CACHE_DIR, DiskCache, hash_bytes, hash_json, hash_text
+
+logger = logging.getLogger(__name__)
+
+# Page rendering for the vision checks. Pages are downscaled so the longest
+# side fits RENDER_MAX_DIMENSION, which is all the vision model looks at.
+RENDER_DPI = int(os.environ.get('SLIDECHECK_RENDER_DPI', '96'))
+RENDER_MAX_DIMENSION = int(
+    os.environ.get('SLIDECHECK_RENDER_MAX_DIMENSION', '1024'))
+RENDER_FORMAT = os.environ.get('SLIDECHECK_RENDER_FORMAT', 'jpeg').lower()
+RENDER_QUALITY = int(os.environ.get('SLIDECHECK_RENDER_QUALITY', '80'))
+
+slide_cache = DiskCache(
+    os.path.join(CACHE_DIR, 'slides'),
+    max_bytes=int(os.environ.get('SLIDECHECK_SLIDE_CACHE_MB', '128')) *
+    1024 * 1024)
+
+# Bump whenever a per-slide output kept in the slide cache (fonts, layout,
+# media, scans) changes shape or meaning, so stale records are not reused.
+SLIDE_RECORD_VERSION = '3'
+
+
+class SlideDeck(dict):
+    """Slide data backed by a single open document.
+
+    Behaves like the plain `slide_data` dict the checkers have always used
+    (and serializes like one), but keeps the document handle around so text,
+    fonts, images and renders are each computed at most once per submission.
+    """
+
+    def __init__(self, pdf_path=None, stream=None, data=None,
+                 pdf_factory=None):
+        super().__init__(data or {})
+        self._pdf_path = pdf_path
+        self._stream = stream
+        # Sources that are not PDFs (e.g. PPTX) convert only when a page
+        # actually has to be rendered.
+        self._pdf_factory = pdf_factory
+        self._doc = None
+        self._lock = threading.RLock()
+        self._texts = {}
+        self._fonts = {}
+        self._images = {}
+        self._renders = {}
+        self._fingerprints = {}
+        self._image_digests = {}
+        self._records = {}
+        self._dirty = set()
+        self._full_text = None
+        self._full_text_lower = None
+
+    @classmethod
+    def wrap(cls, slide_data):
+        """Return `slide_data` as a SlideDeck, reusing it if it already is one.
+
+        Plain dicts (e.g. loaded back from JSON) fall back to their
+        'content' list and reopen 'temp_file_path' only if a render is needed.
+        """
+        if isinstance(slide_data, cls):
+            return slide_data
+        return cls(pdf_path=slide_data.get('temp_file_path'), data=slide_data)
+
+    def __reduce__(self):
+        # Document handles and locks stay in this process; pickles and
+        # copies carry only the plain slide data, plus a file path so the
+        # receiver can still reopen an in-memory document.
+        self.spill()
+        return (dict, (dict(self), ))
+
+    def spill(self):
+        """Write an in-memory document to the workspace and record its path."""
+        with self._lock:
+            if 'temp_file_path' not in self and self._stream is not None:
+                self._pdf_path = workspace.write_bytes(self._stream, '.pdf')
+                self['temp_file_path'] = self._pdf_path
+            return self.get('temp_file_path')
+
+    @property
+    def doc(self):
+        with self._lock:
+            if self._doc is None:
+                if self._stream is not None:
+                    self._doc = fitz.open(stream=self._stream, filetype='pdf')
+                elif self._pdf_path:
+                    self._doc = fitz.open(self._pdf_path)
+                elif self._pdf_factory is not None:
+                    self._pdf_path = self._pdf_factory()
+                    self['temp_file_path'] = self._pdf_path
+                    self._doc = fitz.open(self._pdf_path)
+                else:
+                    raise ValueError('Slide deck has no backing document')
+            return self._doc
+
+    def has_document(self):
+        return (self._doc is not None or self._pdf_factory is not None
+                or bool(self._stream or self._pdf_path))
+
+    def has_pdf(self):
+        """Whether a PDF can be opened without running a conversion."""
+        return self._doc is not None or bool(self._stream or self._pdf_path)
+
+    def close(self):
+        with self._lock:
+            self.flush_records()
+            if self._doc is not None:
+                self._doc.close()
+                self._doc = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def page_count(self):
+        if 'num_slides' in self:
+            return self['num_slides']
+        return len(self.doc)
+
+    def page_text(self, index):
+        with self._lock:
+            if index not in self._texts:
+                if 'content' in self:
+                    self._texts[index] = self['content'][index]
+                else:
+                    self._texts[index] = self.doc[index].get_text()
+            return self._texts[index]
+
+    def page_fonts(self, index):
+        with self._lock:
+            # Reading fonts off an open PDF is cheaper than a cache lookup;
+            # the per-slide record only saves converting other formats.
+            if index not in self._fonts and not self.has_pdf():
+                self.page_record(index)
+            if index not in self._fonts:
+                # font[3] is the font name
+                self._fonts[index] = {
+                    font[3]
+                    for font in self.doc[index].get_fonts()
+                }
+                if index in self._records:
+                    self.update_page_record(
+                        index, fonts=sorted(self._fonts[index]))
+            return self._fonts[index]
+
+    def page_images(self, index):
+        with self._lock:
+            # Image tuples start with an xref, which only means something
+            # in this document, so they are never cached per slide.
+            if index not in self._images:
+                self._images[index] = self.doc[index].get_images(full=True)
+            return self._images[index]
+
+    def page_fingerprint(self, index):
+        """Content hash of one slide: its text, its content stream and the
+        bytes of the images it draws. Image xrefs are left out since they
+        are numbered per document."""
+        with self._lock:
+            if index not in self._fingerprints:
+                known = self.get('slide_fingerprints')
+                if known and index < len(known):
+                    self._fingerprints[index] = known[index]
+                else:
+                    parts = [hash_text(self.page_text(index))]
+                    if self.has_document():
+                        page = self.doc[index]
+                        parts.append(hash_bytes(page.read_contents()))
+                        parts.extend(
+                            self._image_digest(image[0])
+                            for image in page.get_images(full=True))
+                    self._fingerprints[index] = hash_json(parts)
+            return self._fingerprints[index]
+
+    def _image_digest(self, xref):
+        # Images are often shared between pages (logos, backgrounds)
+        if xref not in self._image_digests:
+            self._image_digests[xref] = hash_bytes(
+                self.doc.xref_stream_raw(xref) or b'')
+        return self._image_digests[xref]
+
+    def fingerprints(self):
+        return [self.page_fingerprint(i) for i in range(self.page_count)]
+
+    def page_record(self, index):
+        """Per-slide outputs cached under the slide's fingerprint.
+
+        Looked up only when a check asks for it. Cached fonts are adopted
+        for this page, so an unchanged slide is not re-extracted.
+        """
+        with self._lock:
+            if index not in self._records:
+                record = slide_cache.get(self._record_key(index)) or {}
+                if 'fonts' in record:
+                    self._fonts.setdefault(index, set(record['fonts']))
+                self._records[index] = record
+            return self._records[index]
+
+    def update_page_record(self, index, **values):
+        """Change a page record; it is written by `flush_records`."""
+        with self._lock:
+            record = self.page_record(index)
+            record.update(values)
+            self._dirty.add(index)
+
+    def flush_records(self):
+        """Write the page records changed since the last flush, once each."""
+        with self._lock:
+            for index in sorted(self._dirty):
+                slide_cache.set(self._record_key(index), self._records[index])
+            self._dirty.clear()
+
+    def _record_key(self, index):
+        return hash_json([SLIDE_RECORD_VERSION, self.page_fingerprint(index)])
+
+    def seed_page(self, index, text=None, fonts=None, fingerprint=None):
+        """Record values already extracted from the source format."""
+        with self._lock:
+            if text is not None:
+                self._texts[index] = text
+            if fonts is not None:
+                self._fonts[index] = set(fonts)
+            if fingerprint is not None:
+                self._fingerprints[index] = fingerprint
+
+    def texts(self):
+        return [self.page_text(i) for i in range(self.page_count)]
+
+    def fonts(self):
+        fonts = set()
+        for i in range(self.page_count):
+            fonts.update(self.page_fonts(i))
+        return fonts
+
+    @property
+    def full_text(self):
+        if self._full_text is None:
+            self._full_text = ' '.join(self.texts())
+        return self._full_text
+
+    @property
+    def full_text_lower(self):
+        if self._full_text_lower is None:
+            self._full_text_lower = self.full_text.lower()
+        return self._full_text_lower
+
+    def render_page(self,
+                    index,
+                    dpi=None,
+                    max_dimension=None,
+                    image_format=None,
+                    quality=None):
+        dpi = dpi or RENDER_DPI
+        max_dimension = max_dimension or RENDER_MAX_DIMENSION
+        image_format = image_format or RENDER_FORMAT
+        quality = quality or RENDER_QUALITY
+        key = (index, dpi, max_dimension, image_format, quality)
+
+        with self._lock:
+            if key not in self._renders:
+                page = self.doc[index]
+                longest_side = max(page.rect.width, page.rect.height) or 1
+                zoom = min(dpi / 72, max_dimension / longest_side)
+                pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom),
+                                      alpha=False)
+                img = Image.frombytes("RGB", [pix.width, pix.height],
+                                      pix.samples)
+                with io.BytesIO() as output:
+                    img.save(output,
+                             format=image_format.upper(),
+                             quality=quality)
+                    self._renders[key] = output.getvalue()
+            return self._renders[key]
+
+    def renders(self, max_pages=None, **render_options):
+        """Yield page renders, rendering each page only when consumed."""
+        page_count = len(self.doc)
+        if max_pages is not None:
+            page_count = min(max_pages, page_count)
+        for index in range(page_count):
+            yield self.render_page(index, **render_options)
@@ -0,0 +1,150 @@
+import os
+import re
+import statistics
+
+# Decisions the heuristics make on their own. Scores inside the uncertain
+# bands are left to the LLM checks.
+LOCAL_PRECHECKS_ENABLED = os.environ.get('SLIDECHECK_LOCAL_PRECHECKS',
+                                         'true').lower() in ('1', 'true',
+                                                             'yes')
+TITLE_SCORE_LOW = float(os.environ.get('SLIDECHECK_TITLE_SCORE_LOW', '0.35'))
+TITLE_SCORE_HIGH = float(os.environ.get('SLIDECHECK_TITLE_SCORE_HIGH', '0.75'))
+DENSITY_BAND = float(os.environ.get('SLIDECHECK_DENSITY_BAND', '0.25'))
+
+# Same limits the bullet density prompt gives the model
+MAX_BULLETS = 6
+MAX_WORDS = 500
+
+# Bump whenever the layout statistics change, so layouts cached per slide
+# by an earlier version are recomputed rather than reused.
+LAYOUT_VERSION = '3'
+
+# Decks set in Symbol or Wingdings extract their bullets as private-use
+# code points (U+F0B7, U+F0A7, U+F0D8, ...), hence the PUA range.
+BULLET_RE = re.compile(
+    r'^\s*(?:[•◦▪▫‣⁃●○■□➢➤►▶✓✔*\-–—\ue000-\uf8ff]|\(?\d{1,2}[.)])(?:\s|$)')
+
+
+def _clamp(value):
+    return max(0.0, min(1.0, value))
+
+
+def analyze_page(page):
+    """Layout statistics for one fitz page, read from its text spans."""
+    words = 0
+    bullets = 0
+    lines = 0
+    sizes = []
+    for block in page.get_text('dict')['blocks']:
+        if block.get('type') != 0:
+            continue
+        for line in block['lines']:
+            text = ''.join(span['text'] for span in line['spans']).strip()
+            if not text:
+                continue
+            if BULLET_RE.match(text):
+                bullets += 1
+            line_words = len(BULLET_RE.sub('', text).split())
+            if line_words:
+                lines += 1
+                words += line_words
+            for span in line['spans']:
+                if span['text'].strip():
+                    sizes.extend([round(span['size'], 1)] *
+                                 len(span['text'].strip()))
+    return {
+        'words': words,
+        'bullets': bullets,
+        'lines': lines,
+        'max_size': max(sizes) if sizes else None,
+        'body_size': statistics.median(sizes) if sizes else None,
+    }
+
+
+def analyze_text(text, bullets=None):
+    """Layout statistics from plain slide text, when no PDF is at hand.
+
+    `bullets` is the number of bulleted paragraphs when the source format
+    records it (PPTX and ODP extraction do). Otherwise only paragraphs that
+    start with a bullet glyph are counted, which is a lower bound.
+    """
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
+    layout = {
+        'words': len(text.split()),
+        'bullets': bullets,
+        'lines': len(lines),
+        'max_size': None,
+        'body_size': None,
+    }
+    if bullets is None:
+        layout['bullets'] = sum(1 for line in lines if BULLET_RE.match(line))
+        layout['bullets_lower_bound'] = True
+    return layout
+
+
+def slide_layout(deck, index):
+    record = deck.page_record(index)
+    if record.get('layout_version') != LAYOUT_VERSION:
+        if deck.has_pdf():
+            layout = analyze_page(deck.doc[index])
+        else:
+            known = deck.get('slide_bullets')
+            layout = analyze_text(
+                deck.page_text(index),
+                known[index] if known and index < len(known) else None)
+        deck.update_page_record(index,
+                                layout=layout,
+                                layout_version=LAYOUT_VERSION)
+    return record['layout']
+
+
+def title_slide_score(layout):
+    """0..1 likelihood that a slide is a title slide."""
+    if not layout['words']:
+        return 0.0
+    word_score = _clamp(1 - (layout['words'] - 25) / 50)
+    bullet_score = 1.0 if layout['bullets'] == 0 else (
+        0.5 if layout['bullets'] == 1 else 0.0)
+    line_score = _clamp(1 - (layout['lines'] - 6) / 10)
+    if layout['max_size'] is None:
+        return (0.3 * word_score + 0.15 * bullet_score +
+                0.15 * line_score) / 0.6
+    # A title slide's largest text dwarfs the rest of the page
+    size_score = _clamp(layout['max_size'] / layout['body_size'] - 1)
+    return (0.4 * size_score + 0.3 * word_score + 0.15 * bullet_score +
+            0.15 * line_score)
+
+
+def density_score(layouts):
+    """Worst slide's bullets or words relative to the limits; above 1 is
+    text-heavy."""
+    return max((max(layout['bullets'] / MAX_BULLETS,
+                    layout['words'] / MAX_WORDS) for layout in layouts),
+               default=0.0)
+
+
+def local_title_slide(deck):
+    """True/False when page 1 is clearly (not) a title slide, else None."""
+    if not LOCAL_PRECHECKS_ENABLED or not deck.page_count:
+        return None
+    score = title_slide_score(slide_layout(deck, 0))
+    if score >= TITLE_SCORE_HIGH:
+        return True
+    if score <= TITLE_SCORE_LOW:
+        return False
+    return None
+
+
+def local_text_heavy(deck):
+    """True/False when the deck is clearly (not) text-heavy, else None."""
+    if not LOCAL_PRECHECKS_ENABLED or not deck.page_count:
+        return None
+    layouts = [slide_layout(deck, index) for index in range(deck.page_count)]
+    score = density_score(layouts)
+    if score >= 1 + DENSITY_BAND:
+        return True
+    # Bullets missed by a glyph count could still push a slide over
+    if score <= 1 - DENSITY_BAND and not any(
+            layout.get('bullets_lower_bound') for layout in layouts):
+        return False
+    return None
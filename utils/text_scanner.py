@@ -0,0 +1,93 @@
+import re
+from collections import defaultdict, namedtuple
+
+Hit = namedtuple('Hit', ['slide', 'start', 'end', 'term'])
+
+# Bumped when the hits reported for the same rules change, so scans cached
+# per slide are redone.
+SCANNER_VERSION = '2'
+
+
+class ScanResult:
+
+    def __init__(self):
+        self.hits = defaultdict(list)
+
+    def add(self, rule, hit):
+        self.hits[rule].append(hit)
+
+    def found(self, rule):
+        return bool(self.hits.get(rule))
+
+    def terms(self, rule):
+        return {hit.term for hit in self.hits.get(rule, [])}
+
+    def slides(self, rule):
+        return sorted({hit.slide for hit in self.hits.get(rule, [])})
+
+
+class TextScanner:
+    """Find every configured keyword and regex pattern in one scan per slide.
+
+    `keywords` maps a rule name to plain terms, matched case-insensitively
+    as substrings (overlapping occurrences included). `patterns` maps a rule
+    name to regular expressions, each compiled and searched on its own so
+    greedy patterns cannot swallow the matches of others.
+    """
+
+    def __init__(self, keywords=None, patterns=None):
+        self._term_rules = defaultdict(set)
+        for rule, terms in (keywords or {}).items():
+            for term in terms:
+                term = term.strip().lower()
+                if term:
+                    self._term_rules[term].add(rule)
+
+        self._keyword_re = None
+        self._prefixes = {}
+        if self._term_rules:
+            terms = sorted(self._term_rules, key=len, reverse=True)
+            # A zero-width lookahead lets matches overlap; the longest term
+            # wins at each offset and shorter terms that are prefixes of it
+            # are credited through `_prefixes`.
+            self._keyword_re = re.compile(
+                '(?=(' + '|'.join(re.escape(term) for term in terms) + '))',
+                re.IGNORECASE)
+            self._prefixes = {
+                term: [
+                    other for other in terms
+                    if other != term and term.startswith(other)
+                ]
+                for term in terms
+            }
+
+        self._pattern_rules = [
+            (re.compile(pattern, re.IGNORECASE), rule, pattern)
+            for rule, rule_patterns in (patterns or {}).items()
+            for pattern in rule_patterns
+        ]
+
+    def scan(self, slides):
+        result = ScanResult()
+        for slide_index, text in enumerate(slides):
+            self.scan_slide(slide_index, text, result)
+        return result
+
+    def scan_slide(self, slide_index, text, result=None):
+        result = result if result is not None else ScanResult()
+        if self._keyword_re is not None:
+            for match in self._keyword_re.finditer(text):
+                start = match.start(1)
+                term = match.group(1).lower()
+                for matched in [term] + self._prefixes.get(term, []):
+                    for rule in self._term_rules[matched]:
+                        result.add(
+                            rule,
+                            Hit(slide_index, start, start + len(matched),
+                                matched))
+        for compiled, rule, pattern in self._pattern_rules:
+            for match in compiled.finditer(text):
+                result.add(
+                    rule, Hit(slide_index, match.start(), match.end(),
+                              pattern))
+        return result
@@ -0,0 +1,177 @@
+import os
+import time
+import logging
+
+from .disk_cache import CACHE_DIR, DiskCache, hash_file, hash_json
+from .file_processor import process_file, process_url
+from .url_format import (process_google_slides, download_google_slides,
+                         is_google_slides_url)
+from .deterministic_checker import run_deterministic_checks
+from .ai_checker import is_unavailable, run_ai_checks
+from .slide_deck import SlideDeck
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever extraction or check logic changes so stale cached results
+# are never served for a new version of the validator.
+CHECKER_VERSION = '6'
+
+result_cache = DiskCache(
+    os.path.join(CACHE_DIR, 'results'),
+    max_bytes=int(os.environ.get('SLIDECHECK_RESULT_CACHE_MB', '256')) *
+    1024 * 1024)
+
+
+def conference_rules(conference):
+    return {
+        'name': getattr(conference, 'name', None),
+        'max_slides': getattr(conference, 'max_slides', None),
+        'required_sections': getattr(conference, 'required_sections', None),
+        'allowed_fonts': getattr(conference, 'allowed_fonts', None),
+        'custom_checks': getattr(conference, 'custom_checks', None),
+    }
+
+
+def result_cache_key(content_hash, conference):
+    return hash_json({
+        'content': content_hash,
+        'rules': conference_rules(conference),
+        'version': CHECKER_VERSION,
+    })
+
+
+def validate_file(input_path, conference, use_cache=True, progress=None):
+    return _validate(hash_file(input_path), lambda: process_file(input_path),
+                     conference, use_cache, progress)
+
+
+def validate_url(url, conference, use_cache=True, progress=None):
+    try:
+        content_hash, extract = resolve_url(url)
+    except Exception as e:
+        logger.error(f"Error fetching URL: {str(e)}", exc_info=True)
+        return _error_result({
+            'error': str(e),
+            'type': 'google_slides' if is_google_slides_url(url) else 'unknown',
+            'url': url
+        })
+    return _validate(content_hash, extract, conference, use_cache, progress)
+
+
+def resolve_url(url):
+    """Fetch enough of `url` to know its content hash.
+
+    Returns the hash and a callable that finishes extraction.
+    """
+    if is_google_slides_url(url):
+        # The export is the only stable identity for a Google Slides deck;
+        # hashing the URL would miss edits made behind the same link.
+        pdf_path = download_google_slides(url)
+        return hash_file(pdf_path), lambda: process_google_slides(
+            url, pdf_path)
+
+    slide_data = process_url(url)
+    if 'error' in slide_data or not slide_data.get('temp_file_path'):
+        raise ValueError(slide_data.get('error', 'Processing failed'))
+    return hash_file(slide_data['temp_file_path']), lambda: slide_data
+
+
+def resolve_source(source):
+    if source.get('url'):
+        return resolve_url(source['url'])
+    input_path = source['file_path']
+    return hash_file(input_path), lambda: process_file(input_path)
+
+
+def get_cached_result(content_hash, conference):
+    return result_cache.get(result_cache_key(content_hash, conference))
+
+
+def validate_extracted(content_hash,
+                       slide_data,
+                       conference,
+                       use_cache=True,
+                       progress=None):
+    return _validate(content_hash, lambda: slide_data, conference, use_cache,
+                     progress)
+
+
+def slide_data_summary(slide_data):
+    return {
+        key: slide_data.get(key)
+        for key in ('type', 'original_type', 'num_slides', 'fonts', 'url')
+        if key in slide_data
+    }
+
+
+def _validate(content_hash, extract, conference, use_cache, progress=None):
+    start = time.monotonic()
+    key = result_cache_key(content_hash, conference)
+    progress = progress or (lambda stage, data: None)
+
+    if use_cache:
+        cached = result_cache.get(key)
+        if cached is not None:
+            logger.debug(f"Result cache hit for {content_hash}")
+            progress('extraction', slide_data_summary(cached['slide_data']))
+            progress('deterministic', cached['deterministic_results'])
+            progress('ai', cached['ai_results'])
+            cached['cached'] = True
+            cached['processing_time'] = time.monotonic() - start
+            return cached
+
+    slide_data = extract()
+    if 'error' in slide_data:
+        return _error_result(slide_data)
+    # Every check shares one deck, whose page records are written on close
+    slide_data = SlideDeck.wrap(slide_data)
+    progress('extraction', slide_data_summary(slide_data))
+
+    try:
+        result = {
+            'content_hash': content_hash,
+            'slide_data': slide_data,
+        }
+        result['deterministic_results'] = run_deterministic_checks(
+            slide_data, conference)
+        progress('deterministic', result['deterministic_results'])
+        completed = []
+
+        def report_check(results):
+            # Streamed to the client while the slower checks still run
+            completed.extend(results)
+            progress('ai_check', list(completed))
+
+        result['ai_results'] = run_ai_checks(slide_data,
+                                             conference,
+                                             on_result=report_check)
+        progress('ai', result['ai_results'])
+    finally:
+        slide_data.close()
+    if use_cache and not _has_failed_ai_check(result['ai_results']):
+        result_cache.set(key, result)
+
+    result['cached'] = False
+    result['processing_time'] = time.monotonic() - start
+    return result
+
+
+def checks_passed(result):
+    checks = result['deterministic_results'] + result['ai_results']
+    return bool(checks) and all(check['passed'] for check in checks)
+
+
+def _has_failed_ai_check(ai_results):
+    # Transient provider errors and deferred checks must not be pinned in
+    # the cache.
+    return any(is_unavailable(r['message']) for r in ai_results)
+
+
+def _error_result(slide_data):
+    return {
+        'slide_data': slide_data,
+        'deterministic_results': [],
+        'ai_results': [],
+        'cached': False,
+        'error': slide_data.get('error', 'Processing failed')
+    }
@@ -0,0 +1,118 @@
+import os
+import time
+import uuid
+import tempfile
+import threading
+import contextvars
+import logging
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+
+class WorkspaceFullError(Exception):
+    pass
+
+
+_scope_files = contextvars.ContextVar('workspace_scope_files', default=None)
+
+
+class Workspace:
+    """Managed scratch directory for the files conversion cannot avoid.
+
+    Every file lives under one root, files older than `ttl` seconds are
+    swept automatically, and new files are refused once the directory holds
+    more than `max_bytes`. Files created inside `scope()` are removed when
+    the scope exits.
+    """
+
+    def __init__(self, root, max_bytes=1024 * 1024 * 1024, ttl=3600,
+                 sweep_interval=60):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.sweep_interval = sweep_interval
+        self._last_sweep = 0
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+
+    def path(self, suffix=''):
+        """Reserve a new file path in the workspace."""
+        self._check_quota()
+        path = os.path.join(self.root, f"{uuid.uuid4().hex}{suffix}")
+        files = _scope_files.get()
+        if files is not None:
+            files.append(path)
+        return path
+
+    def write_bytes(self, data, suffix=''):
+        path = self.path(suffix)
+        with open(path, 'wb') as f:
+            f.write(data)
+        return path
+
+    def remove(self, path):
+        if not path or not os.path.abspath(path).startswith(
+                os.path.abspath(self.root) + os.sep):
+            return
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    @contextmanager
+    def scope(self):
+        files = []
+        token = _scope_files.set(files)
+        try:
+            yield self
+        finally:
+            _scope_files.reset(token)
+            for path in files:
+                self.remove(path)
+
+    def usage(self):
+        total = 0
+        with os.scandir(self.root) as it:
+            for entry in it:
+                try:
+                    total += entry.stat().st_size
+                except OSError:
+                    continue
+        return total
+
+    def sweep(self):
+        cutoff = time.time() - self.ttl
+        removed = 0
+        with os.scandir(self.root) as it:
+            for entry in it:
+                try:
+                    if entry.stat().st_mtime < cutoff:
+                        os.remove(entry.path)
+                        removed += 1
+                except OSError:
+                    continue
+        if removed:
+            logger.debug(f"Removed {removed} expired workspace file(s)")
+        return removed
+
+    def _check_quota(self):
+        with self._lock:
+            now = time.time()
+            if now - self._last_sweep >= self.sweep_interval:
+                self._last_sweep = now
+                self.sweep()
+            if self.usage() >= self.max_bytes:
+                self.sweep()
+                if self.usage() >= self.max_bytes:
+                    raise WorkspaceFullError(
+                        f"Workspace {self.root} is over its "
+                        f"{self.max_bytes // (1024 * 1024)} MB quota")
+
+
+workspace = Workspace(
+    os.environ.get('SLIDECHECK_WORKSPACE_DIR',
+                   os.path.join(tempfile.gettempdir(), 'slidecheck')),
+    max_bytes=int(os.environ.get('SLIDECHECK_WORKSPACE_MB', '1024')) * 1024 *
+    1024,
+    ttl=int(os.environ.get('SLIDECHECK_WORKSPACE_TTL', '3600')))